@@ -20,12 +20,31 @@ config.set_main_option("sqlalchemy.url", raw_db_url)
 
 target_metadata = Base.metadata  # From SQLAlchemy models
 
+# Full-text search and version objects managed by raw DDL, outside the models
+UNMAPPED_NAMES = {
+    "table": ("tasks_fts",),
+    "column": ("search_vector",),
+    "index": ("ix_tasks_search_vector", "ix_tasks_version"),
+}
+
+
+def include_name(name, type_, parent_names):
+    """Keep autogenerate from dropping the unmapped objects"""
+    return not (name or "").startswith(UNMAPPED_NAMES.get(type_, ()))
+
+
 # Async migration run
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_name=include_name,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
+
 async def run_migrations_online():
     connectable = async_engine_from_config(
         config.get_section(config.config_ini_section),
@@ -38,6 +57,7 @@ async def run_migrations_online():
 
     await connectable.dispose()
 
+
 if context.is_offline_mode():
     context.run_migrations()
 else:
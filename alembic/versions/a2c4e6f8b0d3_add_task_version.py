@@ -0,0 +1,57 @@
+"""Add a version to tasks
+
+Revision ID: a2c4e6f8b0d3
+Revises: f1b3d5e7a9c2
+Create Date: 2026-10-18 18:12:31.406517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.ddl import TASK_VERSION_POSTGRESQL_DDL, TASK_VERSION_SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a2c4e6f8b0d3"
+down_revision: Union[str, None] = "f1b3d5e7a9c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "version", sa.BigInteger(), server_default=sa.text("0"), nullable=False
+        ),
+    )
+    # Before the triggers exist, so the backfill keeps these versions
+    op.execute("UPDATE tasks SET version = id")
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for statement in TASK_VERSION_POSTGRESQL_DDL:
+            op.execute(statement)
+        # Existing tasks start from their ID, which no other task has
+        op.execute("SELECT setval('task_version_seq', (SELECT max(id) FROM tasks))")
+    elif dialect == "sqlite":
+        for statement in TASK_VERSION_SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS tasks_version ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS tasks_next_version()")
+        op.execute("DROP SEQUENCE IF EXISTS task_version_seq")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS tasks_version_insert")
+        op.execute("DROP TRIGGER IF EXISTS tasks_version_update")
+        op.execute("DROP INDEX IF EXISTS ix_tasks_version")
+    op.drop_column("tasks", "version")
@@ -0,0 +1,119 @@
+"""Add task access pattern indexes
+
+Revision ID: b3f1c7a2d9e4
+Revises: 09da127c02d3
+Create Date: 2026-10-18 09:12:41.204518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f1c7a2d9e4"
+down_revision: Union[str, None] = "09da127c02d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the indexes without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_due_date_id",
+            "tasks",
+            ["due_date", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_status_id",
+            "tasks",
+            ["status", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_assigned_to_id_id",
+            "tasks",
+            ["assigned_to_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_assigned_to_id_due_date",
+            "tasks",
+            ["assigned_to_id", "due_date", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_assigned_by_id_id",
+            "tasks",
+            ["assigned_by_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_open_by_assignee",
+            "tasks",
+            ["assigned_to_id", "due_date"],
+            unique=False,
+            postgresql_where=sa.text("status <> 'COMPLETED'"),
+            sqlite_where=sa.text("status <> 'COMPLETED'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_unescalated_due_date",
+            "tasks",
+            ["due_date"],
+            unique=False,
+            postgresql_where=sa.text(
+                "escalation_flagged IS NOT true AND status <> 'COMPLETED'"
+            ),
+            sqlite_where=sa.text(
+                "escalation_flagged IS NOT 1 AND status <> 'COMPLETED'"
+            ),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_dependant_tasks_dependant_to_id"),
+            "dependant_tasks",
+            ["dependant_to_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_task_remarks_task_id"),
+            "task_remarks",
+            ["task_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_escalations_task_id"),
+            "escalations",
+            ["task_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_escalations_task_id"), table_name="escalations")
+    op.drop_index(op.f("ix_task_remarks_task_id"), table_name="task_remarks")
+    op.drop_index(
+        op.f("ix_dependant_tasks_dependant_to_id"), table_name="dependant_tasks"
+    )
+    op.drop_index("ix_tasks_unescalated_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_open_by_assignee", table_name="tasks")
+    op.drop_index("ix_tasks_assigned_by_id_id", table_name="tasks")
+    op.drop_index("ix_tasks_assigned_to_id_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_assigned_to_id_id", table_name="tasks")
+    op.drop_index("ix_tasks_status_id", table_name="tasks")
+    op.drop_index("ix_tasks_due_date_id", table_name="tasks")
@@ -0,0 +1,58 @@
+"""Add task dependencies table
+
+Revision ID: d7e9f2b4c6a8
+Revises: c5d2e8f1a3b7
+Create Date: 2026-10-18 13:41:52.906114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e9f2b4c6a8"
+down_revision: Union[str, None] = "c5d2e8f1a3b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_dependencies",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("blocking_task_id", sa.Integer(), nullable=False),
+        sa.Column("blocked_task_id", sa.Integer(), nullable=False),
+        sa.Column("created_by_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "blocking_task_id <> blocked_task_id", name="ck_task_dependencies_not_self"
+        ),
+        sa.ForeignKeyConstraint(["blocking_task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["blocked_task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "blocking_task_id", "blocked_task_id", name="uq_task_dependencies_edge"
+        ),
+    )
+    op.create_index(
+        op.f("ix_task_dependencies_blocked_task_id"),
+        "task_dependencies",
+        ["blocked_task_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_task_dependencies_blocked_task_id"), table_name="task_dependencies"
+    )
+    op.drop_table("task_dependencies")
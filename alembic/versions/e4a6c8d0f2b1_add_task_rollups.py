@@ -0,0 +1,87 @@
+"""Add task rollups maintained by triggers
+
+Revision ID: e4a6c8d0f2b1
+Revises: d7e9f2b4c6a8
+Create Date: 2026-10-18 15:22:08.431577
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.ddl import TASK_ROLLUP_POSTGRESQL_DDL, TASK_ROLLUP_SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a6c8d0f2b1"
+down_revision: Union[str, None] = "d7e9f2b4c6a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+    INSERT INTO task_rollups (assigned_to_id, status, task_count, overdue_count)
+    SELECT COALESCE(tasks.assigned_to_id, 0), COALESCE(CAST(tasks.status AS VARCHAR), 'PENDING'),
+           count(*),
+           sum(CASE WHEN COALESCE(CAST(tasks.status AS VARCHAR), 'PENDING') <> 'COMPLETED'
+                         AND tasks.due_date <= state.overdue_as_of
+                    THEN 1 ELSE 0 END)
+    FROM tasks CROSS JOIN task_rollup_state AS state
+    WHERE state.id = 1
+    GROUP BY 1, 2
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_rollups",
+        sa.Column("assigned_to_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.Column("overdue_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("assigned_to_id", "status"),
+    )
+    op.create_table(
+        "task_rollup_state",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("overdue_as_of", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("reconciled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Keep task writes out until the triggers and the backfill are in place
+        op.execute("LOCK TABLE tasks IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        "INSERT INTO task_rollup_state (id, overdue_as_of) VALUES (1, CURRENT_TIMESTAMP)"
+    )
+    statements = {
+        "postgresql": TASK_ROLLUP_POSTGRESQL_DDL,
+        "sqlite": TASK_ROLLUP_SQLITE_DDL,
+    }.get(dialect, [])
+    for statement in statements:
+        op.execute(statement)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for trigger in (
+        "task_rollups_insert",
+        "task_rollups_update",
+        "task_rollups_delete",
+    ):
+        op.execute(
+            f"DROP TRIGGER IF EXISTS {trigger} ON tasks"
+            if dialect == "postgresql"
+            else f"DROP TRIGGER IF EXISTS {trigger}"
+        )
+    if dialect == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS task_rollups_apply()")
+    op.drop_table("task_rollup_state")
+    op.drop_table("task_rollups")
@@ -0,0 +1,45 @@
+"""Add full-text search over tasks
+
+Revision ID: f1b3d5e7a9c2
+Revises: e4a6c8d0f2b1
+Create Date: 2026-10-18 17:06:45.118302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.ddl import TASK_SEARCH_POSTGRESQL_DDL, TASK_SEARCH_SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b3d5e7a9c2"
+down_revision: Union[str, None] = "e4a6c8d0f2b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Adding the stored generated column rewrites the tasks table
+        for statement in TASK_SEARCH_POSTGRESQL_DDL:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for statement in TASK_SEARCH_SQLITE_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tasks_search_vector")
+        op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("tasks_fts_insert", "tasks_fts_update", "tasks_fts_delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
@@ -7,9 +7,24 @@ class Settings(BaseSettings):
     # Application
     APP_NAME: str = "Task Management System"
     DEBUG: bool = True
+    METRICS_ENABLED: bool = Field(True, env="METRICS_ENABLED")
+    # In debug mode, warn when one statement runs this often in a request
+    QUERY_REPEAT_THRESHOLD: int = Field(5, env="QUERY_REPEAT_THRESHOLD")
 
     # Database settings
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
+    DB_ECHO: bool = Field(False, env="DB_ECHO")
+    DB_POOL_SIZE: int = Field(5, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(10, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(30.0, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(1800, env="DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: bool = Field(False, env="DB_POOL_PRE_PING")
+    DB_STATEMENT_CACHE_SIZE: int = Field(100, env="DB_STATEMENT_CACHE_SIZE")
+    DB_PGBOUNCER: bool = Field(False, env="DB_PGBOUNCER")
+
+    # Comma-separated read replica URLs; reads go to the primary when empty
+    DATABASE_REPLICA_URLS: str = Field("", env="DATABASE_REPLICA_URLS")
+    READ_YOUR_WRITES_SECONDS: int = Field(5, env="READ_YOUR_WRITES_SECONDS")
 
     # JWT Auth
     AUTHJWT_SECRET_KEY: str = Field(..., env="AUTHJWT_SECRET_KEY")
@@ -18,6 +33,91 @@ class Settings(BaseSettings):
     AUTHJWT_REFRESH_TOKEN_EXPIRES: int = Field(
         86400, env="AUTHJWT_REFRESH_TOKEN_EXPIRES"
     )
+    TOKEN_CACHE_SIZE: int = Field(10000, env="TOKEN_CACHE_SIZE")
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = Field(12, env="BCRYPT_ROUNDS")
+    PASSWORD_HASH_CONCURRENCY: int = Field(4, env="PASSWORD_HASH_CONCURRENCY")
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = Field(5.0, env="PASSWORD_HASH_QUEUE_TIMEOUT")
+
+    # Authenticated user cache. Each process has its own and only invalidates
+    # it on user changes made through that process, so elsewhere a role
+    # change or deactivation takes effect within USER_CACHE_TTL seconds.
+    USER_CACHE_SIZE: int = Field(10000, env="USER_CACHE_SIZE")
+    USER_CACHE_TTL: int = Field(60, env="USER_CACHE_TTL")
+
+    # Task listing
+    TASK_PAGE_SIZE_DEFAULT: int = Field(50, env="TASK_PAGE_SIZE_DEFAULT")
+    TASK_PAGE_SIZE_MAX: int = Field(200, env="TASK_PAGE_SIZE_MAX")
+
+    # Task import
+    TASK_IMPORT_BATCH_SIZE: int = Field(1000, env="TASK_IMPORT_BATCH_SIZE")
+    TASK_IMPORT_MAX_ERRORS: int = Field(1000, env="TASK_IMPORT_MAX_ERRORS")
+    # Longer lines, and CSV records spanning more lines, fail as one row
+    TASK_IMPORT_MAX_LINE_BYTES: int = Field(65536, env="TASK_IMPORT_MAX_LINE_BYTES")
+    TASK_IMPORT_MAX_RECORD_LINES: int = Field(100, env="TASK_IMPORT_MAX_RECORD_LINES")
+
+    # Task export
+    TASK_EXPORT_BATCH_SIZE: int = Field(1000, env="TASK_EXPORT_BATCH_SIZE")
+
+    # Bulk status change, reassignment and delete: most tasks per request
+    TASK_BULK_MAX: int = Field(1000, env="TASK_BULK_MAX")
+
+    # Due-date reminders
+    REMINDERS_ENABLED: bool = Field(True, env="REMINDERS_ENABLED")
+    # Comma-separated minutes before the due date
+    REMINDER_OFFSETS_MINUTES: str = Field("1440,60", env="REMINDER_OFFSETS_MINUTES")
+    REMINDER_LOOKAHEAD_SECONDS: int = Field(900, env="REMINDER_LOOKAHEAD_SECONDS")
+    REMINDER_CATCHUP_SECONDS: int = Field(300, env="REMINDER_CATCHUP_SECONDS")
+
+    # Searches over all tasks rank only this many of the newest matches, so
+    # very common words stay fast (0 ranks every match)
+    TASK_SEARCH_MAX_CANDIDATES: int = Field(10000, env="TASK_SEARCH_MAX_CANDIDATES")
+
+    # Dependency graph cache
+    TASK_GRAPH_CACHE_SIZE: int = Field(1000, env="TASK_GRAPH_CACHE_SIZE")
+    TASK_GRAPH_CACHE_TTL: int = Field(300, env="TASK_GRAPH_CACHE_TTL")
+
+    # Overdue escalation sweep
+    ESCALATION_SWEEP_ENABLED: bool = Field(True, env="ESCALATION_SWEEP_ENABLED")
+    ESCALATION_SWEEP_INTERVAL_SECONDS: int = Field(
+        300, env="ESCALATION_SWEEP_INTERVAL_SECONDS"
+    )
+    ESCALATION_BATCH_SIZE: int = Field(1000, env="ESCALATION_BATCH_SIZE")
+
+    # Task rollups: how often the overdue watermark advances, and how often
+    # the rollups are rebuilt to detect drift (0 disables the rebuild)
+    TASK_ROLLUP_MAINTENANCE_ENABLED: bool = Field(
+        True, env="TASK_ROLLUP_MAINTENANCE_ENABLED"
+    )
+    TASK_ROLLUP_OVERDUE_INTERVAL_SECONDS: int = Field(
+        60, env="TASK_ROLLUP_OVERDUE_INTERVAL_SECONDS"
+    )
+    TASK_ROLLUP_RECONCILE_INTERVAL_SECONDS: int = Field(
+        86400, env="TASK_ROLLUP_RECONCILE_INTERVAL_SECONDS"
+    )
+
+    # Notifications; sinks is a comma-separated list of "log" and "smtp"
+    NOTIFICATIONS_ENABLED: bool = Field(True, env="NOTIFICATIONS_ENABLED")
+    NOTIFICATION_SINKS: str = Field("log", env="NOTIFICATION_SINKS")
+    # JSON lines file for the log sink; the application log when empty
+    NOTIFICATION_LOG_PATH: str = Field("", env="NOTIFICATION_LOG_PATH")
+    NOTIFICATION_QUEUE_SIZE: int = Field(10000, env="NOTIFICATION_QUEUE_SIZE")
+    NOTIFICATION_COALESCE_SECONDS: float = Field(
+        60.0, env="NOTIFICATION_COALESCE_SECONDS"
+    )
+    NOTIFICATION_BATCH_SIZE: int = Field(100, env="NOTIFICATION_BATCH_SIZE")
+    NOTIFICATION_DIGEST_MAX_ITEMS: int = Field(50, env="NOTIFICATION_DIGEST_MAX_ITEMS")
+    # Notifications held in the coalescing buckets at once; beyond it they wait
+    # in the queue, and are dropped once that is full too
+    NOTIFICATION_MAX_BUFFERED: int = Field(50000, env="NOTIFICATION_MAX_BUFFERED")
+    SMTP_HOST: str = Field("localhost", env="SMTP_HOST")
+    SMTP_PORT: int = Field(25, env="SMTP_PORT")
+    SMTP_FROM: str = Field("tasks@localhost", env="SMTP_FROM")
+    SMTP_USERNAME: str = Field("", env="SMTP_USERNAME")
+    SMTP_PASSWORD: str = Field("", env="SMTP_PASSWORD")
+    SMTP_STARTTLS: bool = Field(False, env="SMTP_STARTTLS")
+    SMTP_TIMEOUT: float = Field(10.0, env="SMTP_TIMEOUT")
 
     class Config:
         case_sensitive = True
@@ -1,27 +1,62 @@
+from dataclasses import dataclass, fields
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.db.session import get_db
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.utils.jwt import decode_token
 
+settings = get_settings()
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/signin")
 
 
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Immutable snapshot of the authenticated user, shared across requests"""
+
+    id: int
+    name: str
+    email: str
+    phone_number: str
+    role: UserRole
+    is_active: bool
+    is_superuser: bool
+
+
+_CURRENT_USER_COLUMNS = [getattr(User, field.name) for field in fields(CurrentUser)]
+
+# CurrentUser snapshots by id. Invalidate on every change to a user row; see
+# USER_CACHE_TTL for how long other processes may serve a stale one.
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ):
     """
     Get the current authenticated user from the JWT token.
 
+    Users are served from `user_cache` when possible, so most requests skip
+    the user lookup entirely. The cached value is a frozen snapshot rather
+    than an ORM instance, so concurrent requests cannot change it or try to
+    lazy-load through it.
+
+    Misses are read from the primary: a lagging replica could return the
+    role or active flag from before a change, and caching that would undo
+    the invalidation for the rest of the TTL.
+
     Args:
         token: The JWT token from the Authorization header.
-        db: The database session.
+        db: The primary database session.
 
     Returns:
-        User: The authenticated user.
+        CurrentUser: The authenticated user.
 
     Raises:
         HTTPException: If the token is invalid or the user does not exist.
@@ -44,8 +79,16 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = user_cache.get(user_id)
+    if user is None:
+        result = await db.execute(
+            select(*_CURRENT_USER_COLUMNS).where(User.id == user_id)
+        )
+        row = result.one_or_none()
+
+        if row is not None:
+            user = CurrentUser(**row._mapping)
+            user_cache.set(user_id, user)
 
     if user is None:
         raise HTTPException(
@@ -64,7 +107,9 @@ async def get_current_user(
     return user
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+async def get_current_active_user(
+    current_user: CurrentUser = Depends(get_current_user),
+):
     """
     Get the current active user.
 
@@ -72,7 +117,7 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
         current_user: The current authenticated user.
 
     Returns:
-        User: The current active user.
+        CurrentUser: The current active user.
     """
     return current_user
 
@@ -88,7 +133,7 @@ def role_required(role: list[str]):
         Callable: A function that checks the user's role.
     """
 
-    async def role_checker(current_user: User = Depends(get_current_user)):
+    async def role_checker(current_user: CurrentUser = Depends(get_current_user)):
         if current_user.role not in role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -99,4 +144,4 @@ def role_required(role: list[str]):
     return role_checker
 
 
-admin_or_supervisor = role_required(["Admin", "Supervisor"])
\ No newline at end of file
+admin_or_supervisor = role_required(["Admin", "Supervisor"])
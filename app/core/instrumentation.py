@@ -0,0 +1,397 @@
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterable, Iterator
+import logging
+import re
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY, Counter, Gauge, Histogram, Metric
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by method, route template and status code",
+        labelnames=("method", "route", "status"),
+    )
+)
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from receiving a request to sending the last response byte",
+        labelnames=("method", "route"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge(
+        "http_requests_in_flight",
+        "HTTP requests currently being handled",
+        labelnames=("method",),
+    )
+)
+HTTP_RESPONSE_BYTES = REGISTRY.register(
+    Histogram(
+        "http_response_size_bytes",
+        "Size of the response body",
+        labelnames=("method", "route"),
+        buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+    )
+)
+HTTP_REQUEST_DB_QUERIES = REGISTRY.register(
+    Histogram(
+        "http_request_db_queries",
+        "Database statements executed while handling a request",
+        labelnames=("method", "route"),
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+    )
+)
+HTTP_REQUEST_DB_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_db_seconds",
+        "Time spent executing database statements while handling a request",
+        labelnames=("method", "route"),
+    )
+)
+HTTP_REQUEST_APP_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_app_seconds",
+        "Time spent outside the database while handling a request",
+        labelnames=("method", "route"),
+    )
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+# Most statements each endpoint may run, with warm token and user caches.
+# Exceeding one is logged in debug mode; tests assert them with
+# `assert_max_queries`.
+QUERY_BUDGETS: dict[tuple[str, str], int] = {
+    ("POST", "/auth/signin"): 1,
+    ("GET", "/auth/employees"): 1,
+    ("GET", "/tasks/"): 2,
+    ("GET", "/tasks/assigned"): 2,
+    ("GET", "/tasks/search"): 1,
+    ("GET", "/tasks/summary"): 1,
+    ("GET", "/tasks/{task_id}"): 2,
+    ("POST", "/tasks/"): 3,
+    ("PUT", "/tasks/{task_id}"): 1,
+    ("PATCH", "/tasks/{task_id}"): 1,
+    # Its dependency edges, the remarks, dependants and escalations it
+    # detaches, then the delete
+    ("DELETE", "/tasks/{task_id}"): 5,
+    ("GET", "/tasks/{task_id}/graph"): 2,
+    ("POST", "/tasks/bulk/status"): 2,
+    ("POST", "/tasks/bulk/reassign"): 2,
+    ("POST", "/tasks/bulk/delete"): 6,
+}
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists and multi-row VALUES differ only in their placeholder count
+_PLACEHOLDER_LIST = re.compile(r"(?:\?|%s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%s|\$\d+|:\w+))+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so repeated executions compare equal.
+
+    Args:
+        statement: The SQL sent to the driver.
+
+    Returns:
+        str: The statement with collapsed whitespace and placeholder lists.
+    """
+    return _PLACEHOLDER_LIST.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
+
+class RequestStats:
+    """Database work done on behalf of the current request"""
+
+    __slots__ = ("queries", "db_seconds", "statements")
+
+    def __init__(self, track_statements: bool = False):
+        self.queries = 0
+        self.db_seconds = 0.0
+        # Fingerprint -> executions, only kept when looking for N+1 patterns
+        self.statements = StatementCounter() if track_statements else None
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least `threshold` times"""
+        if self.statements is None:
+            return []
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+# Every active collector, innermost last. Shared with the SQLAlchemy
+# greenlets and the streaming response tasks, which both run in a copy of
+# the request's context.
+_active_stats: ContextVar[tuple[RequestStats, ...]] = ContextVar(
+    "active_stats", default=()
+)
+
+
+@contextmanager
+def collect_stats(stats: RequestStats) -> Iterator[RequestStats]:
+    """Attribute the statements run in this context to `stats`"""
+    token = _active_stats.set((*_active_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_stats.get():
+        conn.info["query_started_at"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info.pop("query_started_at", None)
+    if started_at is None:
+        return
+
+    elapsed = perf_counter() - started_at
+    key = None
+    for stats in _active_stats.get():
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        if stats.statements is not None:
+            key = key or fingerprint(statement)
+            stats.statements[key] += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Count the statements and database time of each request on an engine.
+
+    Args:
+        engine: The engine to instrument.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request metrics.
+
+    Requests are labelled by route template (`/tasks/{task_id}`), not by raw
+    path, so the number of series stays bounded. Streaming responses are
+    timed until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_bytes = 0
+
+        async def send_with_metrics(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        stats = RequestStats(track_statements=settings.DEBUG)
+        HTTP_REQUESTS_IN_FLIGHT.inc(method)
+        started_at = perf_counter()
+        try:
+            with collect_stats(stats):
+                await self.app(scope, receive, send_with_metrics)
+        finally:
+            duration = perf_counter() - started_at
+            HTTP_REQUESTS_IN_FLIGHT.dec(method)
+
+            # FastAPI records the matched route in the scope during routing
+            route = scope.get("route")
+            template = getattr(route, "path", UNMATCHED_ROUTE)
+            HTTP_REQUESTS.inc(method, template, status_code)
+            HTTP_REQUEST_SECONDS.observe(duration, method, template)
+            HTTP_RESPONSE_BYTES.observe(response_bytes, method, template)
+            HTTP_REQUEST_DB_QUERIES.observe(stats.queries, method, template)
+            HTTP_REQUEST_DB_SECONDS.observe(stats.db_seconds, method, template)
+            HTTP_REQUEST_APP_SECONDS.observe(
+                max(duration - stats.db_seconds, 0.0), method, template
+            )
+            if settings.DEBUG:
+                check_query_patterns(method, template, stats)
+
+
+def check_query_patterns(method: str, route: str, stats: RequestStats) -> None:
+    """
+    Log requests that exceed their query budget or repeat a statement.
+
+    Args:
+        method: The HTTP method.
+        route: The route template.
+        stats: The statements recorded for the request.
+    """
+    budget = QUERY_BUDGETS.get((method, route))
+    if budget is not None and stats.queries > budget:
+        logger.warning(
+            "%s %s ran %d queries, over its budget of %d",
+            method,
+            route,
+            stats.queries,
+            budget,
+        )
+
+    for statement, count in stats.repeated_statements(settings.QUERY_REPEAT_THRESHOLD):
+        logger.warning(
+            "Possible N+1 in %s %s: statement ran %d times: %s",
+            method,
+            route,
+            count,
+            statement,
+        )
+
+
+@contextmanager
+def count_queries() -> Iterator[RequestStats]:
+    """
+    Count the statements run inside the block, on every engine.
+
+    Works with or without the metrics middleware, and includes statements
+    run by requests sent through an in-process ASGI client.
+
+    Yields:
+        RequestStats: The live counters, including per-statement counts.
+    """
+    from app.db.session import engine, replica_engines
+
+    for db_engine in (engine, *replica_engines):
+        instrument_engine(db_engine)
+    with collect_stats(RequestStats(track_statements=True)) as stats:
+        yield stats
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[RequestStats]:
+    """
+    Fail when the block runs more than `max_queries` statements.
+
+    For use in tests, e.g. with an endpoint's entry in `QUERY_BUDGETS`:
+
+        with assert_max_queries(QUERY_BUDGETS["GET", "/tasks/"]):
+            await client.get("/tasks/", headers=headers)
+
+    Args:
+        max_queries: The most statements allowed.
+
+    Yields:
+        RequestStats: The live counters.
+
+    Raises:
+        AssertionError: If more statements ran, listing them by count.
+    """
+    with count_queries() as stats:
+        yield stats
+
+    if stats.queries > max_queries:
+        executed = "\n".join(
+            f"  {count}x {statement}"
+            for statement, count in stats.statements.most_common()
+        )
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, ran {stats.queries}:\n{executed}"
+        )
+
+
+@REGISTRY.register_collector
+def collect_pool_metrics() -> Iterable[Metric]:
+    """Report the connection pool state of the primary and replica engines"""
+    from app.db.session import engine, pool_status, replica_engines
+
+    gauges = {
+        "size": Gauge(
+            "db_pool_size", "Connections kept open by the pool", ("database",)
+        ),
+        "checked_out": Gauge(
+            "db_pool_checked_out", "Connections currently checked out", ("database",)
+        ),
+        "overflow": Gauge(
+            "db_pool_overflow", "Connections open beyond the pool size", ("database",)
+        ),
+    }
+    counters = {
+        "checkouts": Counter(
+            "db_pool_checkouts_total", "Connection checkouts", ("database",)
+        ),
+        "waits": Counter(
+            "db_pool_waits_total",
+            "Checkouts that had to wait for a connection",
+            ("database",),
+        ),
+        "wait_seconds": Counter(
+            "db_pool_wait_seconds_total",
+            "Time spent waiting for a connection",
+            ("database",),
+        ),
+        "timeouts": Counter(
+            "db_pool_timeouts_total",
+            "Checkouts that gave up after the pool timeout",
+            ("database",),
+        ),
+    }
+
+    databases = [("primary", engine)] + [
+        (f"replica{index}", replica) for index, replica in enumerate(replica_engines)
+    ]
+    for database, db_engine in databases:
+        status = pool_status(db_engine)
+        for key, gauge in gauges.items():
+            if key in status:
+                gauge.set(database, value=status[key])
+        for key, counter in counters.items():
+            if key in status:
+                counter.inc(database, amount=status[key])
+
+    return [*gauges.values(), *counters.values()]
+
+
+@REGISTRY.register_collector
+def collect_cache_metrics() -> Iterable[Metric]:
+    """Report the size and hit counters of the in-process caches"""
+    from app.core.dependencies import user_cache
+    from app.services.task_dependency_service import task_graph_cache
+    from app.utils.jwt import token_cache
+
+    entries = Gauge("cache_entries", "Entries held by the cache", ("cache",))
+    hits = Counter(
+        "cache_hits_total", "Cache lookups that found a live entry", ("cache",)
+    )
+    misses = Counter(
+        "cache_misses_total", "Cache lookups that found no live entry", ("cache",)
+    )
+    caches = (
+        ("token", token_cache),
+        ("user", user_cache),
+        ("task_graph", task_graph_cache),
+    )
+    for name, cache in caches:
+        stats = cache.stats()
+        entries.set(name, value=stats["size"])
+        hits.inc(name, amount=stats["hits"])
+        misses.inc(name, amount=stats["misses"])
+
+    return [entries, hits, misses]
@@ -0,0 +1,222 @@
+"""
+Raw DDL for the database objects SQLAlchemy does not model.
+
+The `after_create` listeners in `app.models` run it for new databases and
+the migrations run it for existing ones, so both install the same objects.
+"""
+
+# PostgreSQL: one statement-level trigger per operation, aggregating the
+# transition tables, so bulk writes update each rollup row once per statement
+TASK_ROLLUP_POSTGRESQL_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION task_rollups_apply() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        watermark timestamptz;
+    BEGIN
+        -- Waits while the watermark is being advanced
+        SELECT state.overdue_as_of INTO watermark
+        FROM task_rollup_state AS state WHERE state.id = 1 FOR KEY SHARE;
+
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO task_rollups (assigned_to_id, status, task_count, overdue_count)
+            SELECT COALESCE(assigned_to_id, 0), COALESCE(status::text, 'PENDING'), count(*),
+                   count(*) FILTER (WHERE status IS DISTINCT FROM 'COMPLETED' AND due_date <= watermark)
+            FROM new_rows GROUP BY 1, 2 ORDER BY 1, 2
+            ON CONFLICT (assigned_to_id, status) DO UPDATE SET
+                task_count = task_rollups.task_count + EXCLUDED.task_count,
+                overdue_count = task_rollups.overdue_count + EXCLUDED.overdue_count;
+        ELSIF TG_OP = 'DELETE' THEN
+            INSERT INTO task_rollups (assigned_to_id, status, task_count, overdue_count)
+            SELECT COALESCE(assigned_to_id, 0), COALESCE(status::text, 'PENDING'), -count(*),
+                   -count(*) FILTER (WHERE status IS DISTINCT FROM 'COMPLETED' AND due_date <= watermark)
+            FROM old_rows GROUP BY 1, 2 ORDER BY 1, 2
+            ON CONFLICT (assigned_to_id, status) DO UPDATE SET
+                task_count = task_rollups.task_count + EXCLUDED.task_count,
+                overdue_count = task_rollups.overdue_count + EXCLUDED.overdue_count;
+        ELSE
+            INSERT INTO task_rollups (assigned_to_id, status, task_count, overdue_count)
+            SELECT assigned_to_id, status, sum(task_count), sum(overdue_count)
+            FROM (
+                SELECT COALESCE(assigned_to_id, 0) AS assigned_to_id,
+                       COALESCE(status::text, 'PENDING') AS status, 1 AS task_count,
+                       CASE WHEN status IS DISTINCT FROM 'COMPLETED' AND due_date <= watermark
+                            THEN 1 ELSE 0 END AS overdue_count
+                FROM new_rows
+                UNION ALL
+                SELECT COALESCE(assigned_to_id, 0), COALESCE(status::text, 'PENDING'), -1,
+                       CASE WHEN status IS DISTINCT FROM 'COMPLETED' AND due_date <= watermark
+                            THEN -1 ELSE 0 END
+                FROM old_rows
+            ) AS delta
+            GROUP BY 1, 2
+            HAVING sum(task_count) <> 0 OR sum(overdue_count) <> 0
+            ORDER BY 1, 2
+            ON CONFLICT (assigned_to_id, status) DO UPDATE SET
+                task_count = task_rollups.task_count + EXCLUDED.task_count,
+                overdue_count = task_rollups.overdue_count + EXCLUDED.overdue_count;
+        END IF;
+        RETURN NULL;
+    END;
+    $$
+    """,
+    """
+    CREATE TRIGGER task_rollups_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_rollups_apply()
+    """,
+    """
+    CREATE TRIGGER task_rollups_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_rollups_apply()
+    """,
+    """
+    CREATE TRIGGER task_rollups_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_rollups_apply()
+    """,
+]
+
+# SQLite has no statement-level triggers, so the rollups are updated per row
+TASK_ROLLUP_SQLITE_DDL = [
+    """
+    CREATE TRIGGER task_rollups_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_rollups (assigned_to_id, status, task_count, overdue_count)
+        SELECT COALESCE(NEW.assigned_to_id, 0), COALESCE(NEW.status, 'PENDING'), 1,
+               CASE WHEN NEW.status IS NOT 'COMPLETED' AND NEW.due_date <= state.overdue_as_of
+                    THEN 1 ELSE 0 END
+        FROM task_rollup_state AS state WHERE state.id = 1
+        ON CONFLICT (assigned_to_id, status) DO UPDATE SET
+            task_count = task_count + excluded.task_count,
+            overdue_count = overdue_count + excluded.overdue_count;
+    END
+    """,
+    """
+    CREATE TRIGGER task_rollups_update AFTER UPDATE OF assigned_to_id, status, due_date ON tasks
+    BEGIN
+        UPDATE task_rollups SET
+            task_count = task_count - 1,
+            overdue_count = overdue_count - (
+                SELECT CASE WHEN OLD.status IS NOT 'COMPLETED' AND OLD.due_date <= state.overdue_as_of
+                            THEN 1 ELSE 0 END
+                FROM task_rollup_state AS state WHERE state.id = 1
+            )
+        WHERE assigned_to_id = COALESCE(OLD.assigned_to_id, 0)
+          AND status = COALESCE(OLD.status, 'PENDING');
+        INSERT INTO task_rollups (assigned_to_id, status, task_count, overdue_count)
+        SELECT COALESCE(NEW.assigned_to_id, 0), COALESCE(NEW.status, 'PENDING'), 1,
+               CASE WHEN NEW.status IS NOT 'COMPLETED' AND NEW.due_date <= state.overdue_as_of
+                    THEN 1 ELSE 0 END
+        FROM task_rollup_state AS state WHERE state.id = 1
+        ON CONFLICT (assigned_to_id, status) DO UPDATE SET
+            task_count = task_count + excluded.task_count,
+            overdue_count = overdue_count + excluded.overdue_count;
+    END
+    """,
+    """
+    CREATE TRIGGER task_rollups_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE task_rollups SET
+            task_count = task_count - 1,
+            overdue_count = overdue_count - (
+                SELECT CASE WHEN OLD.status IS NOT 'COMPLETED' AND OLD.due_date <= state.overdue_as_of
+                            THEN 1 ELSE 0 END
+                FROM task_rollup_state AS state WHERE state.id = 1
+            )
+        WHERE assigned_to_id = COALESCE(OLD.assigned_to_id, 0)
+          AND status = COALESCE(OLD.status, 'PENDING');
+    END
+    """,
+]
+
+# Full-text search over title and description. PostgreSQL keeps a weighted
+# tsvector in a generated column that is not mapped on the model, so task
+# queries never load it; SQLite keeps an external-content FTS5 table in sync
+# with triggers.
+TASK_SEARCH_CONFIG = "english"
+
+TASK_SEARCH_POSTGRESQL_DDL = [
+    f"""
+    ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+]
+
+TASK_SEARCH_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+        INSERT INTO tasks_fts (rowid, title, description)
+        VALUES (NEW.id, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks
+    BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+        VALUES ('delete', OLD.id, OLD.title, OLD.description);
+    END
+    """,
+]
+
+
+# Task versions. Every insert and update gives the row the next value of a
+# counter shared by all tasks, so a task never gets back a version it had and
+# the versions of a set of tasks change whenever any of them changes.
+# Triggers set it, so bulk statements, imports and the escalation sweep are
+# covered too.
+TASK_VERSION_POSTGRESQL_DDL = [
+    "CREATE SEQUENCE IF NOT EXISTS task_version_seq",
+    """
+    CREATE OR REPLACE FUNCTION tasks_next_version() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.version := nextval('task_version_seq');
+        RETURN NEW;
+    END;
+    $$
+    """,
+    """
+    CREATE TRIGGER tasks_version BEFORE INSERT OR UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_next_version()
+    """,
+]
+
+# SQLite triggers cannot change NEW, so the row is updated after the write;
+# statements that set a new version themselves, e.g. to return it, are left
+# alone. The counter is the highest version plus one, so once the task holding
+# the highest version is deleted, the next write reuses that version.
+TASK_VERSION_SQLITE_DDL = [
+    "CREATE INDEX ix_tasks_version ON tasks (version)",
+    """
+    CREATE TRIGGER tasks_version_insert AFTER INSERT ON tasks
+    BEGIN
+        UPDATE tasks SET version = (SELECT max(version) FROM tasks) + 1 WHERE id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_version_update AFTER UPDATE ON tasks
+    WHEN NEW.version = OLD.version
+    BEGIN
+        UPDATE tasks SET version = (SELECT max(version) FROM tasks) + 1 WHERE id = NEW.id;
+    END
+    """,
+]
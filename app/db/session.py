@@ -1,15 +1,249 @@
+from itertools import cycle
+from time import perf_counter, time
+from uuid import uuid4
+
+from fastapi import Depends, Request, Response
+from starlette.datastructures import MutableHeaders
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import get_settings
 
 settings = get_settings()
 
 DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+REPLICA_URLS = [
+    url.strip().replace("postgresql://", "postgresql+asyncpg://")
+    for url in settings.DATABASE_REPLICA_URLS.split(",")
+    if url.strip()
+]
+
+# Set after a committed write; while it is fresh, reads go to the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that counts checkouts, waits for a free connection and timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        self.checkouts += 1
+        # Same condition as QueuePool: every connection is in use and the
+        # overflow is exhausted, so the checkout blocks until one is returned
+        if (
+            self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+            and self._pool.empty()
+        ):
+            self.waits += 1
+            started = perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                self.timeouts += 1
+                raise
+            finally:
+                self.wait_seconds += perf_counter() - started
+
+        return super()._do_get()
+
+
+def engine_options(url: str) -> dict:
+    """
+    Build the engine keyword arguments for a database URL from the settings.
+
+    Args:
+        url: The async database URL.
+
+    Returns:
+        dict: Keyword arguments for `create_async_engine`.
+    """
+    parsed = make_url(url)
+    options = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    # In-memory SQLite must keep its single shared connection
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+    if parsed.get_backend_name() == "postgresql":
+        if settings.DB_PGBOUNCER:
+            # PgBouncer in transaction mode cannot keep prepared statements
+            # across transactions, so disable both statement caches and use
+            # unique statement names
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            options["connect_args"] = {
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            }
+
+    return options
+
+
+def pool_status(engine) -> dict:
+    """
+    Report the live state of an engine's connection pool.
+
+    Args:
+        engine: The engine to inspect.
+
+    Returns:
+        dict: Pool size, checked-out and overflow connections, and the
+        checkout, wait and timeout counters when the pool is instrumented.
+    """
+    pool = engine.pool
+    status = {"pool": pool.__class__.__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(
+            checkouts=pool.checkouts,
+            waits=pool.waits,
+            wait_seconds=round(pool.wait_seconds, 6),
+            timeouts=pool.timeouts,
+        )
+    return status
+
+
+class PrimarySession(Session):
+    """Session bound to the primary database"""
+
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_read_your_writes(session):
+    request = session.info.get("request")
+    if request is not None:
+        request.state.read_primary_until = (
+            int(time()) + settings.READ_YOUR_WRITES_SECONDS
+        )
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware setting the read-your-writes cookie after a committed write.
+
+    The cookie is added to the response as it is sent, so it also reaches
+    clients of endpoints that build their own `Response`, such as
+    `orjson_response` and streaming responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            until = scope.get("state", {}).get("read_primary_until")
+            if message["type"] == "http.response.start" and until is not None:
+                cookie = Response()
+                cookie.set_cookie(
+                    READ_PRIMARY_COOKIE,
+                    str(until),
+                    max_age=settings.READ_YOUR_WRITES_SECONDS,
+                    httponly=True,
+                    samesite="lax",
+                )
+                MutableHeaders(scope=message).append(
+                    "set-cookie", cookie.headers["set-cookie"]
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, sync_session_class=PrimarySession
+)
+
+replica_engines = [
+    create_async_engine(url, **engine_options(url)) for url in REPLICA_URLS
+]
+_replica_sessionmakers = cycle(
+    [
+        async_sessionmaker(autocommit=False, autoflush=False, bind=replica)
+        for replica in replica_engines
+    ]
+)
+
+
+def wants_primary(request: Request) -> bool:
+    """Whether a read must see this client's latest writes"""
+    if request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time()
+    except ValueError:
+        return False
+
+
+def read_sessionmaker(request: Request) -> async_sessionmaker:
+    """
+    Pick the session factory for a read-only request.
+
+    Replicas are used round-robin, unless there are none or the client just
+    wrote (see `wants_primary`).
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        async_sessionmaker: A replica session factory or `AsyncSessionLocal`.
+    """
+    if not replica_engines or wants_primary(request):
+        return AsyncSessionLocal
+    return next(_replica_sessionmakers)
 
 
 # Dependency for FastAPI routes
-async def get_db() -> AsyncSession:
+async def get_db(request: Request) -> AsyncSession:
     async with AsyncSessionLocal() as session:
+        session.info["request"] = request
+        yield session
+
+
+# Dependency for read-only FastAPI routes
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncSession:
+    sessionmaker = read_sessionmaker(request)
+    if sessionmaker is AsyncSessionLocal:
+        yield db
+        return
+
+    async with sessionmaker() as session:
         yield session
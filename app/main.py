@@ -1,18 +1,69 @@
+from contextlib import asynccontextmanager
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.config import get_settings
+from app.core.instrumentation import MetricsMiddleware, instrument_engine
+from app.db.session import ReadYourWritesMiddleware, engine, replica_engines
+from app.services.escalation_service import run_escalation_sweeps
+from app.services.task_rollup_service import run_rollup_maintenance
+from app.utils.notifications import notification_dispatcher
+from app.utils.reminders import reminder_scheduler
 from app.router import (
+    admin,
     auth,
+    metrics,
     task,
 )
 
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.NOTIFICATIONS_ENABLED:
+        notification_dispatcher.start()
+    if settings.REMINDERS_ENABLED:
+        reminder_scheduler.start()
+    escalation_sweeps = None
+    if settings.ESCALATION_SWEEP_ENABLED:
+        escalation_sweeps = asyncio.create_task(
+            run_escalation_sweeps(settings.ESCALATION_SWEEP_INTERVAL_SECONDS)
+        )
+    rollup_maintenance = None
+    if settings.TASK_ROLLUP_MAINTENANCE_ENABLED:
+        rollup_maintenance = asyncio.create_task(
+            run_rollup_maintenance(
+                settings.TASK_ROLLUP_OVERDUE_INTERVAL_SECONDS,
+                settings.TASK_ROLLUP_RECONCILE_INTERVAL_SECONDS,
+            )
+        )
+    yield
+    for background_task in (escalation_sweeps, rollup_maintenance):
+        if background_task is not None:
+            background_task.cancel()
+            await asyncio.gather(background_task, return_exceptions=True)
+    await reminder_scheduler.stop()
+    # Delivers the digests still pending
+    await notification_dispatcher.stop()
 
-app = FastAPI(root_path="/api", title="Task Management API", description="API for managing tasks", version="1.0.0")
+
+app = FastAPI(
+    root_path="/api",
+    title="Task Management API",
+    description="API for managing tasks",
+    version="1.0.0",
+    lifespan=lifespan,
+)
 
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(task.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
 
 
 app.add_middleware(
@@ -22,3 +73,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.METRICS_ENABLED:
+    for db_engine in (engine, *replica_engines):
+        instrument_engine(db_engine)
+    app.add_middleware(MetricsMiddleware)
@@ -1,4 +1,6 @@
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Column,
     Integer,
     String,
@@ -7,9 +9,23 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     Text,
+    Index,
+    UniqueConstraint,
+    CheckConstraint,
+    event,
+    func,
+    text,
 )
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.ddl import (
+    TASK_ROLLUP_POSTGRESQL_DDL,
+    TASK_ROLLUP_SQLITE_DDL,
+    TASK_SEARCH_POSTGRESQL_DDL,
+    TASK_SEARCH_SQLITE_DDL,
+    TASK_VERSION_POSTGRESQL_DDL,
+    TASK_VERSION_SQLITE_DDL,
+)
 from datetime import datetime, timezone
 import enum
 
@@ -23,6 +39,30 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+        Index("ix_tasks_status_id", "status", "id"),
+        Index("ix_tasks_assigned_to_id_id", "assigned_to_id", "id"),
+        Index("ix_tasks_assigned_to_id_due_date", "assigned_to_id", "due_date", "id"),
+        Index("ix_tasks_assigned_by_id_id", "assigned_by_id", "id"),
+        # Open tasks of an assignee by due date
+        Index(
+            "ix_tasks_open_by_assignee",
+            "assigned_to_id",
+            "due_date",
+            postgresql_where=text("status <> 'COMPLETED'"),
+            sqlite_where=text("status <> 'COMPLETED'"),
+        ),
+        # Overdue candidates that have not been escalated yet
+        Index(
+            "ix_tasks_unescalated_due_date",
+            "due_date",
+            postgresql_where=text(
+                "escalation_flagged IS NOT true AND status <> 'COMPLETED'"
+            ),
+            sqlite_where=text("escalation_flagged IS NOT 1 AND status <> 'COMPLETED'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -33,6 +73,8 @@ class Task(Base):
     due_date = Column(DateTime(timezone=True))
     status = Column(Enum(TaskStatus), default=TaskStatus.PENDING)
     escalation_flagged = Column(Boolean, default=False)
+    # Taken from a counter shared by all tasks on every insert and update
+    version = Column(BigInteger, nullable=False, server_default=text("0"))
 
     # Relations
     assigned_to = relationship("User", foreign_keys=[assigned_to_id])
@@ -49,7 +91,7 @@ class DependantTask(Base):
     title = Column(String, nullable=False)
     description = Column(Text)
     created_by_id = Column(Integer, ForeignKey("users.id"))
-    dependant_to_id = Column(Integer, ForeignKey("tasks.id"))
+    dependant_to_id = Column(Integer, ForeignKey("tasks.id"), index=True)
     created_in = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
 
     # Relations
@@ -57,6 +99,35 @@ class DependantTask(Base):
     dependant_to = relationship("Task", foreign_keys=[dependant_to_id])
 
 
+class TaskDependency(Base):
+    """Edge of the dependency graph: the blocking task must finish before the blocked one"""
+
+    __tablename__ = "task_dependencies"
+    __table_args__ = (
+        UniqueConstraint(
+            "blocking_task_id", "blocked_task_id", name="uq_task_dependencies_edge"
+        ),
+        CheckConstraint(
+            "blocking_task_id <> blocked_task_id", name="ck_task_dependencies_not_self"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    blocking_task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    blocked_task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    created_by_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    blocking_task = relationship("Task", foreign_keys=[blocking_task_id])
+    blocked_task = relationship("Task", foreign_keys=[blocked_task_id])
+
+
 class RemarkSource(str, enum.Enum):
     SUPERVISOR = "Supervisor"
     COMPLIANCE = "Compliance"
@@ -67,7 +138,7 @@ class TaskRemark(Base):
     __tablename__ = "task_remarks"
 
     id = Column(Integer, primary_key=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"))
+    task_id = Column(Integer, ForeignKey("tasks.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     source = Column(Enum(RemarkSource))
     remark = Column(Text, nullable=False)
@@ -81,10 +152,121 @@ class EscalationLog(Base):
     __tablename__ = "escalations"
 
     id = Column(Integer, primary_key=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"))
+    task_id = Column(Integer, ForeignKey("tasks.id"), index=True)
     escalated_by_id = Column(Integer, ForeignKey("users.id"))
     timestamp = Column(DateTime, default=datetime.now(timezone.utc))
     reason = Column(Text)
 
     task = relationship("Task")
     escalated_by = relationship("User")
+
+
+class TaskReminder(Base):
+    """Due-date reminder that was sent; the unique key lets only one worker claim it"""
+
+    __tablename__ = "task_reminders"
+    __table_args__ = (
+        UniqueConstraint(
+            "task_id",
+            "due_date",
+            "offset_minutes",
+            name="uq_task_reminders_task_due_offset",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    due_date = Column(DateTime(timezone=True), nullable=False)
+    offset_minutes = Column(Integer, nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=False)
+
+    task = relationship("Task")
+
+
+class TaskRollup(Base):
+    """
+    Task counts per assignee and status, maintained by triggers on `tasks`.
+
+    Unassigned tasks are counted under assignee 0 and tasks without a status
+    under PENDING, the column default. `overdue_count` only counts open tasks
+    due by `TaskRollupState.overdue_as_of`; tasks becoming overdue after it
+    are added when the watermark advances.
+    """
+
+    __tablename__ = "task_rollups"
+
+    assigned_to_id = Column(Integer, primary_key=True, autoincrement=False)
+    status = Column(String(20), primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    overdue_count = Column(Integer, nullable=False, default=0)
+
+
+class TaskRollupState(Base):
+    """Single row holding the overdue watermark of the rollups"""
+
+    __tablename__ = "task_rollup_state"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    overdue_as_of = Column(DateTime(timezone=True), nullable=False)
+    reconciled_at = Column(DateTime(timezone=True))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_rollup_triggers(target, connection, tables=(), **kw) -> None:
+    """
+    Install the rollup triggers when `create_all` creates the rollup table.
+
+    Existing databases get them from the migration that adds the table.
+    """
+    if TaskRollup.__table__ not in tables:
+        return
+
+    statements = {
+        "postgresql": TASK_ROLLUP_POSTGRESQL_DDL,
+        "sqlite": TASK_ROLLUP_SQLITE_DDL,
+    }.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(DDL(statement))
+    connection.execute(
+        TaskRollupState.__table__.insert().values(id=1, overdue_as_of=func.now())
+    )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_search_index(target, connection, tables=(), **kw) -> None:
+    """Add the full-text search index when `create_all` creates `tasks`"""
+    if Task.__table__ not in tables:
+        return
+
+    statements = {
+        "postgresql": TASK_SEARCH_POSTGRESQL_DDL,
+        "sqlite": TASK_SEARCH_SQLITE_DDL,
+    }.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(DDL(statement))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_version_triggers(target, connection, tables=(), **kw) -> None:
+    """Install the version triggers when `create_all` creates `tasks`"""
+    if Task.__table__ not in tables:
+        return
+
+    statements = {
+        "postgresql": TASK_VERSION_POSTGRESQL_DDL,
+        "sqlite": TASK_VERSION_SQLITE_DDL,
+    }.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(DDL(statement))
+
+
+@event.listens_for(Base.metadata, "after_drop")
+def _drop_unmapped_objects(target, connection, **kw) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(DDL("DROP FUNCTION IF EXISTS task_rollups_apply()"))
+        connection.execute(DDL("DROP FUNCTION IF EXISTS tasks_next_version()"))
+        connection.execute(DDL("DROP SEQUENCE IF EXISTS task_version_seq"))
+    elif connection.dialect.name == "sqlite":
+        connection.execute(DDL("DROP TABLE IF EXISTS tasks_fts"))
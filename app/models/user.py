@@ -1,6 +1,11 @@
 from sqlalchemy import Column, Integer, String, Enum, Boolean
 from app.db.base_class import Base
-from app.utils.security import hash_password, verify_password
+from app.utils.security import (
+    hash_password,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
 import enum
 
 
@@ -44,3 +49,11 @@ class User(Base):
     def verify_password(self, plain_password: str) -> bool:
         """Verify a plain password against the stored hash."""
         return verify_password(plain_password, self.password)
+
+    async def set_password_async(self, password: str):
+        """Hash and set the password off the event loop."""
+        self.password = await hash_password_async(password)
+
+    async def verify_password_async(self, plain_password: str) -> bool:
+        """Verify a plain password against the stored hash off the event loop."""
+        return await verify_password_async(plain_password, self.password)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, status
+
+from app.core.dependencies import role_required
+from app.db.session import engine, pool_status, replica_engines
+from app.models.user import User
+from app.services.escalation_service import sweep_overdue_tasks
+from app.services.task_rollup_service import reconcile_task_rollups
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/db/pool", status_code=status.HTTP_200_OK)
+async def get_pool_status(current_user: User = Depends(role_required(["Admin"]))):
+    """Report live connection pool checkouts, overflow and waits"""
+    return {
+        "primary": pool_status(engine),
+        "replicas": [pool_status(replica) for replica in replica_engines],
+    }
+
+
+@router.post("/escalations/sweep", status_code=status.HTTP_200_OK)
+async def run_escalation_sweep(current_user: User = Depends(role_required(["Admin"]))):
+    """Escalate every overdue task now instead of waiting for the next sweep"""
+    return await sweep_overdue_tasks()
+
+
+@router.post("/rollups/reconcile", status_code=status.HTTP_200_OK)
+async def run_rollup_reconciliation(
+    current_user: User = Depends(role_required(["Admin"])),
+):
+    """Recount the task rollups from the tasks and report the rows that drifted"""
+    return await reconcile_task_rollups()
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.schemas.auth import (
     UserCreate,
@@ -13,7 +13,7 @@ from app.schemas.auth import (
     EmployeeResponse,
     UserCreateByAdmin,
 )
-from app.core.dependencies import get_current_user, role_required
+from app.core.dependencies import get_current_user, role_required, user_cache
 from app.services.auth_service import (
     create_new_user_by_email,
     authenticate_user,
@@ -21,6 +21,7 @@ from app.services.auth_service import (
     get_all_users,
     create_new_user_by_admin,
 )
+from app.utils.serialization import orjson_response
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -34,8 +35,14 @@ async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/signin", response_model=TokenResponse)
-async def signin(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
-    return await authenticate_user(user_data=user_data, db=db)
+async def signin(
+    user_data: UserLogin,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
+    return await authenticate_user(
+        user_data=user_data, db=db, background_tasks=background_tasks
+    )
 
 
 refresh_scheme = HTTPBearer(auto_error=False)
@@ -61,10 +68,10 @@ async def get_profile(current_user: User = Depends(get_current_user)):
 @router.get("/employees", response_model=list[EmployeeResponse])
 async def get_employees(
     current_user: User = Depends(role_required(["Admin", "Supervisor"])),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all employees or all users if Admin"""
-    return await get_all_users(db=db, current_user=current_user)
+    return orjson_response(await get_all_users(db=db, current_user=current_user))
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
@@ -77,12 +84,12 @@ async def get_user_by_id(
     query = select(User).where(User.id == user_id)
     result = await db.execute(query)
     user = result.scalars().first()
-    
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    
+
     return user
 
 
@@ -97,23 +104,25 @@ async def update_user(
     query = select(User).where(User.id == user_id)
     result = await db.execute(query)
     user = result.scalars().first()
-    
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    
+
     # Update user fields
     for key, value in user_data.items():
         if hasattr(user, key) and key != "id":
             if key == "password" and value:
-                user.set_password(value)
+                await user.set_password_async(value)
             else:
                 setattr(user, key, value)
-    
+
     await db.commit()
     await db.refresh(user)
-    
+    # Only this process's cache; other processes catch up within USER_CACHE_TTL
+    user_cache.invalidate(user_id)
+
     return user
 
 
@@ -127,18 +136,21 @@ async def delete_user(
     query = select(User).where(User.id == user_id)
     result = await db.execute(query)
     user = result.scalars().first()
-    
+
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    
+
     # Instead of hard delete, set is_active to False
     user.is_active = False
     await db.commit()
-    
+    # Only this process's cache; other processes catch up within USER_CACHE_TTL
+    user_cache.invalidate(user_id)
+
     return None
 
+
 @router.post("/users/create", response_model=UserResponse)
 async def create_user_by_admin(
     user_data: UserCreateByAdmin,
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.dependencies import CurrentUser, role_required
+from app.core.metrics import REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(current_user: CurrentUser = Depends(role_required(["Admin"]))):
+    """Expose the application metrics in the Prometheus text format"""
+    # Admin only: the metrics reveal the routes, the traffic and the backlog
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,79 +1,281 @@
-from fastapi import APIRouter, Depends, status, Body
+from fastapi import APIRouter, Depends, status, Body, Header, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Annotated
 
 from app.core.dependencies import role_required
-from app.db.session import get_db
-from app.schemas.task import TaskCreate, TaskGet, TaskUpdate, CreateTaskDependant, GetTaskDependant, TaskResponse
+from app.db.session import get_db, get_read_db, read_sessionmaker
+from app.schemas.task import (
+    TaskCreate,
+    TaskGet,
+    TaskUpdate,
+    TaskPatch,
+    CreateTaskDependant,
+    GetTaskDependant,
+    TaskResponse,
+    MultipleTaskResponse,
+    TaskListQuery,
+    TaskPage,
+    TaskFileFormat,
+    TaskImportReport,
+    TaskExportQuery,
+    TaskDependencyCreate,
+    TaskDependencyResponse,
+    TaskGraph,
+    TaskGraphDirection,
+    TaskSummary,
+    TaskSearchQuery,
+    TaskSearchPage,
+    TaskBulkStatusUpdate,
+    TaskBulkReassign,
+    TaskBulkDelete,
+    TaskBulkReport,
+)
 from app.services.task_service import (
     create_task_service,
     get_task_service,
     update_task_service,
+    patch_task_service,
     delete_task_service,
     create_dependant_task_service,
     get_assigned_tasks_service,
     get_all_tasks_service,
     get_task_dependants_service,
+    get_task_etag_service,
+    get_all_tasks_etag_service,
+    get_assigned_tasks_etag_service,
+    task_etag,
+)
+from app.services.task_dependency_service import (
+    add_task_dependency_service,
+    remove_task_dependency_service,
+    get_task_graph_service,
 )
+from app.services.task_bulk_service import (
+    bulk_update_status_service,
+    bulk_reassign_service,
+    bulk_delete_service,
+)
+from app.services.task_rollup_service import get_task_summary_service
+from app.services.task_search_service import search_tasks_service
+from app.services.task_import_service import import_tasks_service, resolve_import_format
+from app.services.task_export_service import EXPORT_MEDIA_TYPES, export_tasks_service
+from app.utils.etags import etag_matches, not_modified
+from app.utils.serialization import orjson_response
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-@router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=TaskResponse | MultipleTaskResponse,
+    status_code=status.HTTP_201_CREATED,
+)
 async def create_task(
     task_data: TaskCreate,
     db: AsyncSession = Depends(get_db),
     current_user: int = Depends(role_required(["Admin"])),
 ):
-    """Create a new task"""
+    """Create a new task, or one task per assignee when several are given"""
 
     return await create_task_service(
         task_data=task_data, current_user=current_user, db=db
     )
 
 
-@router.get("/assigned", response_model=list[TaskGet], status_code=status.HTTP_200_OK)
-async def get_assigned_tasks(
+@router.post("/import", response_model=TaskImportReport, status_code=status.HTTP_200_OK)
+async def import_tasks(
+    request: Request,
+    format: Annotated[TaskFileFormat | None, Query()] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(role_required(["Admin"])),
+):
+    """Bulk import tasks from a streamed CSV or NDJSON body"""
+    import_format = resolve_import_format(format, request.headers.get("content-type"))
+
+    return await import_tasks_service(
+        chunks=request.stream(),
+        import_format=import_format,
+        current_user=current_user,
+        db=db,
+    )
+
+
+@router.post(
+    "/bulk/status", response_model=TaskBulkReport, status_code=status.HTTP_200_OK
+)
+async def bulk_update_status(
+    data: TaskBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(role_required(["Admin"])),
+):
+    """Move tasks, by ID or filter, to a status; with `expected_status`, only from it"""
+
+    return await bulk_update_status_service(data=data, db=db)
+
+
+@router.post(
+    "/bulk/reassign", response_model=TaskBulkReport, status_code=status.HTTP_200_OK
+)
+async def bulk_reassign(
+    data: TaskBulkReassign,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(role_required(["Admin"])),
+):
+    """Assign tasks, by ID or filter, to another user"""
+
+    return await bulk_reassign_service(data=data, db=db)
+
+
+@router.post(
+    "/bulk/delete", response_model=TaskBulkReport, status_code=status.HTTP_200_OK
+)
+async def bulk_delete(
+    data: TaskBulkDelete,
     db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(role_required(["Admin"])),
+):
+    """Delete tasks by ID or filter"""
+
+    return await bulk_delete_service(data=data, db=db)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_tasks(
+    request: Request,
+    params: Annotated[TaskExportQuery, Query()],
+    current_user: int = Depends(role_required(["Admin", "Supervisor", "Compliance"])),
+):
+    """Stream all tasks matching the filters as NDJSON or CSV"""
+    return StreamingResponse(
+        export_tasks_service(params=params, sessionmaker=read_sessionmaker(request)),
+        media_type=EXPORT_MEDIA_TYPES[params.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{params.format.value}"'
+        },
+    )
+
+
+@router.get("/assigned", response_model=TaskPage, status_code=status.HTTP_200_OK)
+async def get_assigned_tasks(
+    params: Annotated[TaskListQuery, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: int = Depends(role_required(["Employee"])),
 ):
-    """Get all tasks assigned to the current user"""
-    return await get_assigned_tasks_service(current_user=current_user, db=db)
+    """Get a page of tasks assigned to the current user; 304 when unchanged"""
+    if if_none_match:
+        etag = await get_assigned_tasks_etag_service(
+            current_user=current_user, params=params, db=db
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    page = await get_assigned_tasks_service(
+        current_user=current_user, params=params, db=db
+    )
+    return orjson_response(page, headers={"ETag": page.pop("etag")})
+
+
+# Declared before /{task_id}, which would otherwise match "search" and "summary"
+@router.get("/search", response_model=TaskSearchPage, status_code=status.HTTP_200_OK)
+async def search_tasks(
+    params: Annotated[TaskSearchQuery, Query()],
+    db: AsyncSession = Depends(get_read_db),
+    current_user: int = Depends(
+        role_required(["Admin", "Supervisor", "Compliance", "Employee"])
+    ),
+):
+    """Search task titles and descriptions; employees only find their own tasks"""
+    return orjson_response(
+        await search_tasks_service(params=params, current_user=current_user, db=db)
+    )
+
+
+@router.get("/summary", response_model=TaskSummary, status_code=status.HTTP_200_OK)
+async def get_task_summary(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: int = Depends(role_required(["Admin", "Supervisor", "Compliance"])),
+):
+    """Get task counts per status and per assignee, with overdue tasks"""
+    return orjson_response(await get_task_summary_service(db=db))
 
 
-@router.get("/", response_model=list[TaskGet], status_code=status.HTTP_200_OK)
+@router.get("/", response_model=TaskPage, status_code=status.HTTP_200_OK)
 async def get_all_tasks(
-    db: AsyncSession = Depends(get_db),
+    params: Annotated[TaskListQuery, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: int = Depends(role_required(["Admin", "Supervisor", "Compliance"])),
 ):
-    """Get all tasks"""
-    return await get_all_tasks_service(current_user=current_user, db=db)
+    """Get a page of all tasks; 304 when unchanged"""
+    if if_none_match:
+        etag = await get_all_tasks_etag_service(
+            current_user=current_user, params=params, db=db
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    page = await get_all_tasks_service(current_user=current_user, params=params, db=db)
+    return orjson_response(page, headers={"ETag": page.pop("etag")})
 
 
 @router.get("/{task_id}", response_model=TaskUpdate, status_code=status.HTTP_200_OK)
 async def get_task(
     task_id: int,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
     db: AsyncSession = Depends(get_db),
     current_user: int = Depends(
         role_required(["Admin", "Supervisor", "Compliance", "Employee"])
     ),
 ):
-    """Get a task by ID"""
+    """Get a task by ID; 304 when unchanged"""
+    if if_none_match:
+        etag = await get_task_etag_service(
+            task_id=task_id, current_user=current_user, db=db
+        )
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag)
 
-    return await get_task_service(task_id=task_id, current_user=current_user, db=db)
+    task = await get_task_service(task_id=task_id, current_user=current_user, db=db)
+    response.headers["ETag"] = task_etag(task.version)
+    return task
 
 
 @router.put("/{task_id}", response_model=TaskGet, status_code=status.HTTP_200_OK)
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
     db: AsyncSession = Depends(get_db),
     current_user: int = Depends(role_required(["Admin"])),
 ):
-    """Update a task by ID"""
+    """Update a task by ID; with If-Match, only if it is still at that version"""
+    task = await update_task_service(
+        task_id=task_id, task_data=task_data, db=db, if_match=if_match
+    )
+    response.headers["ETag"] = task_etag(task["version"])
+    return task
 
-    return await update_task_service(task_id=task_id, task_data=task_data, db=db)
+
+@router.patch("/{task_id}", response_model=TaskGet, status_code=status.HTTP_200_OK)
+async def patch_task(
+    task_id: int,
+    task_data: TaskPatch,
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(role_required(["Admin", "Supervisor"])),
+):
+    """Change the given fields of a task; 409 if its version or status moved on"""
+    task = await patch_task_service(
+        task_id=task_id, task_data=task_data, db=db, if_match=if_match
+    )
+    response.headers["ETag"] = task_etag(task["version"])
+    return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -93,6 +295,64 @@ async def delete_task(
         )
 
 
+@router.post(
+    "/{task_id}/dependencies",
+    response_model=TaskDependencyResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_task_dependency(
+    task_id: int,
+    dependency: TaskDependencyCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(role_required(["Admin", "Supervisor"])),
+):
+    """Make a task wait on another task"""
+
+    return await add_task_dependency_service(
+        task_id=task_id,
+        blocking_task_id=dependency.blocking_task_id,
+        current_user=current_user,
+        db=db,
+    )
+
+
+@router.delete(
+    "/{task_id}/dependencies/{blocking_task_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def remove_task_dependency(
+    task_id: int,
+    blocking_task_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(role_required(["Admin", "Supervisor"])),
+):
+    """Stop a task from waiting on another task"""
+
+    await remove_task_dependency_service(
+        task_id=task_id, blocking_task_id=blocking_task_id, db=db
+    )
+
+
+@router.get(
+    "/{task_id}/graph", response_model=TaskGraph, status_code=status.HTTP_200_OK
+)
+async def get_task_graph(
+    task_id: int,
+    direction: TaskGraphDirection = TaskGraphDirection.DOWNSTREAM,
+    # Graphs are cached until a write touches them, so they must not be read
+    # from a replica that has not caught up with that write yet
+    db: AsyncSession = Depends(get_db),
+    # The graph spans tasks of every assignee, so employees cannot read it
+    current_user: int = Depends(role_required(["Admin", "Supervisor", "Compliance"])),
+):
+    """Get the tasks a task waits on, or that wait on it, with the critical path"""
+    await get_task_service(task_id=task_id, current_user=current_user, db=db)
+
+    return orjson_response(
+        await get_task_graph_service(task_id=task_id, direction=direction, db=db)
+    )
+
+
 @router.post(
     "/dependant/{task_id}",
     response_model=CreateTaskDependant,
@@ -111,7 +371,6 @@ async def create_task_dependant(
     )
 
 
-
 @router.get(
     "/dependants/{task_id}",
     response_model=list[GetTaskDependant],
@@ -119,15 +378,13 @@ async def create_task_dependant(
 )
 async def get_task_dependants(
     task_id: int,
-    current_user: Annotated[int, Depends(role_required(["Admin", "Supervisor", "Compliance", "Employee"]))],
+    current_user: Annotated[
+        int, Depends(role_required(["Admin", "Supervisor", "Compliance", "Employee"]))
+    ],
     db: Annotated[AsyncSession, Depends(get_db)],
-
 ):
     """Get all dependant tasks for a specific task"""
 
     return await get_task_dependants_service(
         task_id=task_id, current_user=current_user, db=db
     )
-
-
-
@@ -1,12 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional
 from datetime import datetime, timezone
 from pydantic import EmailStr
+import enum
 
 from app.models.task import TaskStatus
 
 
-
 class TaskCreate(BaseModel):
     """Schema for creating a new task"""
 
@@ -18,8 +18,10 @@ class TaskCreate(BaseModel):
     start_date: Optional[datetime] = datetime.now(timezone.utc)
     due_date: Optional[datetime] = None
 
+
 class TaskResponse(BaseModel):
     """Schema for task response"""
+
     id: int
     title: str
     description: Optional[str]
@@ -32,6 +34,13 @@ class TaskResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class MultipleTaskResponse(BaseModel):
+    """Schema for a task assigned to multiple users"""
+
+    task_ids: list[int]
+
+
 class MultipleUserTaskResponse(BaseModel):
     id: int
     name: str
@@ -46,7 +55,7 @@ class CreateTaskDependant(BaseModel):
 
     class Config:
         from_attributes = True
-        
+
 
 class GetTaskDependant(BaseModel):
     """Schema for getting a task dependant"""
@@ -73,6 +82,7 @@ class TaskGet(BaseModel):
     start_date: Optional[datetime] = datetime.now(timezone.utc)
     due_date: Optional[datetime] = None
     escalation_flagged: Optional[bool] = False
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -81,7 +91,7 @@ class TaskGet(BaseModel):
 class TaskUpdate(BaseModel):
     """Schema for updating a task"""
 
-    title: Optional[str] = None
+    title: str
     description: Optional[str] = None
     status: TaskStatus = TaskStatus.PENDING
     assigned_to_id: Optional[int] = None
@@ -92,3 +102,220 @@ class TaskUpdate(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskPatch(BaseModel):
+    """Schema for changing some fields of a task; fields left out are kept"""
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    assigned_to_id: Optional[int] = None
+    start_date: Optional[datetime] = None
+    due_date: Optional[datetime] = None
+    escalation_flagged: Optional[bool] = None
+    # Preconditions: the change only applies while the task still has them
+    version: Optional[int] = None
+    expected_status: Optional[TaskStatus] = None
+
+    @field_validator("title", "status")
+    def not_null(cls, v):
+        if v is None:
+            raise ValueError("Cannot be null")
+        return v
+
+
+class TaskOrderBy(str, enum.Enum):
+    ID = "id"
+    DUE_DATE = "due_date"
+
+
+class TaskFilter(BaseModel):
+    """Server-side filters for task listings"""
+
+    status: Optional[list[TaskStatus]] = None
+    assigned_to_id: Optional[int] = None
+    assigned_by_id: Optional[int] = None
+    due_from: Optional[datetime] = None
+    due_to: Optional[datetime] = None
+    escalation_flagged: Optional[bool] = None
+
+
+class TaskListQuery(TaskFilter):
+    """Query parameters for keyset-paginated task listings"""
+
+    cursor: Optional[str] = None
+    limit: Optional[int] = Field(default=None, ge=1)
+    order_by: TaskOrderBy = TaskOrderBy.ID
+
+
+class TaskPage(BaseModel):
+    """Schema for a page of tasks"""
+
+    items: list[TaskGet]
+    next_cursor: Optional[str] = None
+
+
+class TaskFileFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class TaskImportError(BaseModel):
+    """Schema for a rejected import row"""
+
+    row: int
+    detail: str
+
+
+class TaskImportReport(BaseModel):
+    """Schema for the outcome of a task import"""
+
+    rows_processed: int
+    imported: int
+    failed: int
+    errors: list[TaskImportError]
+    errors_truncated: bool = False
+
+
+class TaskExportQuery(TaskFilter):
+    """Query parameters for a task export"""
+
+    format: TaskFileFormat = TaskFileFormat.NDJSON
+
+
+class TaskBulkSelection(BaseModel):
+    """Tasks a bulk operation applies to: a list of IDs or a filter"""
+
+    task_ids: Optional[list[int]] = Field(default=None, min_length=1)
+    filter: Optional[TaskFilter] = None
+
+    @model_validator(mode="after")
+    def one_selector(self):
+        """Ensure exactly one of task_ids and filter is given"""
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError("Provide either task_ids or filter")
+        return self
+
+
+class TaskBulkStatusUpdate(TaskBulkSelection):
+    """Schema for moving tasks to a status, optionally only from another one"""
+
+    status: TaskStatus
+    expected_status: Optional[TaskStatus] = None
+
+
+class TaskBulkReassign(TaskBulkSelection):
+    """Schema for assigning tasks to another user"""
+
+    assigned_to_id: int
+
+
+class TaskBulkDelete(TaskBulkSelection):
+    """Schema for deleting tasks"""
+
+
+class TaskBulkOutcome(str, enum.Enum):
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+    CONFLICT = "conflict"
+
+
+class TaskBulkResult(BaseModel):
+    """Schema for what a bulk operation did to one task"""
+
+    task_id: int
+    outcome: TaskBulkOutcome
+
+
+class TaskBulkReport(BaseModel):
+    """Schema for the outcome of a bulk operation"""
+
+    affected: int
+    results: list[TaskBulkResult]
+
+
+class TaskDependencyCreate(BaseModel):
+    """Schema for making a task wait on another task"""
+
+    blocking_task_id: int
+
+
+class TaskDependencyResponse(BaseModel):
+    """Schema for a dependency edge"""
+
+    blocking_task_id: int
+    blocked_task_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class TaskGraphDirection(str, enum.Enum):
+    UPSTREAM = "upstream"
+    DOWNSTREAM = "downstream"
+
+
+class TaskGraphNode(BaseModel):
+    """Schema for a task in a dependency graph"""
+
+    id: int
+    title: str
+    status: TaskStatus
+    start_date: Optional[datetime] = None
+    due_date: Optional[datetime] = None
+    duration_days: float
+
+
+class TaskGraph(BaseModel):
+    """Schema for the dependency graph around a task"""
+
+    root_id: int
+    direction: TaskGraphDirection
+    nodes: list[TaskGraphNode]
+    edges: list[TaskDependencyResponse]
+    topological_order: list[int]
+    critical_path: list[int]
+    critical_path_days: float
+
+
+class AssigneeTaskSummary(BaseModel):
+    """Schema for the task counts of one assignee"""
+
+    assigned_to_id: Optional[int]
+    total: int
+    overdue: int
+    by_status: dict[TaskStatus, int]
+
+
+class TaskSummary(BaseModel):
+    """Schema for the dashboard task counts"""
+
+    as_of: datetime
+    total: int
+    overdue: int
+    by_status: dict[TaskStatus, int]
+    by_assignee: list[AssigneeTaskSummary]
+
+
+class TaskSearchQuery(BaseModel):
+    """Query parameters for full-text task search"""
+
+    q: str = Field(min_length=1, max_length=256)
+    limit: Optional[int] = Field(default=None, ge=1)
+    offset: int = Field(default=0, ge=0)
+
+
+class TaskSearchHit(TaskGet):
+    """Schema for a task matching a search, matches marked in escaped HTML"""
+
+    rank: float
+    title_highlight: str
+    description_snippet: Optional[str] = None
+
+
+class TaskSearchPage(BaseModel):
+    """Schema for a page of search results, best match first"""
+
+    items: list[TaskSearchHit]
@@ -1,12 +1,16 @@
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi import HTTPException, status
+from fastapi import BackgroundTasks, HTTPException, status
 from jose import JWTError
 from fastapi.security import HTTPAuthorizationCredentials
 
+from app.core.dependencies import user_cache
+from app.db.session import AsyncSessionLocal
 from app.models.user import User, UserRole
 from app.schemas.auth import UserCreate, UserLogin
 from app.utils.jwt import create_access_token, create_refresh_token, decode_token
+from app.utils.security import hash_password_async, password_needs_rehash
 from app.schemas.auth import TokenResponse
 
 
@@ -23,15 +27,17 @@ async def create_new_user_by_email(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    # Create new user
-    user_dict = user_data.model_dump(exclude={"confirm_password"})
+    # Create new user, hashing the password off the event loop
+    user_dict = user_data.model_dump(exclude={"confirm_password", "password"})
     user = User(**user_dict)
+    await user.set_password_async(user_data.password)
     db.add(user)
     await db.commit()
     await db.refresh(user)
 
     return user
 
+
 async def create_new_user_by_admin(user_data: UserCreate, db: AsyncSession):
     # Check if user with the same email already exists
     query = select(User).where(User.email == user_data.email)
@@ -43,9 +49,10 @@ async def create_new_user_by_admin(user_data: UserCreate, db: AsyncSession):
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    # Create new user
-    user_dict = user_data.model_dump(exclude={"confirm_password"})
+    # Create new user, hashing the password off the event loop
+    user_dict = user_data.model_dump(exclude={"confirm_password", "password"})
     user = User(**user_dict)
+    await user.set_password_async(user_data.password)
     db.add(user)
     await db.commit()
     await db.refresh(user)
@@ -54,7 +61,7 @@ async def create_new_user_by_admin(user_data: UserCreate, db: AsyncSession):
 
 
 async def authenticate_user(
-    user_data: UserLogin, db: AsyncSession
+    user_data: UserLogin, db: AsyncSession, background_tasks: BackgroundTasks
 ) -> TokenResponse | None:
     """Authenticate a user and return JWT tokens"""
     # Find user by email
@@ -69,12 +76,21 @@ async def authenticate_user(
 
     # Verify password
     try:
-        user.verify_password(user_data.password)
+        await user.verify_password_async(user_data.password)
     except HTTPException:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
         )
 
+    # Upgrade hashes made with an outdated cost once the response is sent
+    if password_needs_rehash(user.password):
+        background_tasks.add_task(
+            rehash_password,
+            user_id=user.id,
+            old_hash=user.password,
+            plain_password=user_data.password,
+        )
+
     # Create access token and refresh token
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
@@ -82,6 +98,22 @@ async def authenticate_user(
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
+async def rehash_password(user_id: int, old_hash: str, plain_password: str):
+    """Rewrite an outdated password hash with the configured bcrypt cost"""
+    new_hash = await hash_password_async(plain_password)
+
+    async with AsyncSessionLocal() as db:
+        # Skip the write if the password changed in the meantime
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.password == old_hash)
+            .values(password=new_hash)
+        )
+        await db.commit()
+
+    user_cache.invalidate(user_id)
+
+
 async def recreate_access_token(
     credentials: HTTPAuthorizationCredentials,
 ) -> dict | None:
@@ -110,19 +142,27 @@ async def recreate_access_token(
 async def get_all_users(
     db: AsyncSession,
     current_user: User = None,
-):
-    """Get all users"""
+) -> list[dict]:
+    """Get all users as plain dicts of the EmployeeResponse columns"""
+    columns = (
+        User.id,
+        User.name,
+        User.email,
+        User.phone_number,
+        User.role,
+        User.is_active,
+    )
     # If the current user is an Admin, return all users
     if current_user and current_user.role == UserRole.ADMIN.value:
-        query = select(User).where(User.is_active.is_(True))
+        query = select(*columns).where(User.is_active.is_(True))
     else:
         # For non-admin users, only return employees
-        query = select(User).where(
+        query = select(*columns).where(
             User.is_active.is_(True), User.role == UserRole.EMPLOYEE.value
         )
-    
+
     result = await db.execute(query)
-    users = result.scalars().all()
+    users = [row._asdict() for row in result]
 
     if not users:
         raise HTTPException(
@@ -0,0 +1,203 @@
+from datetime import datetime, timezone
+from time import perf_counter
+import asyncio
+import logging
+
+from sqlalchemy import insert, literal, literal_column, null, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY, Counter, Gauge, Histogram
+from app.db.session import AsyncSessionLocal
+from app.models.task import EscalationLog, Task, TaskStatus
+from app.services.task_dependency_service import task_graph_cache
+from app.utils.notifications import NotificationKind, notification_dispatcher
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+ESCALATION_REASON = "Past due date"
+
+TASKS_ESCALATED = REGISTRY.register(
+    Counter("tasks_escalated_total", "Overdue tasks escalated by the sweep")
+)
+ESCALATION_SWEEP_SECONDS = REGISTRY.register(
+    Histogram(
+        "escalation_sweep_duration_seconds",
+        "Duration of a complete escalation sweep",
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    )
+)
+ESCALATION_LAST_SWEEP = REGISTRY.register(
+    Gauge(
+        "escalation_last_sweep_timestamp_seconds",
+        "Unix time the last escalation sweep finished",
+    )
+)
+
+
+def overdue_tasks_query(now: datetime, limit: int):
+    """
+    Select the oldest overdue tasks that are neither completed nor escalated.
+
+    The status and flag are compared to literals rather than bound
+    parameters so the planner can match the predicate of the
+    `ix_tasks_unescalated_due_date` partial index.
+
+    Args:
+        now: Tasks due before this time are overdue.
+        limit: The most tasks to select.
+
+    Returns:
+        Select: The query for the task IDs.
+    """
+    return (
+        select(Task.id)
+        .where(
+            Task.due_date < now,
+            Task.escalation_flagged.isnot(True),
+            Task.status != literal_column(f"'{TaskStatus.COMPLETED.name}'"),
+            Task.status != literal_column(f"'{TaskStatus.ESCALATED.name}'"),
+        )
+        .order_by(Task.due_date)
+        .limit(limit)
+    )
+
+
+async def escalate_overdue_batch(
+    db: AsyncSession, now: datetime, batch_size: int
+) -> list[tuple[int, int | None, str]]:
+    """
+    Escalate one batch of overdue tasks and log them in `escalations`.
+
+    On PostgreSQL this is a single statement: an `UPDATE ... RETURNING` in a
+    CTE feeds an `INSERT ... SELECT` into `escalations`, and the batch rows
+    are locked with SKIP LOCKED so concurrent sweeps split the work. Other
+    databases run the `UPDATE ... RETURNING` and then the `INSERT ... SELECT`
+    in the same transaction.
+
+    Args:
+        db: The database session; committed by the caller.
+        now: The sweep time.
+        batch_size: The most tasks to escalate.
+
+    Returns:
+        list: The ID, assigner and title of every escalated task.
+    """
+    batch = overdue_tasks_query(now, batch_size)
+    if db.get_bind().dialect.name == "postgresql":
+        batch = batch.with_for_update(skip_locked=True)
+
+    escalate = (
+        update(Task)
+        .where(Task.id.in_(batch.scalar_subquery()))
+        .values(status=TaskStatus.ESCALATED, escalation_flagged=True)
+        .returning(Task.id, Task.assigned_by_id, Task.title)
+    )
+    # escalations.timestamp is a naive UTC column
+    logged_at = now.astimezone(timezone.utc).replace(tzinfo=None)
+    log_columns = ["task_id", "escalated_by_id", "timestamp", "reason"]
+
+    if db.get_bind().dialect.name == "postgresql":
+        escalated = escalate.cte("escalated")
+        logged = (
+            insert(EscalationLog)
+            .from_select(
+                log_columns,
+                select(
+                    escalated.c.id,
+                    null(),
+                    literal(logged_at, EscalationLog.timestamp.type),
+                    literal(ESCALATION_REASON),
+                ),
+            )
+            .cte("logged")
+        )
+        result = await db.execute(
+            select(
+                escalated.c.id, escalated.c.assigned_by_id, escalated.c.title
+            ).add_cte(logged)
+        )
+        return [tuple(row) for row in result]
+
+    rows = [tuple(row) for row in await db.execute(escalate)]
+    if rows:
+        await db.execute(
+            insert(EscalationLog).from_select(
+                log_columns,
+                select(
+                    Task.id,
+                    null(),
+                    literal(logged_at, EscalationLog.timestamp.type),
+                    literal(ESCALATION_REASON),
+                ).where(Task.id.in_([task_id for task_id, _, _ in rows])),
+            )
+        )
+    return rows
+
+
+async def sweep_overdue_tasks(
+    sessionmaker: async_sessionmaker = AsyncSessionLocal,
+    batch_size: int | None = None,
+) -> dict:
+    """
+    Escalate every overdue task, one committed batch at a time.
+
+    Each batch is its own short transaction, so a large backlog never holds
+    locks on more than `batch_size` rows at once.
+
+    Args:
+        sessionmaker: The session factory for the primary database.
+        batch_size: Tasks per batch, `ESCALATION_BATCH_SIZE` by default.
+
+    Returns:
+        dict: The number of escalated tasks, batches and the sweep duration.
+    """
+    batch_size = batch_size or settings.ESCALATION_BATCH_SIZE
+    now = datetime.now(timezone.utc)
+    started = perf_counter()
+    escalated = 0
+    batches = 0
+
+    while True:
+        async with sessionmaker() as db:
+            rows = await escalate_overdue_batch(db, now, batch_size)
+            await db.commit()
+
+        batches += 1
+        escalated += len(rows)
+        task_graph_cache.touch(*(task_id for task_id, _, _ in rows))
+        TASKS_ESCALATED.inc(amount=len(rows))
+        for task_id, assigned_by_id, title in rows:
+            notification_dispatcher.notify(
+                assigned_by_id,
+                NotificationKind.ESCALATION,
+                f"Task #{task_id} '{title}' is overdue and was escalated",
+                task_id=task_id,
+            )
+
+        if len(rows) < batch_size:
+            break
+        # Let requests run between batches
+        await asyncio.sleep(0)
+
+    seconds = perf_counter() - started
+    ESCALATION_SWEEP_SECONDS.observe(seconds)
+    ESCALATION_LAST_SWEEP.set(value=datetime.now(timezone.utc).timestamp())
+    if escalated:
+        logger.info("Escalated %d overdue tasks in %.3fs", escalated, seconds)
+
+    return {"escalated": escalated, "batches": batches, "seconds": round(seconds, 6)}
+
+
+async def run_escalation_sweeps(interval: float) -> None:
+    """Sweep every `interval` seconds until cancelled"""
+    while True:
+        try:
+            await sweep_overdue_tasks()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Escalation sweep failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,228 @@
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+
+from app.core.config import get_settings
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import (
+    TaskBulkDelete,
+    TaskBulkOutcome,
+    TaskBulkReassign,
+    TaskBulkSelection,
+    TaskBulkStatusUpdate,
+)
+from app.services.task_dependency_service import task_graph_cache
+from app.services.task_service import apply_task_filters, detach_task_references
+from app.utils.notifications import NotificationKind, notification_dispatcher
+from app.utils.reminders import reminder_scheduler
+
+settings = get_settings()
+
+
+def _too_many() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"A bulk operation is limited to {settings.TASK_BULK_MAX} tasks",
+    )
+
+
+def _requested_ids(selection: TaskBulkSelection) -> list[int] | None:
+    """The distinct requested IDs in request order, None for a filter"""
+    if selection.task_ids is None:
+        return None
+    task_ids = list(dict.fromkeys(selection.task_ids))
+    if len(task_ids) > settings.TASK_BULK_MAX:
+        raise _too_many()
+    return task_ids
+
+
+def _filtered_ids(selection: TaskBulkSelection):
+    """IDs matching the filter, one more than allowed to detect oversized selections"""
+    return (
+        apply_task_filters(select(Task.id), selection.filter)
+        .order_by(Task.id)
+        .limit(settings.TASK_BULK_MAX + 1)
+    )
+
+
+def _select_tasks(statement, selection: TaskBulkSelection, task_ids: list[int] | None):
+    """
+    Restrict an UPDATE to the selected tasks.
+
+    A filter is applied to the statement itself as well as to the capped ID
+    subquery, so on PostgreSQL rows changed by a concurrent write are checked
+    against it again before they are updated.
+    """
+    if task_ids is not None:
+        return statement.where(Task.id.in_(task_ids))
+    return apply_task_filters(statement, selection.filter).where(
+        Task.id.in_(_filtered_ids(selection).scalar_subquery())
+    )
+
+
+async def _run(statement, db: AsyncSession) -> list:
+    """Run a bulk statement, rolling back when it matched too many tasks"""
+    result = await db.execute(statement.execution_options(synchronize_session=False))
+    rows = result.all()
+    if len(rows) > settings.TASK_BULK_MAX:
+        await db.rollback()
+        raise _too_many()
+    return rows
+
+
+async def _report(
+    task_ids: list[int] | None,
+    affected: list[int],
+    outcome: TaskBulkOutcome,
+    db: AsyncSession,
+    precondition: bool = False,
+) -> dict:
+    """
+    Describe the outcome for every requested task.
+
+    Requested tasks that were not affected do not exist, or, when the
+    operation had a precondition, no longer matched it. Telling the two
+    apart takes one more query, only for the tasks left over.
+    """
+    if task_ids is None:
+        results = [
+            {"task_id": task_id, "outcome": outcome} for task_id in sorted(affected)
+        ]
+        return {"affected": len(affected), "results": results}
+
+    done = set(affected)
+    missing = [task_id for task_id in task_ids if task_id not in done]
+    existing = set()
+    if missing and precondition:
+        existing = set(
+            (await db.scalars(select(Task.id).where(Task.id.in_(missing)))).all()
+        )
+
+    results = []
+    for task_id in task_ids:
+        if task_id in done:
+            task_outcome = outcome
+        elif task_id in existing:
+            task_outcome = TaskBulkOutcome.CONFLICT
+        else:
+            task_outcome = TaskBulkOutcome.NOT_FOUND
+        results.append({"task_id": task_id, "outcome": task_outcome})
+    return {"affected": len(affected), "results": results}
+
+
+async def bulk_update_status_service(
+    data: TaskBulkStatusUpdate,
+    db: AsyncSession,
+) -> dict:
+    """Move the selected tasks to a status in one UPDATE ... RETURNING"""
+    task_ids = _requested_ids(data)
+    statement = _select_tasks(update(Task).values(status=data.status), data, task_ids)
+    if data.expected_status is not None:
+        statement = statement.where(Task.status == data.expected_status)
+
+    rows = await _run(statement.returning(Task.id), db)
+    affected = [task_id for task_id, in rows]
+    report = await _report(
+        task_ids,
+        affected,
+        TaskBulkOutcome.UPDATED,
+        db,
+        precondition=data.expected_status is not None,
+    )
+    await db.commit()
+
+    task_graph_cache.touch(*affected)
+    # Reopened tasks need their reminders again
+    if affected:
+        reminder_scheduler.reload()
+    return report
+
+
+async def bulk_reassign_service(
+    data: TaskBulkReassign,
+    db: AsyncSession,
+) -> dict:
+    """Assign the selected tasks to a user in one UPDATE ... RETURNING"""
+    task_ids = _requested_ids(data)
+    if not await db.get(User, data.assigned_to_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found with the provided ID",
+        )
+
+    # Joined to itself to return the previous assignee
+    previous = aliased(Task)
+    statement = _select_tasks(
+        update(Task)
+        .where(previous.id == Task.id)
+        .values(assigned_to_id=data.assigned_to_id),
+        data,
+        task_ids,
+    ).returning(Task.id, Task.title, previous.assigned_to_id)
+
+    rows = await _run(statement, db)
+    report = await _report(
+        task_ids, [task_id for task_id, _, _ in rows], TaskBulkOutcome.UPDATED, db
+    )
+    await db.commit()
+
+    # Reminders carry the assignee
+    if rows:
+        reminder_scheduler.reload()
+    for task_id, title, previous_assignee_id in rows:
+        if previous_assignee_id != data.assigned_to_id:
+            notification_dispatcher.notify(
+                data.assigned_to_id,
+                NotificationKind.ASSIGNMENT,
+                f"Task #{task_id} '{title}' was assigned to you",
+                task_id=task_id,
+            )
+    return report
+
+
+async def bulk_delete_service(
+    data: TaskBulkDelete,
+    db: AsyncSession,
+) -> dict:
+    """
+    Delete the selected tasks in one DELETE ... RETURNING.
+
+    The selection is resolved to IDs first, locked on PostgreSQL, so the
+    dependency edges and the references from remarks, dependants and
+    escalations can be cleared in the same transaction. Edges are removed
+    with their tasks; the other rows are kept without their task.
+
+    Args:
+        data: The tasks to delete.
+        db: The database session.
+
+    Returns:
+        dict: The number of deleted tasks and the outcome per task.
+    """
+    task_ids = _requested_ids(data)
+    targets = task_ids
+    if targets is None:
+        query = _filtered_ids(data)
+        if db.get_bind().dialect.name == "postgresql":
+            query = query.with_for_update()
+        targets = (await db.scalars(query)).all()
+        if len(targets) > settings.TASK_BULK_MAX:
+            raise _too_many()
+
+    deleted = []
+    if targets:
+        await detach_task_references(targets, db)
+        rows = await _run(
+            delete(Task).where(Task.id.in_(targets)).returning(Task.id), db
+        )
+        deleted = [task_id for task_id, in rows]
+
+    report = await _report(task_ids, deleted, TaskBulkOutcome.DELETED, db)
+    await db.commit()
+
+    task_graph_cache.touch(*deleted)
+    return report
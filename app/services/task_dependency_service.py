@@ -0,0 +1,378 @@
+from datetime import datetime
+from itertools import count
+from typing import Iterable
+import heapq
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.models.task import Task, TaskDependency
+from app.schemas.task import TaskGraphDirection
+
+settings = get_settings()
+
+# Weight of a task without a start or due date on the critical path
+DEFAULT_DURATION_DAYS = 1.0
+
+# Transaction-level advisory lock serializing edge inserts on PostgreSQL, so
+# two concurrent inserts cannot close a cycle that neither of them sees
+DEPENDENCY_LOCK_KEY = 0x7461736B
+
+
+class TaskGraphCache:
+    """
+    Caches computed dependency graphs and drops them when any node changes.
+
+    Every write that can alter a graph (an edge added or removed, a task
+    updated, escalated or deleted) calls `touch` with the affected task IDs,
+    which stamps them with the current value of a logical clock. A graph is
+    stored together with the clock value read before its query ran, and a
+    cached graph is only returned while none of its nodes has a newer stamp.
+    A change therefore only invalidates the graphs that contain a touched
+    task, and every other graph stays cached.
+
+    The cache is per process; writes made by other workers become visible
+    once the entries expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_stamps: int = 100_000):
+        self.graphs = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.max_stamps = max_stamps
+        self._clock = count(1)
+        self._now = 0
+        self._cleared_at = 0
+        self._stamps: dict[int, int] = {}
+
+    def now(self) -> int:
+        """Clock value to store with a graph whose query starts now"""
+        return self._now
+
+    def touch(self, *task_ids: int | None) -> None:
+        """Invalidate every cached graph containing one of `task_ids`"""
+        self._now = next(self._clock)
+        if len(self._stamps) + len(task_ids) > self.max_stamps:
+            # Forgetting stamps would revive stale graphs, so drop them all
+            self._stamps.clear()
+            self.graphs.clear()
+            self._cleared_at = self._now
+        for task_id in task_ids:
+            if task_id is not None:
+                self._stamps[task_id] = self._now
+
+    def get(self, task_id: int, direction: TaskGraphDirection) -> dict | None:
+        entry = self.graphs.get((task_id, direction))
+        if entry is None:
+            return None
+
+        computed_at, graph = entry
+        stamps = self._stamps
+        if any(stamps.get(node["id"], 0) > computed_at for node in graph["nodes"]):
+            self.graphs.invalidate((task_id, direction))
+            return None
+        return graph
+
+    def set(
+        self, task_id: int, direction: TaskGraphDirection, computed_at: int, graph: dict
+    ) -> None:
+        # Queries that started before the stamps were dropped cannot be checked
+        if computed_at >= self._cleared_at:
+            self.graphs.set((task_id, direction), (computed_at, graph))
+
+    def stats(self) -> dict[str, float]:
+        return self.graphs.stats()
+
+
+task_graph_cache = TaskGraphCache(
+    maxsize=settings.TASK_GRAPH_CACHE_SIZE, ttl=settings.TASK_GRAPH_CACHE_TTL
+)
+
+
+def _reachable(task_id: int, direction: TaskGraphDirection):
+    """
+    Recursive CTE of the IDs of `task_id` and every task reachable from it.
+
+    Downstream follows edges from blocking to blocked tasks over the
+    `uq_task_dependencies_edge` index, upstream follows them back over
+    `ix_task_dependencies_blocked_task_id`. UNION drops IDs already reached,
+    so shared ancestors are visited once and the walk always terminates.
+
+    Args:
+        task_id: The starting task.
+        direction: Which way to follow the edges.
+
+    Returns:
+        CTE: A CTE with a single `id` column.
+    """
+    if direction == TaskGraphDirection.DOWNSTREAM:
+        source, target = TaskDependency.blocking_task_id, TaskDependency.blocked_task_id
+    else:
+        source, target = TaskDependency.blocked_task_id, TaskDependency.blocking_task_id
+
+    reachable = select(literal(task_id).label("id")).cte("reachable", recursive=True)
+    return reachable.union(select(target).join(reachable, source == reachable.c.id))
+
+
+def _utc_naive(value: datetime | None) -> datetime | None:
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
+
+
+def duration_days(start_date: datetime | None, due_date: datetime | None) -> float:
+    """Planned duration of a task in days, the default when it has no dates"""
+    if start_date is None or due_date is None:
+        return DEFAULT_DURATION_DAYS
+    days = (_utc_naive(due_date) - _utc_naive(start_date)).total_seconds() / 86400
+    return round(days, 4) if days > 0 else DEFAULT_DURATION_DAYS
+
+
+def topological_order(nodes: Iterable[int], edges: list[tuple[int, int]]) -> list[int]:
+    """
+    Order tasks so that every task comes after the tasks blocking it.
+
+    Kahn's algorithm with a min-heap, so ties are broken by ID and the order
+    is stable between calls.
+
+    Args:
+        nodes: The task IDs.
+        edges: `(blocking_task_id, blocked_task_id)` pairs between the nodes.
+
+    Returns:
+        list: The task IDs in topological order.
+    """
+    indegree = {node: 0 for node in nodes}
+    successors: dict[int, list[int]] = {node: [] for node in indegree}
+    for blocking, blocked in edges:
+        successors[blocking].append(blocked)
+        indegree[blocked] += 1
+
+    ready = [node for node, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        node = heapq.heappop(ready)
+        order.append(node)
+        for successor in successors[node]:
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                heapq.heappush(ready, successor)
+    return order
+
+
+def critical_path(
+    order: list[int], edges: list[tuple[int, int]], durations: dict[int, float]
+) -> tuple[list[int], float]:
+    """
+    Find the chain of dependent tasks with the longest total duration.
+
+    Args:
+        order: The task IDs in topological order.
+        edges: `(blocking_task_id, blocked_task_id)` pairs between the tasks.
+        durations: The duration in days of every task.
+
+    Returns:
+        tuple: The task IDs on the critical path and its length in days.
+    """
+    predecessors: dict[int, list[int]] = {node: [] for node in order}
+    for blocking, blocked in edges:
+        predecessors[blocked].append(blocking)
+
+    finish: dict[int, float] = {}
+    previous: dict[int, int | None] = {}
+    for node in order:
+        before = max(predecessors[node], key=finish.__getitem__, default=None)
+        finish[node] = durations[node] + (finish[before] if before is not None else 0.0)
+        previous[node] = before
+
+    if not finish:
+        return [], 0.0
+
+    node = max(order, key=finish.__getitem__)
+    length = finish[node]
+    path = []
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    path.reverse()
+    return path, round(length, 4)
+
+
+async def _lock_dependencies(db: AsyncSession) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(select(func.pg_advisory_xact_lock(DEPENDENCY_LOCK_KEY)))
+
+
+async def add_task_dependency_service(
+    task_id: int,
+    blocking_task_id: int,
+    current_user: int,
+    db: AsyncSession,
+) -> TaskDependency:
+    """Make a task wait on another task, rejecting edges that close a cycle"""
+    if task_id == blocking_task_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A task cannot depend on itself",
+        )
+
+    await _lock_dependencies(db)
+    found = await db.scalars(
+        select(Task.id).where(Task.id.in_([task_id, blocking_task_id]))
+    )
+    if len(found.all()) != 2:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    # The new edge closes a cycle if the blocking task already waits on this one
+    downstream = _reachable(task_id, TaskGraphDirection.DOWNSTREAM)
+    cycle = await db.scalar(
+        select(downstream.c.id).where(downstream.c.id == blocking_task_id).limit(1)
+    )
+    if cycle is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Task {blocking_task_id} already depends on task {task_id}",
+        )
+
+    dependency = TaskDependency(
+        blocking_task_id=blocking_task_id,
+        blocked_task_id=task_id,
+        created_by_id=current_user.id,
+    )
+    db.add(dependency)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Dependency already exists",
+        )
+
+    await db.refresh(dependency)
+    task_graph_cache.touch(task_id, blocking_task_id)
+    return dependency
+
+
+async def remove_task_dependency_service(
+    task_id: int,
+    blocking_task_id: int,
+    db: AsyncSession,
+) -> None:
+    """Remove the edge making a task wait on another task"""
+    result = await db.execute(
+        delete(TaskDependency).where(
+            TaskDependency.blocked_task_id == task_id,
+            TaskDependency.blocking_task_id == blocking_task_id,
+        )
+    )
+    if result.rowcount == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dependency not found",
+        )
+
+    await db.commit()
+    task_graph_cache.touch(task_id, blocking_task_id)
+
+
+async def load_task_graph(
+    task_id: int, direction: TaskGraphDirection, db: AsyncSession
+) -> dict:
+    """
+    Load the upstream or downstream graph of a task in one query.
+
+    The recursive CTE collects the reachable task IDs, which are joined to
+    their tasks and outer-joined to the edges leading away from the root, so
+    every node arrives with its outgoing edges in the same result.
+
+    Args:
+        task_id: The root task.
+        direction: `upstream` for the tasks it waits on, `downstream` for
+            the tasks waiting on it.
+        db: The database session.
+
+    Returns:
+        dict: The nodes, edges, topological order and critical path.
+    """
+    reachable = _reachable(task_id, direction)
+    if direction == TaskGraphDirection.DOWNSTREAM:
+        edge_join = TaskDependency.blocking_task_id == Task.id
+    else:
+        edge_join = TaskDependency.blocked_task_id == Task.id
+
+    result = await db.execute(
+        select(
+            Task.id,
+            Task.title,
+            Task.status,
+            Task.start_date,
+            Task.due_date,
+            TaskDependency.blocking_task_id,
+            TaskDependency.blocked_task_id,
+        )
+        .join(reachable, reachable.c.id == Task.id)
+        .outerjoin(TaskDependency, edge_join)
+    )
+
+    nodes: dict[int, dict] = {}
+    edges: list[tuple[int, int]] = []
+    for node_id, title, task_status, start_date, due_date, blocking, blocked in result:
+        if node_id not in nodes:
+            nodes[node_id] = {
+                "id": node_id,
+                "title": title,
+                "status": task_status,
+                "start_date": start_date,
+                "due_date": due_date,
+                "duration_days": duration_days(start_date, due_date),
+            }
+        if blocking is not None:
+            edges.append((blocking, blocked))
+
+    # Edges to tasks deleted without their edges, e.g. on SQLite
+    edges = [edge for edge in edges if edge[0] in nodes and edge[1] in nodes]
+    order = topological_order(sorted(nodes), edges)
+    path, length = critical_path(
+        order,
+        edges,
+        {node_id: node["duration_days"] for node_id, node in nodes.items()},
+    )
+
+    return {
+        "root_id": task_id,
+        "direction": direction,
+        "nodes": [nodes[node_id] for node_id in order],
+        "edges": [
+            {"blocking_task_id": blocking, "blocked_task_id": blocked}
+            for blocking, blocked in sorted(edges)
+        ],
+        "topological_order": order,
+        "critical_path": path,
+        "critical_path_days": length,
+    }
+
+
+async def get_task_graph_service(
+    task_id: int,
+    direction: TaskGraphDirection,
+    db: AsyncSession,
+) -> dict:
+    """
+    Get the dependency graph of a task, from the cache when unchanged.
+
+    `db` must be a primary session: `touch` runs right after the primary
+    commit, so a graph read from a lagging replica would be cached with a
+    newer clock value than the change it misses.
+    """
+    graph = task_graph_cache.get(task_id, direction)
+    if graph is None:
+        computed_at = task_graph_cache.now()
+        graph = await load_task_graph(task_id, direction, db)
+        task_graph_cache.set(task_id, direction, computed_at, graph)
+    return graph
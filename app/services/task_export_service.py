@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import AsyncIterator
+import csv
+import enum
+import io
+
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.task import Task
+from app.schemas.task import TaskExportQuery, TaskFileFormat
+from app.services.task_service import TASK_GET_COLUMNS, apply_task_filters
+from app.utils.serialization import ORJSON_OPTIONS
+
+settings = get_settings()
+
+EXPORT_COLUMNS = tuple(column.key for column in TASK_GET_COLUMNS)
+
+EXPORT_MEDIA_TYPES = {
+    TaskFileFormat.NDJSON: "application/x-ndjson",
+    TaskFileFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(rows) -> bytes:
+    return b"".join(
+        orjson.dumps(row._asdict(), option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        for row in rows
+    )
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def export_tasks_service(
+    params: TaskExportQuery, sessionmaker: async_sessionmaker = AsyncSessionLocal
+) -> AsyncIterator[bytes]:
+    """
+    Stream the tasks matching `params` as NDJSON or CSV.
+
+    Rows are read through a server-side cursor in partitions of
+    `TASK_EXPORT_BATCH_SIZE` and each partition is sent as soon as it is
+    encoded. The generator opens its own session from `sessionmaker`
+    because request-scoped sessions are closed before a streaming response
+    starts.
+    """
+    query = apply_task_filters(select(*TASK_GET_COLUMNS), params).order_by(Task.id)
+    encode = _encode_csv if params.format == TaskFileFormat.CSV else _encode_ndjson
+
+    if params.format == TaskFileFormat.CSV:
+        yield _encode_csv([EXPORT_COLUMNS])
+
+    async with sessionmaker() as db:
+        result = await db.stream(
+            query.execution_options(yield_per=settings.TASK_EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield encode(rows)
@@ -0,0 +1,362 @@
+from typing import AsyncIterator
+import csv
+import heapq
+
+import orjson
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskFileFormat
+from app.services.task_service import find_missing_user_ids
+from app.utils.reminders import reminder_scheduler
+
+settings = get_settings()
+
+_COPY_COLUMNS = (
+    "title",
+    "description",
+    "assigned_to_id",
+    "assigned_by_id",
+    "start_date",
+    "due_date",
+    "status",
+    "escalation_flagged",
+)
+
+try:
+    from asyncpg import PostgresError
+
+    _WRITE_ERRORS = (SQLAlchemyError, PostgresError)
+except ImportError:  # pragma: no cover
+    _WRITE_ERRORS = (SQLAlchemyError,)
+
+
+class _ImportReport:
+    """
+    Running totals of an import with a bounded error list.
+
+    Rows failing validation are reported as they arrive and rows referencing
+    missing users when their batch is written, so the errors are kept in a
+    max-heap on the row number: the list holds the earliest failed rows and
+    is returned in row order.
+    """
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.rows_processed = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.errors_truncated = False
+
+    def fail(self, row: int, detail: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            heapq.heappush(self.errors, (-row, detail))
+            return
+
+        self.errors_truncated = True
+        if self.errors and row < -self.errors[0][0]:
+            heapq.heapreplace(self.errors, (-row, detail))
+
+    def as_dict(self) -> dict:
+        return {
+            "rows_processed": self.rows_processed,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": [
+                {"row": -row, "detail": detail}
+                for row, detail in sorted(self.errors, reverse=True)
+            ],
+            "errors_truncated": self.errors_truncated,
+        }
+
+
+def resolve_import_format(
+    import_format: TaskFileFormat | None, content_type: str | None
+) -> TaskFileFormat:
+    """Pick the import format from the query parameter or the Content-Type"""
+    if import_format is not None:
+        return import_format
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return TaskFileFormat.CSV
+    if media_type in (
+        "application/x-ndjson",
+        "application/ndjson",
+        "application/jsonl",
+    ):
+        return TaskFileFormat.NDJSON
+
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson",
+    )
+
+
+def _decode_line(line: bytes | bytearray) -> str:
+    return line.decode("utf-8", errors="replace").removesuffix("\r")
+
+
+async def _iter_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[str | ValueError]:
+    """
+    Split a stream of UTF-8 chunks into lines without buffering the body.
+
+    Only the incoming chunk is searched for line breaks, so the work is
+    linear in the size of the body. A line longer than
+    `TASK_IMPORT_MAX_LINE_BYTES` is discarded up to its end and a ValueError
+    is yielded in its place.
+    """
+    max_bytes = settings.TASK_IMPORT_MAX_LINE_BYTES
+    pending = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        # A newline byte never occurs inside a multi-byte UTF-8 sequence
+        while (end := chunk.find(b"\n", start)) != -1:
+            if oversized or len(pending) + end - start > max_bytes:
+                yield ValueError(f"Line exceeds {max_bytes} bytes")
+            else:
+                pending += chunk[start:end]
+                yield _decode_line(pending)
+            pending.clear()
+            oversized = False
+            start = end + 1
+
+        if oversized or len(pending) + len(chunk) - start > max_bytes:
+            pending.clear()
+            oversized = True
+        else:
+            pending += chunk[start:]
+
+    if oversized:
+        yield ValueError(f"Line exceeds {max_bytes} bytes")
+    elif pending:
+        yield _decode_line(pending)
+
+
+async def _iter_csv_rows(
+    lines: AsyncIterator[str | ValueError],
+) -> AsyncIterator[tuple[int, dict]]:
+    """
+    Parse CSV records, joining quoted fields that span several lines.
+
+    A record still inside a quoted field after `TASK_IMPORT_MAX_RECORD_LINES`
+    lines fails as one row and parsing resumes on the next line.
+    """
+    max_lines = settings.TASK_IMPORT_MAX_RECORD_LINES
+    header = None
+    record = []
+    quoted = False
+    row_number = 0
+    async for line in lines:
+        if isinstance(line, ValueError):
+            # The rest of an open record is lost with the line
+            record = []
+            quoted = False
+            row_number += 1
+            yield row_number, line
+            continue
+
+        record.append(line)
+        # An odd number of quotes means a quoted field continues on the next line
+        quoted ^= line.count('"') % 2 == 1
+        if quoted:
+            if len(record) >= max_lines:
+                record = []
+                quoted = False
+                row_number += 1
+                yield row_number, ValueError(
+                    f"Quoted field not closed within {max_lines} lines"
+                )
+            continue
+
+        fields = next(csv.reader(["\n".join(record)]))
+        record = []
+        if header is None:
+            header = [field.strip() for field in fields]
+            continue
+        if not any(fields):
+            continue
+
+        row_number += 1
+        # Empty cells fall back to the TaskCreate defaults
+        row = {key: value for key, value in zip(header, fields) if value != ""}
+        if row.get("assigned_to_id"):
+            row["assigned_to_id"] = [
+                value.strip()
+                for value in row["assigned_to_id"].split(";")
+                if value.strip()
+            ]
+        yield row_number, row
+
+    if record:
+        yield row_number + 1, ValueError("Unterminated quoted field")
+
+
+async def _iter_ndjson_rows(
+    lines: AsyncIterator[str | ValueError],
+) -> AsyncIterator[tuple[int, dict]]:
+    """Parse one JSON object per line"""
+    row_number = 0
+    async for line in lines:
+        if isinstance(line, ValueError):
+            row_number += 1
+            yield row_number, line
+            continue
+        if not line.strip():
+            continue
+
+        row_number += 1
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            yield row_number, ValueError(f"Invalid JSON: {exc}")
+            continue
+
+        if not isinstance(row, dict):
+            yield row_number, ValueError("Each line must be a JSON object")
+            continue
+        if isinstance(row.get("assigned_to_id"), int):
+            row["assigned_to_id"] = [row["assigned_to_id"]]
+        yield row_number, row
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _write_tasks(rows: list[dict], db: AsyncSession):
+    """Write task rows with COPY on asyncpg and a multi-row INSERT elsewhere"""
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver == "asyncpg":
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Task.__tablename__,
+            records=[
+                tuple(
+                    row[column].name if column == "status" else row[column]
+                    for column in _COPY_COLUMNS
+                )
+                for row in rows
+            ],
+            columns=_COPY_COLUMNS,
+        )
+    else:
+        await db.execute(insert(Task), rows)
+    await db.commit()
+
+
+async def _flush_batch(
+    batch: list[tuple[int, TaskCreate]],
+    current_user: int,
+    report: _ImportReport,
+    db: AsyncSession,
+):
+    """Check the referenced users of a batch and write its valid rows"""
+    user_ids = set()
+    for _, task_data in batch:
+        user_ids.update(task_data.assigned_to_id)
+    missing_ids = set(await find_missing_user_ids(user_ids=list(user_ids), db=db))
+
+    rows = []
+    row_numbers = []
+    for row_number, task_data in batch:
+        referenced = set(task_data.assigned_to_id) & missing_ids
+        if referenced:
+            report.fail(row_number, f"Users not found: {sorted(referenced)}")
+            continue
+
+        values = task_data.model_dump(exclude={"assigned_to_id", "assigned_by_id"})
+        values["escalation_flagged"] = False
+        for assigned_to_id in dict.fromkeys(task_data.assigned_to_id):
+            rows.append(
+                {
+                    **values,
+                    "assigned_to_id": assigned_to_id,
+                    "assigned_by_id": current_user.id,
+                }
+            )
+        row_numbers.append(row_number)
+
+    if not rows:
+        return
+
+    try:
+        await _write_tasks(rows, db)
+    except _WRITE_ERRORS as exc:
+        await db.rollback()
+        for row_number in row_numbers:
+            report.fail(row_number, f"Batch write failed: {exc.__class__.__name__}")
+        return
+
+    report.imported += len(row_numbers)
+
+
+async def import_tasks_service(
+    chunks: AsyncIterator[bytes],
+    import_format: TaskFileFormat,
+    current_user: int,
+    db: AsyncSession,
+) -> dict:
+    """
+    Import tasks from a streamed CSV or NDJSON body.
+
+    Rows are validated against `TaskCreate` as they arrive and written in
+    batches of `TASK_IMPORT_BATCH_SIZE`, each in its own transaction, so
+    memory use does not grow with the size of the upload. A row with several
+    assignees creates one task per assignee; `imported` counts rows, not
+    tasks. Errors are returned in row order. As when creating a task, the
+    importing user is the assigner; an `assigned_by_id` column is ignored.
+    """
+    report = _ImportReport(max_errors=settings.TASK_IMPORT_MAX_ERRORS)
+    lines = _iter_lines(chunks)
+    rows = (
+        _iter_csv_rows(lines)
+        if import_format == TaskFileFormat.CSV
+        else _iter_ndjson_rows(lines)
+    )
+
+    batch = []
+    async for row_number, row in rows:
+        report.rows_processed += 1
+        if isinstance(row, Exception):
+            report.fail(row_number, str(row))
+            continue
+
+        try:
+            task_data = TaskCreate.model_validate(row)
+        except ValidationError as exc:
+            report.fail(row_number, _format_validation_error(exc))
+            continue
+
+        if not task_data.assigned_to_id:
+            report.fail(row_number, "assigned_to_id: At least one assignee is required")
+            continue
+
+        batch.append((row_number, task_data))
+        if len(batch) >= settings.TASK_IMPORT_BATCH_SIZE:
+            await _flush_batch(batch, current_user, report, db)
+            batch = []
+
+    if batch:
+        await _flush_batch(batch, current_user, report, db)
+
+    # COPY does not return the new ids, so reload the reminder horizon instead
+    if report.imported:
+        reminder_scheduler.reload()
+
+    return report.as_dict()
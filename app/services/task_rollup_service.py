@@ -0,0 +1,315 @@
+from datetime import datetime, timezone
+from time import monotonic, perf_counter
+import asyncio
+import logging
+
+from sqlalchemy import String, case, cast, func, literal, text, union_all, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.metrics import REGISTRY, Gauge
+from app.db.session import AsyncSessionLocal
+from app.models.task import Task, TaskRollup, TaskRollupState, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Rollup key of a task, computed the same way as in the triggers
+ASSIGNEE_KEY = func.coalesce(Task.assigned_to_id, 0)
+STATUS_KEY = func.coalesce(cast(Task.status, String), literal(TaskStatus.PENDING.name))
+IS_OPEN = Task.status.is_distinct_from(TaskStatus.COMPLETED)
+
+TASK_ROLLUP_DRIFT = REGISTRY.register(
+    Gauge(
+        "task_rollup_drift_rows",
+        "Rollup rows that differed from the tasks at the last reconciliation",
+    )
+)
+TASK_ROLLUP_OVERDUE_AS_OF = REGISTRY.register(
+    Gauge(
+        "task_rollup_overdue_as_of_timestamp_seconds",
+        "Unix time up to which overdue tasks are counted in the rollups",
+    )
+)
+
+
+def _utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; every stored datetime is UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _upsert(db: AsyncSession):
+    return (
+        postgresql_insert
+        if db.get_bind().dialect.name == "postgresql"
+        else sqlite_insert
+    )
+
+
+def _watermark():
+    return (
+        select(TaskRollupState.overdue_as_of)
+        .where(TaskRollupState.id == 1)
+        .scalar_subquery()
+    )
+
+
+async def get_task_summary_service(db: AsyncSession) -> dict:
+    """
+    Count tasks per status and per assignee, and overdue tasks per assignee.
+
+    The counts come from `task_rollups`. Open tasks that became overdue after
+    the rollup watermark are counted from `tasks` over the short due-date
+    range since the watermark, in the same statement so both parts read the
+    same snapshot.
+
+    Args:
+        db: The database session.
+
+    Returns:
+        dict: The totals, the counts per status and one entry per assignee.
+    """
+    now = datetime.now(timezone.utc)
+    newly_overdue = (
+        select(ASSIGNEE_KEY, STATUS_KEY, literal(0), func.count())
+        .where(Task.due_date > _watermark(), Task.due_date <= now, IS_OPEN)
+        .group_by(ASSIGNEE_KEY, STATUS_KEY)
+    )
+    result = await db.execute(
+        union_all(
+            select(
+                TaskRollup.assigned_to_id,
+                TaskRollup.status,
+                TaskRollup.task_count,
+                TaskRollup.overdue_count,
+            ),
+            newly_overdue,
+        )
+    )
+
+    by_status = {task_status.value: 0 for task_status in TaskStatus}
+    assignees: dict[int, dict] = {}
+    for assigned_to_id, status_name, task_count, overdue_count in result:
+        if not task_count and not overdue_count:
+            continue
+        task_status = TaskStatus[status_name].value
+        by_status[task_status] += task_count
+
+        assignee = assignees.get(assigned_to_id)
+        if assignee is None:
+            assignee = assignees[assigned_to_id] = {
+                "assigned_to_id": assigned_to_id or None,
+                "total": 0,
+                "overdue": 0,
+                "by_status": {},
+            }
+        assignee["total"] += task_count
+        assignee["overdue"] += overdue_count
+        assignee["by_status"][task_status] = (
+            assignee["by_status"].get(task_status, 0) + task_count
+        )
+
+    by_assignee = [assignees[key] for key in sorted(assignees)]
+    return {
+        "as_of": now,
+        "total": sum(by_status.values()),
+        "overdue": sum(assignee["overdue"] for assignee in by_assignee),
+        "by_status": by_status,
+        "by_assignee": by_assignee,
+    }
+
+
+async def advance_overdue_rollups(db: AsyncSession, now: datetime) -> int:
+    """
+    Move the overdue watermark to `now` and count the tasks it passes.
+
+    The state row is locked first, so task writes in flight finish before
+    the newly overdue tasks are counted, and later writes wait until the new
+    watermark is committed. Only tasks due between the old and the new
+    watermark are read.
+
+    Args:
+        db: The database session; committed by the caller.
+        now: The new watermark.
+
+    Returns:
+        int: The number of tasks that became overdue.
+    """
+    previous = await db.scalar(
+        select(TaskRollupState.overdue_as_of)
+        .where(TaskRollupState.id == 1)
+        .with_for_update()
+    )
+    if previous is None or _utc(previous) >= now:
+        return 0
+
+    # On SQLite this takes the write lock before the tasks are read
+    await db.execute(
+        update(TaskRollupState).where(TaskRollupState.id == 1).values(overdue_as_of=now)
+    )
+    result = await db.execute(
+        select(ASSIGNEE_KEY, STATUS_KEY, func.count())
+        .where(Task.due_date > previous, Task.due_date <= now, IS_OPEN)
+        .group_by(ASSIGNEE_KEY, STATUS_KEY)
+        .order_by(ASSIGNEE_KEY, STATUS_KEY)
+    )
+    rows = [
+        {
+            "assigned_to_id": assigned_to_id,
+            "status": status_name,
+            "task_count": 0,
+            "overdue_count": overdue,
+        }
+        for assigned_to_id, status_name, overdue in result
+    ]
+    if rows:
+        upsert = _upsert(db)(TaskRollup).values(rows)
+        await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["assigned_to_id", "status"],
+                set_={
+                    "overdue_count": TaskRollup.overdue_count
+                    + upsert.excluded.overdue_count
+                },
+            )
+        )
+
+    TASK_ROLLUP_OVERDUE_AS_OF.set(value=now.timestamp())
+    return sum(row["overdue_count"] for row in rows)
+
+
+async def reconcile_task_rollups(
+    sessionmaker: async_sessionmaker = AsyncSessionLocal,
+) -> dict:
+    """
+    Recount the rollups from `tasks` and repair the rows that drifted.
+
+    Task writes are blocked while the counts are compared, so the recount
+    and the rollups describe the same tasks. Drift means a write bypassed
+    the triggers, e.g. while they were not installed.
+
+    Args:
+        sessionmaker: The session factory for the primary database.
+
+    Returns:
+        dict: The number of rollup rows, the drifted rows and the duration.
+    """
+    started = perf_counter()
+    now = datetime.now(timezone.utc)
+    async with sessionmaker() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            # Conflicts with the triggers' writes, not with readers
+            await db.execute(
+                text("LOCK TABLE task_rollups IN SHARE ROW EXCLUSIVE MODE")
+            )
+
+        watermark = await db.scalar(
+            update(TaskRollupState)
+            .where(TaskRollupState.id == 1)
+            .values(reconciled_at=now)
+            .returning(TaskRollupState.overdue_as_of)
+        )
+        if watermark is None:
+            watermark = now
+            db.add(TaskRollupState(id=1, overdue_as_of=now, reconciled_at=now))
+            await db.flush()
+
+        result = await db.execute(
+            select(
+                ASSIGNEE_KEY,
+                STATUS_KEY,
+                func.count(),
+                func.sum(case((IS_OPEN & (Task.due_date <= watermark), 1), else_=0)),
+            ).group_by(ASSIGNEE_KEY, STATUS_KEY)
+        )
+        expected = {
+            (assigned_to_id, status_name): (task_count, overdue_count)
+            for assigned_to_id, status_name, task_count, overdue_count in result
+        }
+        result = await db.execute(
+            select(
+                TaskRollup.assigned_to_id,
+                TaskRollup.status,
+                TaskRollup.task_count,
+                TaskRollup.overdue_count,
+            )
+        )
+        actual = {
+            (assigned_to_id, status_name): (task_count, overdue_count)
+            for assigned_to_id, status_name, task_count, overdue_count in result
+        }
+
+        drifted = []
+        repaired = []
+        for key in sorted(expected.keys() | actual.keys()):
+            expected_counts = expected.get(key, (0, 0))
+            actual_counts = actual.get(key, (0, 0))
+            if expected_counts == actual_counts:
+                continue
+            drifted.append(
+                {
+                    "assigned_to_id": key[0] or None,
+                    "status": TaskStatus[key[1]].value,
+                    "expected": {
+                        "total": expected_counts[0],
+                        "overdue": expected_counts[1],
+                    },
+                    "actual": {"total": actual_counts[0], "overdue": actual_counts[1]},
+                }
+            )
+            # Keys without tasks are zeroed rather than deleted, like the triggers do
+            repaired.append(
+                {
+                    "assigned_to_id": key[0],
+                    "status": key[1],
+                    "task_count": expected_counts[0],
+                    "overdue_count": expected_counts[1],
+                }
+            )
+
+        if repaired:
+            upsert = _upsert(db)(TaskRollup).values(repaired)
+            await db.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=["assigned_to_id", "status"],
+                    set_={
+                        "task_count": upsert.excluded.task_count,
+                        "overdue_count": upsert.excluded.overdue_count,
+                    },
+                )
+            )
+        await db.commit()
+
+    TASK_ROLLUP_DRIFT.set(value=len(drifted))
+    seconds = perf_counter() - started
+    if drifted:
+        logger.warning("Repaired %d drifted task rollup rows", len(drifted))
+
+    return {
+        "rows": len(expected),
+        "drifted": drifted,
+        "seconds": round(seconds, 6),
+    }
+
+
+async def run_rollup_maintenance(
+    overdue_interval: float,
+    reconcile_interval: float,
+    sessionmaker: async_sessionmaker = AsyncSessionLocal,
+) -> None:
+    """Advance the overdue watermark, and reconcile now and then, until cancelled"""
+    next_reconcile = monotonic() + reconcile_interval
+    while True:
+        try:
+            async with sessionmaker() as db:
+                await advance_overdue_rollups(db, datetime.now(timezone.utc))
+                await db.commit()
+            if reconcile_interval and monotonic() >= next_reconcile:
+                next_reconcile = monotonic() + reconcile_interval
+                await reconcile_task_rollups(sessionmaker)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Task rollup maintenance failed")
+        await asyncio.sleep(overdue_interval)
@@ -0,0 +1,189 @@
+import html
+import re
+
+from sqlalchemy import Integer, column, func, literal_column, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.db.ddl import TASK_SEARCH_CONFIG
+from app.models.task import Task
+from app.models.user import UserRole
+from app.schemas.task import TaskSearchQuery
+from app.services.task_service import TASK_GET_COLUMNS
+
+settings = get_settings()
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# Control characters the database marks matches with. The text around them is
+# HTML-escaped before they become HIGHLIGHT_START and HIGHLIGHT_END, so task
+# text cannot inject markup.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+SNIPPET_ELLIPSIS = "…"
+# Title matches weigh more than description matches
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_WORD = re.compile(r"\w+")
+
+tasks_fts = table("tasks_fts", column("rowid", Integer))
+search_vector = literal_column("tasks.search_vector")
+
+
+def fts5_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query matching every word.
+
+    Each word is quoted, so FTS5 operators and punctuation typed by the user
+    are searched for literally instead of being parsed.
+
+    Args:
+        text: The search text.
+
+    Returns:
+        str: The FTS5 query, empty when the text has no words.
+    """
+    return " ".join(f'"{word}"' for word in _WORD.findall(text))
+
+
+def _candidate_limit(current_user) -> int | None:
+    # An employee only searches their own tasks, which are few enough to rank
+    if current_user.role == UserRole.EMPLOYEE:
+        return None
+    return settings.TASK_SEARCH_MAX_CANDIDATES or None
+
+
+def _scope(query, current_user, assigned_to_id):
+    if current_user.role == UserRole.EMPLOYEE:
+        query = query.where(assigned_to_id == current_user.id)
+    return query
+
+
+def build_sqlite_search(text: str, current_user, limit: int, offset: int):
+    """Rank the FTS5 matches with bm25 and mark them with highlight/snippet"""
+    fts = literal_column("tasks_fts")
+    rank = func.bm25(fts, TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+    query = (
+        select(
+            *TASK_GET_COLUMNS,
+            (-rank).label("rank"),
+            func.highlight(fts, 0, MATCH_START, MATCH_END).label("title_highlight"),
+            func.snippet(fts, 1, MATCH_START, MATCH_END, SNIPPET_ELLIPSIS, 16).label(
+                "description_snippet"
+            ),
+        )
+        .select_from(tasks_fts)
+        .join(Task, Task.id == tasks_fts.c.rowid)
+        .where(fts.op("MATCH")(text))
+    )
+    query = _scope(query, current_user, Task.assigned_to_id)
+
+    candidates = _candidate_limit(current_user)
+    if candidates:
+        # Only the newest matches are ranked: the rowid range of the last
+        # `candidates` matches is found by walking the match list backwards
+        oldest_candidate = (
+            select(tasks_fts.c.rowid)
+            .where(fts.op("MATCH")(text))
+            .order_by(tasks_fts.c.rowid.desc())
+            .limit(1)
+            .offset(candidates - 1)
+            .correlate(None)
+            .scalar_subquery()
+        )
+        query = query.where(tasks_fts.c.rowid >= func.coalesce(oldest_candidate, 0))
+
+    return query.order_by(rank, Task.id).limit(limit).offset(offset)
+
+
+def build_postgresql_search(text: str, current_user, limit: int, offset: int):
+    """Rank the tsvector matches with ts_rank_cd and mark them with ts_headline"""
+    config = literal_column(f"'{TASK_SEARCH_CONFIG}'::regconfig")
+    tsquery = func.websearch_to_tsquery(config, text)
+
+    matches = select(Task.id, search_vector.label("search_vector")).where(
+        search_vector.op("@@")(tsquery)
+    )
+    matches = _scope(matches, current_user, Task.assigned_to_id)
+    candidates = _candidate_limit(current_user)
+    if candidates:
+        matches = matches.order_by(Task.id.desc()).limit(candidates)
+    matches = matches.subquery("matches")
+
+    rank = func.ts_rank_cd(matches.c.search_vector, tsquery).label("rank")
+    page = (
+        select(matches.c.id, rank)
+        .order_by(rank.desc(), matches.c.id)
+        .limit(limit)
+        .offset(offset)
+        .subquery("page")
+    )
+
+    # ts_headline is costly, so it only runs on the rows of the page
+    marks = f'StartSel="{MATCH_START}", StopSel="{MATCH_END}"'
+    return (
+        select(
+            *TASK_GET_COLUMNS,
+            page.c.rank,
+            func.ts_headline(
+                config, Task.title, tsquery, f"{marks}, HighlightAll=true"
+            ).label("title_highlight"),
+            func.ts_headline(
+                config,
+                Task.description,
+                tsquery,
+                f"{marks}, MaxFragments=2, FragmentDelimiter={SNIPPET_ELLIPSIS}",
+            ).label("description_snippet"),
+        )
+        .join(page, page.c.id == Task.id)
+        .order_by(page.c.rank.desc(), Task.id)
+    )
+
+
+def mark_matches(text: str | None) -> str | None:
+    """
+    Turn text with database match markers into safe HTML.
+
+    Args:
+        text: A highlight or snippet with `MATCH_START`/`MATCH_END` markers.
+
+    Returns:
+        str | None: The HTML-escaped text with the matches in <mark> tags.
+    """
+    if text is None:
+        return None
+    return (
+        html.escape(text)
+        .replace(MATCH_START, HIGHLIGHT_START)
+        .replace(MATCH_END, HIGHLIGHT_END)
+    )
+
+
+async def search_tasks_service(
+    params: TaskSearchQuery,
+    current_user: int,
+    db: AsyncSession,
+) -> dict:
+    """Search task titles and descriptions, best match first, matches as HTML"""
+    limit = min(
+        params.limit or settings.TASK_PAGE_SIZE_DEFAULT, settings.TASK_PAGE_SIZE_MAX
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        query = build_postgresql_search(params.q, current_user, limit, params.offset)
+    else:
+        text = fts5_query(params.q)
+        if not text:
+            return {"items": []}
+        query = build_sqlite_search(text, current_user, limit, params.offset)
+
+    result = await db.execute(query)
+    items = []
+    for hit in result:
+        item = hit._asdict()
+        item["title_highlight"] = mark_matches(item["title_highlight"])
+        item["description_snippet"] = mark_matches(item["description_snippet"])
+        items.append(item)
+    return {"items": items}
@@ -1,49 +1,105 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.exceptions import HTTPException
 from fastapi import status
+from sqlalchemy import and_, delete, func, insert, literal, or_, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 from sqlalchemy.future import select
-
-from app.models.task import Task, DependantTask
+from datetime import datetime
+import base64
+import binascii
+import json
+
+from app.core.config import get_settings
+from app.models.task import (
+    DependantTask,
+    EscalationLog,
+    Task,
+    TaskDependency,
+    TaskRemark,
+    TaskStatus,
+)
 from app.models.user import UserRole, User
-from app.schemas.task import TaskCreate, TaskUpdate, CreateTaskDependant
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskPatch,
+    CreateTaskDependant,
+    TaskFilter,
+    TaskListQuery,
+    TaskOrderBy,
+)
+from app.services.task_dependency_service import task_graph_cache
+from app.utils.etags import make_etag
+from app.utils.notifications import NotificationKind, notification_dispatcher
+from app.utils.reminders import reminder_scheduler
+
+settings = get_settings()
+
+# Columns of TaskGet, selected as plain rows for list endpoints
+TASK_GET_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.assigned_to_id,
+    Task.assigned_by_id,
+    Task.start_date,
+    Task.due_date,
+    Task.escalation_flagged,
+    Task.version,
+)
+
+# SQLSTATE of a foreign key violation
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Rows keeping a reference to a task; they outlive it with the reference cleared
+TASK_REFERENCES = (
+    TaskRemark.task_id,
+    DependantTask.dependant_to_id,
+    EscalationLog.task_id,
+)
 
 
 async def create_task_service(
     task_data: TaskCreate,
     current_user: int,
     db: AsyncSession,
-) -> Task:
+) -> Task | dict:
     """Create a new task"""
     task = None
-    if len(task_data.assigned_to_id) > 1:
-        result = await db.execute(select(User).where(User.id.in_(task_data.assigned_to_id)))
-        assigned_users = result.scalars().all()
-        print(f"Assigned to users: {assigned_users}")
+    assignee_ids = list(dict.fromkeys(task_data.assigned_to_id or []))
+    if not assignee_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No users provided for task assignment",
+        )
 
-       
-        if not assigned_users:
+    if len(assignee_ids) > 1:
+        missing_ids = await find_missing_user_ids(user_ids=assignee_ids, db=db)
+        if missing_ids:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="No users found with the provided IDs",
+                detail={
+                    "message": "No users found with the provided IDs",
+                    "missing_ids": missing_ids,
+                },
             )
-        
+
         return await assigned_task_to_multiple_users(
-            current_user=current_user,
-            users=assigned_users,
-            task_date=task_data,
-            db=db
-            )
+            current_user=current_user, user_ids=assignee_ids, task_date=task_data, db=db
+        )
 
     else:
         assigned_to = None
-        assigned_to = await db.get(User, task_data.assigned_to_id[0])
+        assigned_to = await db.get(User, assignee_ids[0])
 
         if not assigned_to:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found with the provided ID",
             )
-        
+
         task = Task(
             **task_data.model_dump(exclude={"assigned_to_id", "assigned_by_id"}),
             assigned_to_id=assigned_to.id,
@@ -52,9 +108,24 @@ async def create_task_service(
         db.add(task)
         await db.commit()
         await db.refresh(task)
+        reminder_scheduler.task_changed(
+            task.id, task.assigned_to_id, task.due_date, task.status
+        )
+        notification_dispatcher.notify(
+            task.assigned_to_id,
+            NotificationKind.ASSIGNMENT,
+            f"Task #{task.id} '{task.title}' was assigned to you",
+            task_id=task.id,
+        )
 
     return task
-    
+
+
+async def find_missing_user_ids(user_ids: list[int], db: AsyncSession) -> list[int]:
+    """Return the ids in `user_ids` that have no matching user, in one query"""
+    result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+    found = set(result.scalars().all())
+    return [user_id for user_id in user_ids if user_id not in found]
 
 
 async def get_task_service(
@@ -83,62 +154,500 @@ async def get_task_service(
     return task
 
 
+def task_etag(version: int) -> str:
+    """Strong ETag of a task, which only changes with its version"""
+    return f'"{version}"'
+
+
+async def get_task_etag_service(
+    task_id: int,
+    current_user: int,
+    db: AsyncSession,
+) -> str | None:
+    """Get the ETag of a task the user may read, without loading the task"""
+    row = (
+        await db.execute(
+            select(Task.version, Task.assigned_to_id).where(Task.id == task_id)
+        )
+    ).first()
+    if row is None:
+        return None
+    if current_user.role == UserRole.EMPLOYEE and row.assigned_to_id != current_user.id:
+        return None
+    return task_etag(row.version)
+
+
+def _encode_cursor(task, order_by: TaskOrderBy) -> str:
+    """Encode the keyset position of a task as an opaque cursor"""
+    position = {"id": task.id}
+    if order_by == TaskOrderBy.DUE_DATE:
+        position["due_date"] = task.due_date.isoformat() if task.due_date else None
+
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, order_by: TaskOrderBy) -> dict:
+    """Decode a cursor produced by `_encode_cursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        position["id"] = int(position["id"])
+        if order_by == TaskOrderBy.DUE_DATE:
+            due_date = position["due_date"]
+            position["due_date"] = (
+                datetime.fromisoformat(due_date) if due_date is not None else None
+            )
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+    return position
+
+
+def apply_task_filters(query, filters: TaskFilter):
+    """Add the WHERE clauses described by `filters` to a task query"""
+    if filters.status:
+        query = query.where(Task.status.in_(filters.status))
+    if filters.assigned_to_id is not None:
+        query = query.where(Task.assigned_to_id == filters.assigned_to_id)
+    if filters.assigned_by_id is not None:
+        query = query.where(Task.assigned_by_id == filters.assigned_by_id)
+    if filters.due_from is not None:
+        query = query.where(Task.due_date >= filters.due_from)
+    if filters.due_to is not None:
+        query = query.where(Task.due_date < filters.due_to)
+    if filters.escalation_flagged is True:
+        query = query.where(Task.escalation_flagged.is_(True))
+    elif filters.escalation_flagged is False:
+        query = query.where(Task.escalation_flagged.isnot(True))
+
+    return query
+
+
+def build_task_list_query(params: TaskListQuery, limit: int, undated: bool = False):
+    """
+    Build the keyset-paginated task listing query.
+
+    Rows are ordered by `id`, or by `(due_date, id)` with undated tasks last.
+    The due-date ordering is split into a dated and an undated phase so that
+    both can walk an index instead of sorting the matching rows. The cursor
+    resumes strictly after the last row of the previous page, and one extra
+    row is fetched to tell whether another page exists. Only the `TaskGet`
+    columns are selected, as plain rows.
+    """
+    query = apply_task_filters(select(*TASK_GET_COLUMNS), params)
+    position = _decode_cursor(params.cursor, params.order_by) if params.cursor else None
+
+    if params.order_by == TaskOrderBy.ID:
+        if position:
+            query = query.where(Task.id > position["id"])
+        return query.order_by(Task.id.asc()).limit(limit + 1)
+
+    if undated:
+        query = query.where(Task.due_date.is_(None))
+        if position and position["due_date"] is None:
+            query = query.where(Task.id > position["id"])
+        return query.order_by(Task.id.asc()).limit(limit + 1)
+
+    query = query.where(Task.due_date.isnot(None))
+    if position:
+        query = query.where(
+            or_(
+                Task.due_date > position["due_date"],
+                and_(
+                    Task.due_date == position["due_date"],
+                    Task.id > position["id"],
+                ),
+            )
+        )
+    return query.order_by(Task.due_date.asc(), Task.id.asc()).limit(limit + 1)
+
+
+def _page_limit(params: TaskListQuery) -> int:
+    return min(
+        params.limit or settings.TASK_PAGE_SIZE_DEFAULT, settings.TASK_PAGE_SIZE_MAX
+    )
+
+
+def _in_undated_phase(params: TaskListQuery) -> bool:
+    if params.order_by == TaskOrderBy.DUE_DATE and params.cursor:
+        return _decode_cursor(params.cursor, params.order_by)["due_date"] is None
+    return False
+
+
+def _page_etag(
+    params: TaskListQuery, limit: int, count: int, max_version, sum_version
+) -> str:
+    return make_etag(
+        "tasks",
+        params.model_dump_json(),
+        limit,
+        count,
+        int(max_version or 0),
+        int(sum_version or 0),
+    )
+
+
+def _page_versions(params: TaskListQuery, limit: int, undated: bool):
+    return (
+        build_task_list_query(params, limit, undated=undated)
+        .with_only_columns(Task.id, Task.due_date, Task.version)
+        .subquery()
+    )
+
+
+def build_task_page_version_query(params: TaskListQuery, limit: int):
+    """
+    Build the query summarizing the versions of the rows a page would return.
+
+    It selects the same rows as `list_tasks`, including the extra row that
+    decides the next cursor, but only aggregates their versions. Versions
+    come from a counter shared by all tasks, so a row changing, entering or
+    leaving the page changes the count or the sum even when the maximum
+    stays the same. For the due-date ordering, both phases are combined in
+    one statement and cut to the rows `list_tasks` would keep.
+    """
+    if params.order_by == TaskOrderBy.ID or _in_undated_phase(params):
+        page = _page_versions(
+            params, limit, undated=params.order_by == TaskOrderBy.DUE_DATE
+        )
+    else:
+        phases = []
+        for phase, undated in enumerate((False, True)):
+            rows = _page_versions(params, limit, undated)
+            phases.append(
+                select(
+                    literal(phase).label("phase"),
+                    rows.c.due_date,
+                    rows.c.id,
+                    rows.c.version,
+                )
+            )
+        combined = union_all(*phases).subquery()
+        page = (
+            select(combined.c.version)
+            .order_by(combined.c.phase, combined.c.due_date, combined.c.id)
+            .limit(limit + 1)
+            .subquery()
+        )
+
+    return select(func.count(), func.max(page.c.version), func.sum(page.c.version))
+
+
+async def get_task_page_etag(params: TaskListQuery, db: AsyncSession) -> str:
+    """Get the ETag `list_tasks` would return for `params` with one aggregate query"""
+    limit = _page_limit(params)
+    result = await db.execute(build_task_page_version_query(params, limit))
+    count, max_version, sum_version = result.one()
+    return _page_etag(params, limit, count, max_version, sum_version)
+
+
+async def list_tasks(params: TaskListQuery, db: AsyncSession) -> dict:
+    """Fetch one page of tasks matching `params` as plain dicts, with its ETag"""
+    limit = _page_limit(params)
+
+    tasks = []
+    if not _in_undated_phase(params):
+        result = await db.execute(build_task_list_query(params, limit))
+        tasks = result.all()
+
+    # Dated tasks are exhausted: fill the rest of the page with undated ones
+    if params.order_by == TaskOrderBy.DUE_DATE and len(tasks) <= limit:
+        result = await db.execute(
+            build_task_list_query(params, limit - len(tasks), undated=True)
+        )
+        tasks.extend(result.all())
+
+    versions = [task.version for task in tasks]
+    etag = _page_etag(
+        params, limit, len(versions), max(versions, default=None), sum(versions)
+    )
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = _encode_cursor(tasks[-1], params.order_by)
+
+    return {
+        "items": [task._asdict() for task in tasks],
+        "next_cursor": next_cursor,
+        "etag": etag,
+    }
+
+
 async def get_all_tasks_service(
     current_user: int,
+    params: TaskListQuery,
+    db: AsyncSession,
+) -> dict:
+    """Get a page of all tasks"""
+    return await list_tasks(params=params, db=db)
+
+
+async def get_all_tasks_etag_service(
+    current_user: int,
+    params: TaskListQuery,
     db: AsyncSession,
-) -> list[Task]:
-    """Get all tasks"""
+) -> str:
+    """Get the ETag of a page of all tasks"""
+    return await get_task_page_etag(params=params, db=db)
+
+
+def parse_task_etag(if_match: str | None) -> int | None:
+    """
+    Read the expected version from an If-Match header.
+
+    Args:
+        if_match: The header value, a task ETag or `*`.
+
+    Returns:
+        int | None: The version, or None when any version matches.
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be a single task ETag",
+        )
+
+
+def _next_version(db: AsyncSession) -> dict:
+    """
+    Version to set in statements that return it.
+
+    SQLite's version trigger runs after the write, too late for RETURNING,
+    so the statement takes the next version itself. PostgreSQL's trigger
+    sets it before the write.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return {}
+    versions = aliased(Task)
+    return {"version": select(func.max(versions.version) + 1).scalar_subquery()}
 
-    tasks = await db.execute(select(Task))
 
-    return tasks.scalars().all()
+def _is_foreign_key_violation(exc: IntegrityError) -> bool:
+    """Whether an IntegrityError comes from a foreign key, i.e. an unknown user"""
+    # asyncpg reports the SQLSTATE, SQLite only a message
+    if getattr(exc.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+        return True
+    return "FOREIGN KEY constraint failed" in str(exc.orig)
+
+
+async def apply_task_update(
+    task_id: int,
+    values: dict,
+    db: AsyncSession,
+    expected_version: int | None = None,
+    expected_status: TaskStatus | None = None,
+) -> dict:
+    """
+    Change a task in a single `UPDATE ... RETURNING`, if it still matches.
+
+    The expected version and status are part of the WHERE clause, so the
+    check and the write are one atomic compare-and-swap: of two concurrent
+    writers holding the same version, the second updates no row and gets a
+    409 instead of overwriting the first. The task is joined to itself to
+    return the assignee and escalation flag it had before the write.
+
+    Args:
+        task_id: The task to change.
+        values: The columns to set.
+        db: The database session.
+        expected_version: Only update the task at this version.
+        expected_status: Only update the task in this status.
+
+    Returns:
+        dict: The updated task as `TaskGet` fields.
+    """
+    previous = aliased(Task)
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, previous.id == Task.id)
+        .values(**values, **_next_version(db))
+        .returning(
+            *TASK_GET_COLUMNS,
+            previous.assigned_to_id.label("previous_assigned_to_id"),
+            previous.escalation_flagged.label("previously_escalated"),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        statement = statement.where(Task.version == expected_version)
+    if expected_status is not None:
+        statement = statement.where(Task.status == expected_status)
+
+    try:
+        row = (await db.execute(statement)).first()
+    except IntegrityError as exc:
+        await db.rollback()
+        if not _is_foreign_key_violation(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found with the provided ID",
+        )
+
+    if row is None:
+        # Only reached on failure: tell a missing task from a stale precondition
+        current = (
+            await db.execute(
+                select(Task.version, Task.status).where(Task.id == task_id)
+            )
+        ).first()
+        await db.rollback()
+        if current is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Task was changed by another request",
+                "version": current.version,
+                "status": current.status,
+            },
+        )
+    await db.commit()
+
+    task = row._asdict()
+    previous_assignee_id = task.pop("previous_assigned_to_id")
+    was_escalated = bool(task.pop("previously_escalated"))
+
+    task_graph_cache.touch(task_id)
+    reminder_scheduler.task_changed(
+        task_id, task["assigned_to_id"], task["due_date"], task["status"]
+    )
+    if task["assigned_to_id"] != previous_assignee_id:
+        notification_dispatcher.notify(
+            task["assigned_to_id"],
+            NotificationKind.ASSIGNMENT,
+            f"Task #{task_id} '{task['title']}' was assigned to you",
+            task_id=task_id,
+        )
+    if task["escalation_flagged"] and not was_escalated:
+        notification_dispatcher.notify(
+            task["assigned_by_id"],
+            NotificationKind.ESCALATION,
+            f"Task #{task_id} '{task['title']}' was escalated",
+            task_id=task_id,
+        )
+
+    return task
 
 
 async def update_task_service(
     task_id: int,
     task_data: TaskUpdate,
     db: AsyncSession,
-) -> Task | None:
-    """Update a task by ID"""
-    task = await db.get(Task, task_id)
-    if not task:
-        return HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+    if_match: str | None = None,
+) -> dict:
+    """Replace the fields of a task by ID"""
+    return await apply_task_update(
+        task_id,
+        task_data.model_dump(),
+        db,
+        expected_version=parse_task_etag(if_match),
+    )
+
+
+async def patch_task_service(
+    task_id: int,
+    task_data: TaskPatch,
+    db: AsyncSession,
+    if_match: str | None = None,
+) -> dict:
+    """Change only the given fields of a task, if it is still as expected"""
+    values = task_data.model_dump(
+        exclude_unset=True, exclude={"version", "expected_status"}
+    )
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields provided to update",
         )
 
-    for key, value in task_data.model_dump().items():
-        setattr(task, key, value)
+    expected_version = task_data.version
+    if expected_version is None:
+        expected_version = parse_task_etag(if_match)
 
-    await db.commit()
-    await db.refresh(task)
+    return await apply_task_update(
+        task_id,
+        values,
+        db,
+        expected_version=expected_version,
+        expected_status=task_data.expected_status,
+    )
 
-    return task
+
+async def detach_task_references(task_ids: list[int], db: AsyncSession):
+    """
+    Prepare tasks for deletion.
+
+    Their dependency edges are removed, since not every database enforces
+    their ON DELETE CASCADE. Remarks, dependants and escalations are kept,
+    with the task reference cleared, since their foreign keys have no ON
+    DELETE action.
+    """
+    await db.execute(
+        delete(TaskDependency).where(
+            or_(
+                TaskDependency.blocking_task_id.in_(task_ids),
+                TaskDependency.blocked_task_id.in_(task_ids),
+            )
+        )
+    )
+    for column in TASK_REFERENCES:
+        await db.execute(
+            update(column.class_)
+            .where(column.in_(task_ids))
+            .values({column.key: None})
+            .execution_options(synchronize_session=False)
+        )
 
 
 async def delete_task_service(
     task_id: int,
     db: AsyncSession,
-) -> Task | None:
+) -> int:
     """Delete a task by ID"""
-    task = await db.get(Task, task_id)
-    if not task:
-        return HTTPException(
+    await detach_task_references([task_id], db)
+    deleted = await db.scalar(delete(Task).where(Task.id == task_id).returning(Task.id))
+    if deleted is None:
+        await db.rollback()
+        raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
         )
 
-    await db.delete(task)
     await db.commit()
+    task_graph_cache.touch(task_id)
 
-    return task
+    return deleted
 
 
 async def get_assigned_tasks_service(
     current_user: int,
+    params: TaskListQuery,
     db: AsyncSession,
-) -> list[Task]:
-    """Get all tasks assigned to the current user"""
-    tasks = await db.execute(select(Task).where(Task.assigned_to_id == current_user.id))
-    return tasks.scalars().all()
+) -> dict:
+    """Get a page of tasks assigned to the current user"""
+    params = params.model_copy(update={"assigned_to_id": current_user.id})
+    return await list_tasks(params=params, db=db)
+
+
+async def get_assigned_tasks_etag_service(
+    current_user: int,
+    params: TaskListQuery,
+    db: AsyncSession,
+) -> str:
+    """Get the ETag of a page of tasks assigned to the current user"""
+    params = params.model_copy(update={"assigned_to_id": current_user.id})
+    return await get_task_page_etag(params=params, db=db)
 
 
 async def create_dependant_task_service(
@@ -157,6 +666,17 @@ async def create_dependant_task_service(
     await db.commit()
     await db.refresh(dependant_task)
 
+    # Let whoever assigned the parent task know it is blocked
+    assigned_by_id = await db.scalar(
+        select(Task.assigned_by_id).where(Task.id == task_id)
+    )
+    notification_dispatcher.notify(
+        assigned_by_id,
+        NotificationKind.DEPENDANT,
+        f"{current_user.name} raised dependant '{dependant_task.title}' on task #{task_id}",
+        task_id=task_id,
+    )
+
     return dependant_task
 
 
@@ -168,35 +688,44 @@ async def get_task_dependants_service(
     """Get all dependant tasks for a specific task"""
     # First check if the user has access to the parent task
     task = await get_task_service(task_id=task_id, current_user=current_user, db=db)
-    
+
     # If we get here, the user has access to the task
     result = await db.execute(
         select(DependantTask).where(DependantTask.dependant_to_id == task_id)
     )
-    
+
     return result.scalars().all()
 
 
-async def assigned_task_to_multiple_users(current_user: int, users: list[User], task_date: TaskCreate, db: AsyncSession):
-    """Assign a task to multiple users"""
-    if not users:
+async def assigned_task_to_multiple_users(
+    current_user: int, user_ids: list[int], task_date: TaskCreate, db: AsyncSession
+) -> dict:
+    """Assign a task to multiple users with one multi-row INSERT ... RETURNING"""
+    if not user_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No users provided for task assignment",
         )
 
-    for user in users:
-        task = Task(
-            **task_date.model_dump(exclude={"assigned_to_id", "assigned_by_id"}),
-            assigned_to_id=user.id, 
-            assigned_by_id=current_user.id,
-        )
-        db.add(task)
-    
+    values = task_date.model_dump(exclude={"assigned_to_id", "assigned_by_id"})
+    rows = [
+        {**values, "assigned_to_id": user_id, "assigned_by_id": current_user.id}
+        for user_id in user_ids
+    ]
+    result = await db.scalars(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+    )
+    task_ids = result.all()
     await db.commit()
-    await db.refresh(task)
-    print(f"Task assigned to multiple users: {task}")
-    return task
-
-    
+    for task_id, user_id in zip(task_ids, user_ids):
+        reminder_scheduler.task_changed(
+            task_id, user_id, task_date.due_date, task_date.status
+        )
+        notification_dispatcher.notify(
+            user_id,
+            NotificationKind.ASSIGNMENT,
+            f"Task #{task_id} '{task_date.title}' was assigned to you",
+            task_id=task_id,
+        )
 
+    return {"task_ids": task_ids}
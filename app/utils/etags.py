@@ -0,0 +1,47 @@
+from hashlib import blake2b
+
+from fastapi import Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a weak ETag from the values a response is derived from.
+
+    Args:
+        parts: Values that change whenever the response would change.
+
+    Returns:
+        str: The quoted weak ETag.
+    """
+    digest = blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+
+    If-None-Match uses the weak comparison, so the `W/` prefixes are ignored.
+
+    Args:
+        if_none_match: The header value, a list of ETags or `*`.
+        etag: The current ETag of the resource.
+
+    Returns:
+        bool: Whether the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """An empty 304 response carrying the current ETag"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -1,13 +1,24 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+import hashlib
+import time
 
 from jose import jwt, JWTError
 from fastapi import HTTPException, status
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 
 settings = get_settings()
 
+# Verified claims by token digest; each entry expires with its token's `exp`
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=max(
+        settings.AUTHJWT_ACCESS_TOKEN_EXPIRES, settings.AUTHJWT_REFRESH_TOKEN_EXPIRES
+    ),
+)
+
 
 def create_access_token(
     data: Dict[str, Any], expires_delta: Optional[timedelta] = None
@@ -73,6 +84,9 @@ def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode a JWT token.
 
+    The signature is verified once per token; the claims are then served from
+    `token_cache` until the token expires.
+
     Args:
         token: The token to decode.
 
@@ -82,14 +96,25 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         HTTPException: If the token is invalid or expired.
     """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(
             token, settings.AUTHJWT_SECRET_KEY, algorithms=[settings.AUTHJWT_ALGORITHM]
         )
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Tokens without an expiry are never cached
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, payload, ttl=exp - time.time())
+
+    return dict(payload)
@@ -0,0 +1,460 @@
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from time import monotonic, perf_counter
+from typing import NamedTuple, Protocol
+import asyncio
+import enum
+import logging
+import smtplib
+
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY, Counter, Gauge, Histogram
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+NOTIFICATIONS_ENQUEUED = REGISTRY.register(
+    Counter(
+        "notifications_enqueued_total",
+        "Notifications accepted by the dispatcher queue",
+        labelnames=("kind",),
+    )
+)
+NOTIFICATIONS_DROPPED = REGISTRY.register(
+    Counter(
+        "notifications_dropped_total",
+        "Notifications dropped because the dispatcher queue was full",
+        labelnames=("kind",),
+    )
+)
+NOTIFICATION_QUEUE_DEPTH = REGISTRY.register(
+    Gauge("notification_queue_depth", "Notifications waiting to be coalesced")
+)
+NOTIFICATION_DIGESTS = REGISTRY.register(
+    Counter(
+        "notification_digests_sent_total",
+        "Per-recipient digests delivered by each sink",
+        labelnames=("sink",),
+    )
+)
+NOTIFICATION_SINK_ERRORS = REGISTRY.register(
+    Counter(
+        "notification_sink_errors_total",
+        "Digest batches a sink failed to deliver",
+        labelnames=("sink",),
+    )
+)
+NOTIFICATION_DELIVERY_SECONDS = REGISTRY.register(
+    Histogram(
+        "notification_delivery_seconds",
+        "Time a sink took to deliver one batch of digests",
+        labelnames=("sink",),
+    )
+)
+
+
+class NotificationKind(str, enum.Enum):
+    ASSIGNMENT = "assignment"
+    ESCALATION = "escalation"
+    DEPENDANT = "dependant"
+    REMINDER = "reminder"
+
+
+class Notification(NamedTuple):
+    recipient_id: int
+    kind: NotificationKind
+    message: str
+    task_id: int | None = None
+
+
+class Digest(NamedTuple):
+    """Every notification a recipient received during one coalescing window"""
+
+    recipient_id: int
+    email: str | None
+    notifications: list[Notification]
+    # Notifications beyond NOTIFICATION_DIGEST_MAX_ITEMS, only counted
+    omitted: int
+
+    @property
+    def subject(self) -> str:
+        total = len(self.notifications) + self.omitted
+        if total == 1:
+            return f"Task {self.notifications[0].kind.value}"
+        return f"{total} task updates"
+
+    @property
+    def body(self) -> str:
+        lines = [f"- {notification.message}" for notification in self.notifications]
+        if self.omitted:
+            lines.append(f"- and {self.omitted} more")
+        return "\n".join(lines)
+
+
+class NotificationSink(Protocol):
+    name: str
+
+    async def send(self, digests: list[Digest]) -> None: ...
+
+
+class LogSink:
+    """Writes digests as JSON lines to a file, or to the application log"""
+
+    name = "log"
+
+    def __init__(self, path: str = ""):
+        self.path = path
+
+    def _write(self, lines: bytes) -> None:
+        with open(self.path, "ab") as output:
+            output.write(lines)
+
+    async def send(self, digests: list[Digest]) -> None:
+        if not self.path:
+            for digest in digests:
+                logger.info(
+                    "Notify user %s: %s\n%s",
+                    digest.recipient_id,
+                    digest.subject,
+                    digest.body,
+                )
+            return
+
+        sent_at = datetime.now(timezone.utc)
+        lines = b"".join(
+            orjson.dumps(
+                {
+                    "sent_at": sent_at,
+                    "recipient_id": digest.recipient_id,
+                    "email": digest.email,
+                    "subject": digest.subject,
+                    "notifications": [
+                        {
+                            "kind": item.kind,
+                            "task_id": item.task_id,
+                            "message": item.message,
+                        }
+                        for item in digest.notifications
+                    ],
+                    "omitted": digest.omitted,
+                },
+                option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE,
+            )
+            for digest in digests
+        )
+        await asyncio.to_thread(self._write, lines)
+
+
+class SMTPSink:
+    """Sends each digest as one email over a single SMTP connection per batch"""
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        username: str = "",
+        password: str = "",
+        starttls: bool = False,
+        timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _send(self, messages: list[EmailMessage]) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for message in messages:
+                smtp.send_message(message)
+
+    async def send(self, digests: list[Digest]) -> None:
+        messages = []
+        for digest in digests:
+            if not digest.email:
+                continue
+            message = EmailMessage()
+            message["From"] = self.sender
+            message["To"] = digest.email
+            message["Subject"] = digest.subject
+            message.set_content(digest.body)
+            messages.append(message)
+
+        if messages:
+            # smtplib blocks, so keep it off the event loop
+            await asyncio.to_thread(self._send, messages)
+
+
+class NotificationDispatcher:
+    """
+    Coalesces notifications per recipient and delivers them in batches.
+
+    `notify` only puts the notification on a bounded queue and never waits,
+    so it adds no latency to the request that raised it. When the queue is
+    full the notification is dropped and counted instead of blocking.
+
+    A collector task moves queued notifications into per-recipient buckets.
+    A bucket is flushed as one digest once its first notification is
+    `coalesce_seconds` old, so twenty assignments within a window become a
+    single message. Due digests are delivered to every sink in batches of
+    `batch_size`, with the recipients' emails looked up in one query per
+    batch. While a slow sink is delivering, new notifications keep
+    accumulating in the buckets, which makes the next digests larger rather
+    than adding more deliveries.
+
+    The buckets hold at most `max_buffered` notifications. At the limit the
+    collector stops taking from the queue until a flush makes room, so the
+    queue fills up and further notifications are dropped and counted, and
+    memory stays bounded however slow the sinks are.
+    """
+
+    def __init__(
+        self,
+        sinks: list[NotificationSink],
+        queue_size: int,
+        coalesce_seconds: float,
+        batch_size: int,
+        digest_max_items: int,
+        max_buffered: int,
+        sessionmaker: async_sessionmaker = AsyncSessionLocal,
+    ):
+        self.sinks = sinks
+        self.queue_size = queue_size
+        self.coalesce_seconds = coalesce_seconds
+        self.batch_size = batch_size
+        self.digest_max_items = digest_max_items
+        self.max_buffered = max_buffered
+        self.sessionmaker = sessionmaker
+        self._queue: asyncio.Queue | None = None
+        # recipient_id -> (first queued at, notifications, omitted count)
+        self._buckets: dict[int, tuple[float, list[Notification], int]] = {}
+        # Notifications held in the buckets, and an event set while below
+        # max_buffered
+        self._buffered = 0
+        self._has_room: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._stopping: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the collector and delivery tasks on the running event loop"""
+        if self.running or not self.sinks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self._tasks = [
+            asyncio.create_task(self._collect(), name="notification-collector"),
+            asyncio.create_task(self._deliver(), name="notification-delivery"),
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the tasks and deliver everything still pending.
+
+        The delivery task is asked to stop rather than cancelled, so a flush
+        in progress finishes sending the digests it already took from the
+        buckets.
+        """
+        if not self.running:
+            return
+        collector, delivery = self._tasks
+        collector.cancel()
+        self._stopping.set()
+        await asyncio.gather(collector, delivery, return_exceptions=True)
+        self._tasks = []
+
+        # Past the buffer limit the queue is drained in several rounds
+        while True:
+            self._drain_queue()
+            await self._flush(force=True)
+            if self._queue.empty():
+                break
+
+    def notify(
+        self,
+        recipient_id: int | None,
+        kind: NotificationKind,
+        message: str,
+        task_id: int | None = None,
+    ) -> bool:
+        """
+        Queue a notification without waiting.
+
+        Args:
+            recipient_id: The user to notify; nothing is queued when None.
+            kind: What happened.
+            message: One line describing the event.
+            task_id: The task concerned.
+
+        Returns:
+            bool: False if the dispatcher is stopped or its queue is full.
+        """
+        if recipient_id is None or self._queue is None or not self.running:
+            return False
+
+        try:
+            self._queue.put_nowait(Notification(recipient_id, kind, message, task_id))
+        except asyncio.QueueFull:
+            NOTIFICATIONS_DROPPED.inc(kind.value)
+            return False
+
+        NOTIFICATIONS_ENQUEUED.inc(kind.value)
+        NOTIFICATION_QUEUE_DEPTH.set(value=self._queue.qsize())
+        return True
+
+    def _add(self, notification: Notification) -> None:
+        bucket = self._buckets.get(notification.recipient_id)
+        if bucket is None:
+            self._buckets[notification.recipient_id] = (monotonic(), [notification], 0)
+            self._count_buffered(1)
+            return
+
+        queued_at, notifications, omitted = bucket
+        if len(notifications) < self.digest_max_items:
+            notifications.append(notification)
+            self._count_buffered(1)
+        else:
+            self._buckets[notification.recipient_id] = (
+                queued_at,
+                notifications,
+                omitted + 1,
+            )
+
+    def _count_buffered(self, amount: int) -> None:
+        self._buffered += amount
+        if self._buffered < self.max_buffered:
+            self._has_room.set()
+        else:
+            self._has_room.clear()
+
+    def _drain_queue(self) -> None:
+        if self._queue is None:
+            return
+        while not self._queue.empty() and self._has_room.is_set():
+            self._add(self._queue.get_nowait())
+        NOTIFICATION_QUEUE_DEPTH.set(value=self._queue.qsize())
+
+    async def _collect(self) -> None:
+        while True:
+            await self._has_room.wait()
+            self._add(await self._queue.get())
+            self._drain_queue()
+
+    async def _deliver(self) -> None:
+        # Check twice per window, so digests go out at most half a window late
+        interval = max(self.coalesce_seconds / 2, 0.05)
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+                return
+            except TimeoutError:
+                pass
+            try:
+                await self._flush()
+            except Exception:
+                logger.exception("Notification delivery failed")
+
+    async def _flush(self, force: bool = False) -> None:
+        """Deliver the digests whose coalescing window has closed"""
+        cutoff = monotonic() - self.coalesce_seconds
+        due = [
+            recipient_id
+            for recipient_id, (queued_at, _, _) in self._buckets.items()
+            if force or queued_at <= cutoff
+        ]
+
+        for start in range(0, len(due), self.batch_size):
+            recipient_ids = due[start : start + self.batch_size]
+            buckets = [
+                self._buckets.pop(recipient_id) for recipient_id in recipient_ids
+            ]
+            self._count_buffered(-sum(len(bucket[1]) for bucket in buckets))
+            emails = await self._lookup_emails(recipient_ids)
+            digests = [
+                Digest(recipient_id, emails.get(recipient_id), notifications, omitted)
+                for recipient_id, (_, notifications, omitted) in zip(
+                    recipient_ids, buckets
+                )
+            ]
+            for sink in self.sinks:
+                started = perf_counter()
+                try:
+                    await sink.send(digests)
+                except Exception:
+                    NOTIFICATION_SINK_ERRORS.inc(sink.name)
+                    logger.exception("Notification sink %s failed", sink.name)
+                    continue
+                finally:
+                    NOTIFICATION_DELIVERY_SECONDS.observe(
+                        perf_counter() - started, sink.name
+                    )
+                NOTIFICATION_DIGESTS.inc(sink.name, amount=len(digests))
+
+    async def _lookup_emails(self, recipient_ids: list[int]) -> dict[int, str]:
+        """Emails of a batch of recipients, in one query"""
+        async with self.sessionmaker() as db:
+            result = await db.execute(
+                select(User.id, User.email).where(User.id.in_(recipient_ids))
+            )
+            return dict(result.all())
+
+
+def build_sinks(names: str) -> list[NotificationSink]:
+    """
+    Build the sinks named in a comma-separated list from the settings.
+
+    Args:
+        names: Sink names, e.g. "log,smtp".
+
+    Returns:
+        list: The configured sinks.
+    """
+    sinks = []
+    for name in (part.strip().lower() for part in names.split(",")):
+        if name == "log":
+            sinks.append(LogSink(path=settings.NOTIFICATION_LOG_PATH))
+        elif name == "smtp":
+            sinks.append(
+                SMTPSink(
+                    host=settings.SMTP_HOST,
+                    port=settings.SMTP_PORT,
+                    sender=settings.SMTP_FROM,
+                    username=settings.SMTP_USERNAME,
+                    password=settings.SMTP_PASSWORD,
+                    starttls=settings.SMTP_STARTTLS,
+                    timeout=settings.SMTP_TIMEOUT,
+                )
+            )
+        elif name:
+            raise ValueError(f"Unknown notification sink: {name}")
+    return sinks
+
+
+notification_dispatcher = NotificationDispatcher(
+    sinks=build_sinks(settings.NOTIFICATION_SINKS),
+    queue_size=settings.NOTIFICATION_QUEUE_SIZE,
+    coalesce_seconds=settings.NOTIFICATION_COALESCE_SECONDS,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    digest_max_items=settings.NOTIFICATION_DIGEST_MAX_ITEMS,
+    max_buffered=settings.NOTIFICATION_MAX_BUFFERED,
+)
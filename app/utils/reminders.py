@@ -0,0 +1,296 @@
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+import asyncio
+import heapq
+import itertools
+import logging
+
+from sqlalchemy import DateTime, literal
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY, Counter
+from app.db.session import AsyncSessionLocal
+from app.models.task import Task, TaskReminder, TaskStatus
+from app.utils.notifications import NotificationKind, notification_dispatcher
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Pause after a failed iteration, e.g. while the database is unreachable
+RETRY_SECONDS = 5
+
+# notify(task_id, assigned_to_id, due_date, offset_minutes)
+ReminderCallback = Callable[[int, int | None, datetime, int], Awaitable[None]]
+
+REMINDERS_SENT = REGISTRY.register(
+    Counter(
+        "task_reminders_sent_total",
+        "Due-date reminders claimed and sent by this worker",
+        labelnames=("offset_minutes",),
+    )
+)
+REMINDERS_SKIPPED = REGISTRY.register(
+    Counter(
+        "task_reminders_skipped_total",
+        "Reminders not sent because another worker claimed them or the task changed",
+        labelnames=("offset_minutes",),
+    )
+)
+
+
+def _utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; every stored datetime is UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def parse_offsets(value: str) -> tuple[int, ...]:
+    """
+    Parse comma-separated reminder offsets.
+
+    Args:
+        value: Minutes before the due date, e.g. "1440,60".
+
+    Returns:
+        tuple: The distinct positive offsets, largest first.
+    """
+    offsets = {int(part) for part in value.split(",") if part.strip()}
+    return tuple(sorted((offset for offset in offsets if offset > 0), reverse=True))
+
+
+async def notify_reminder(
+    task_id: int, assigned_to_id: int | None, due_date: datetime, offset_minutes: int
+) -> None:
+    """Default reminder delivery, through the notification dispatcher"""
+    notification_dispatcher.notify(
+        assigned_to_id,
+        NotificationKind.REMINDER,
+        f"Task #{task_id} is due at {due_date:%Y-%m-%d %H:%M} UTC",
+        task_id=task_id,
+    )
+
+
+class ReminderScheduler:
+    """
+    Fires reminders at fixed offsets before each open task's due date.
+
+    Only reminders falling within the next `lookahead` seconds are kept in
+    memory, in a min-heap ordered by fire time. The horizon is extended every
+    half lookahead with one range query per offset over `ix_tasks_due_date_id`
+    that only covers the newly added slice, so the cost does not depend on
+    the total number of tasks. Tasks created or rescheduled inside the loaded
+    horizon are pushed by `task_changed`.
+
+    Several workers can run a scheduler against the same database. Each
+    reminder is claimed by inserting its `(task_id, due_date, offset)` row
+    into `task_reminders`; only the worker whose insert succeeds sends it.
+    The claim also re-checks the task's current due date and status, so
+    entries left in the heap for rescheduled, completed or deleted tasks are
+    dropped.
+    """
+
+    def __init__(
+        self,
+        offsets: tuple[int, ...],
+        lookahead: float,
+        catchup: float,
+        sessionmaker: async_sessionmaker = AsyncSessionLocal,
+        notify: ReminderCallback = notify_reminder,
+    ):
+        self.offsets = offsets
+        self.lookahead = timedelta(seconds=lookahead)
+        self.catchup = timedelta(seconds=catchup)
+        self.sessionmaker = sessionmaker
+        self.notify = notify
+        self._heap: list[tuple[datetime, int, int, int | None, datetime, int]] = []
+        self._sequence = itertools.count()
+        self._loaded_until: datetime | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the scheduler loop on the running event loop"""
+        if not self.running and self.offsets:
+            self._loaded_until = None
+            self._task = asyncio.create_task(self._run(), name="task-reminders")
+
+    async def stop(self) -> None:
+        """Stop the scheduler loop and forget the loaded reminders"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._heap.clear()
+
+    def task_changed(
+        self,
+        task_id: int,
+        assigned_to_id: int | None,
+        due_date: datetime | None,
+        status: TaskStatus | None = None,
+    ) -> None:
+        """
+        Schedule the reminders of a created or rescheduled task.
+
+        Reminders beyond the loaded horizon are left to the next refresh, and
+        outdated heap entries are dropped when their claim fails.
+
+        Args:
+            task_id: The task ID.
+            assigned_to_id: The assignee to remind.
+            due_date: The new due date.
+            status: The task status; completed tasks are not scheduled.
+        """
+        if (
+            not self.running
+            or self._loaded_until is None
+            or due_date is None
+            or status == TaskStatus.COMPLETED
+        ):
+            return
+
+        earliest = datetime.now(timezone.utc) - self.catchup
+        for offset in self.offsets:
+            fire_at = _utc(due_date) - timedelta(minutes=offset)
+            if earliest <= fire_at <= self._loaded_until:
+                self._push(fire_at, task_id, assigned_to_id, due_date, offset)
+        self._wakeup.set()
+
+    def reload(self) -> None:
+        """Reload the whole horizon, after writes that bypass `task_changed`"""
+        if self.running:
+            self._loaded_until = None
+            self._wakeup.set()
+
+    def _push(self, fire_at, task_id, assigned_to_id, due_date, offset) -> None:
+        heapq.heappush(
+            self._heap,
+            (fire_at, next(self._sequence), task_id, assigned_to_id, due_date, offset),
+        )
+
+    async def _load(self, db: AsyncSession, start: datetime, end: datetime) -> None:
+        """Push the reminders firing in (start, end]"""
+        for offset in self.offsets:
+            before = timedelta(minutes=offset)
+            result = await db.execute(
+                select(Task.id, Task.assigned_to_id, Task.due_date)
+                .where(
+                    Task.due_date > start + before,
+                    Task.due_date <= end + before,
+                    Task.status != TaskStatus.COMPLETED,
+                )
+                .order_by(Task.due_date, Task.id)
+            )
+            for task_id, assigned_to_id, due_date in result:
+                self._push(
+                    _utc(due_date) - before, task_id, assigned_to_id, due_date, offset
+                )
+
+    async def _refresh(self, now: datetime) -> None:
+        """Extend the loaded horizon to `now + lookahead`"""
+        start = self._loaded_until
+        if start is None:
+            self._heap.clear()
+            start = now - self.catchup
+        end = now + self.lookahead
+        async with self.sessionmaker() as db:
+            await self._load(db, start, end)
+        self._loaded_until = end
+
+    async def _claim(
+        self, db: AsyncSession, task_id: int, due_date: datetime, offset: int
+    ) -> bool:
+        """Record the reminder unless another worker did or the task changed"""
+        insert = (
+            postgresql_insert
+            if db.get_bind().dialect.name == "postgresql"
+            else sqlite_insert
+        )
+        claim = (
+            insert(TaskReminder)
+            .from_select(
+                ["task_id", "due_date", "offset_minutes", "sent_at"],
+                select(
+                    Task.id,
+                    Task.due_date,
+                    literal(offset),
+                    literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+                ).where(
+                    Task.id == task_id,
+                    Task.due_date == due_date,
+                    Task.status != TaskStatus.COMPLETED,
+                ),
+            )
+            .on_conflict_do_nothing(
+                index_elements=["task_id", "due_date", "offset_minutes"]
+            )
+        )
+        result = await db.execute(claim)
+        await db.commit()
+        return result.rowcount == 1
+
+    async def _fire_due(self, now: datetime) -> None:
+        """Claim and send every reminder whose time has come"""
+        if not self._heap or self._heap[0][0] > now:
+            return
+
+        async with self.sessionmaker() as db:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, task_id, assigned_to_id, due_date, offset = heapq.heappop(
+                    self._heap
+                )
+                if not await self._claim(db, task_id, due_date, offset):
+                    REMINDERS_SKIPPED.inc(str(offset))
+                    continue
+
+                REMINDERS_SENT.inc(str(offset))
+                try:
+                    await self.notify(task_id, assigned_to_id, _utc(due_date), offset)
+                except Exception:
+                    logger.exception("Sending the reminder for task %s failed", task_id)
+
+    async def _run(self) -> None:
+        refresh_every = self.lookahead / 2
+        next_refresh = datetime.now(timezone.utc)
+        while True:
+            try:
+                now = datetime.now(timezone.utc)
+                if self._loaded_until is None or now >= next_refresh:
+                    await self._refresh(now)
+                    next_refresh = now + refresh_every
+                await self._fire_due(now)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Reminder scheduler iteration failed")
+                await asyncio.sleep(RETRY_SECONDS)
+
+            now = datetime.now(timezone.utc)
+            wake_at = next_refresh
+            if self._heap:
+                wake_at = min(wake_at, self._heap[0][0])
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=max((wake_at - now).total_seconds(), 0.05),
+                )
+            except TimeoutError:
+                pass
+
+
+reminder_scheduler = ReminderScheduler(
+    offsets=parse_offsets(settings.REMINDER_OFFSETS_MINUTES),
+    lookahead=settings.REMINDER_LOOKAHEAD_SECONDS,
+    catchup=settings.REMINDER_CATCHUP_SECONDS,
+)
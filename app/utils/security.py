@@ -1,8 +1,54 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
-# Initialize the password context for hashing and verifying passwords
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY, Counter, Histogram
+
+settings = get_settings()
+
+# Initialize the password context for hashing and verifying passwords.
+# Hashes with any other cost than BCRYPT_ROUNDS are reported as outdated.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so a thread pool hashes in parallel without
+# blocking the event loop. The semaphore bounds the queue in front of it.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_CONCURRENCY, thread_name_prefix="password-hash"
+)
+_hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_CONCURRENCY)
+
+PASSWORD_HASH_SECONDS = REGISTRY.register(
+    Histogram(
+        "password_hash_duration_seconds",
+        "Time spent hashing or verifying a password in the hash pool",
+        labelnames=("operation",),
+        buckets=(0.025, 0.05, 0.1, 0.15, 0.2, 0.25, 0.35, 0.5, 0.75, 1.0, 2.5),
+    )
+)
+PASSWORD_HASH_WAIT_SECONDS = REGISTRY.register(
+    Histogram(
+        "password_hash_queue_wait_seconds",
+        "Time spent waiting for a free slot in the hash pool",
+        labelnames=("operation",),
+    )
+)
+PASSWORD_HASH_REJECTED = REGISTRY.register(
+    Counter(
+        "password_hash_rejected_total",
+        "Hash operations rejected because the queue timeout elapsed",
+        labelnames=("operation",),
+    )
+)
 
 
 def hash_password(password: str) -> str:
@@ -39,3 +85,85 @@ def verify_password(plain_password: str, hashed_password: str) -> str:
             headers={"WWW-Authenticate": "Bearer"},
         )
     return True
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a hash was made with another scheme or bcrypt cost.
+
+    Args:
+        hashed_password (str): The stored password hash.
+
+    Returns:
+        bool: True if the hash should be replaced.
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
+async def _run_in_hash_pool(operation: str, func, *args):
+    """
+    Run a bcrypt call in the hash pool with bounded concurrency.
+
+    Raises:
+        HTTPException: If no slot frees up within the queue timeout.
+    """
+    queued_at = perf_counter()
+    try:
+        await asyncio.wait_for(
+            _hash_slots.acquire(), timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT
+        )
+    except TimeoutError:
+        PASSWORD_HASH_REJECTED.inc(operation)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent sign-ins, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    started_at = perf_counter()
+    PASSWORD_HASH_WAIT_SECONDS.observe(started_at - queued_at, operation)
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_slots.release()
+        PASSWORD_HASH_SECONDS.observe(perf_counter() - started_at, operation)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password using bcrypt without blocking the event loop.
+
+    Args:
+        password (str): The password to hash.
+
+    Returns:
+        str: The hashed password.
+    """
+    return await _run_in_hash_pool("hash", pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain password against a hashed password without blocking the
+    event loop.
+
+    Args:
+        plain_password (str): The plain password to verify.
+        hashed_password (str): The hashed password to compare against.
+
+    Returns:
+        bool: True if the passwords match.
+
+    Raises:
+        HTTPException: If the passwords do not match.
+    """
+    if not await _run_in_hash_pool(
+        "verify", pwd_context.verify, plain_password, hashed_password
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return True
@@ -0,0 +1,28 @@
+import os
+import tempfile
+
+
+def configure_environment(database_url: str | None = None) -> str:
+    """
+    Point the application settings at a benchmark database.
+
+    Must run before any `app` module is imported, since the settings and the
+    engine are created at import time. Without an explicit URL a fresh SQLite
+    file in the temp directory is used.
+
+    Args:
+        database_url: The database URL to benchmark against.
+
+    Returns:
+        str: The database URL in use.
+    """
+    if database_url is None:
+        path = os.path.join(tempfile.gettempdir(), "task-management-benchmark.db")
+        if os.path.exists(path):
+            os.remove(path)
+        database_url = f"sqlite+aiosqlite:///{path}"
+
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("AUTHJWT_SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("DEBUG", "false")
+    return database_url
@@ -0,0 +1,74 @@
+"""
+Measure bcrypt hashes per second per core to choose BCRYPT_ROUNDS.
+
+    python -m benchmarks.bench_bcrypt --rounds 10 11 12 13 --logins-per-second 50
+"""
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from passlib.hash import bcrypt
+
+
+def hashes_per_second(rounds: int, workers: int, duration: float) -> float:
+    """Hash in `workers` threads for about `duration` seconds"""
+    handler = bcrypt.using(rounds=rounds)
+    handler.hash("warm-up")
+
+    def worker(deadline: float) -> int:
+        done = 0
+        while perf_counter() < deadline:
+            handler.hash("Benchmark-Passw0rd")
+            done += 1
+        return done
+
+    started = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        total = sum(pool.map(worker, [started + duration] * workers))
+    return total / (perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13, 14])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="threads hashing in parallel, normally PASSWORD_HASH_CONCURRENCY",
+    )
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument(
+        "--logins-per-second",
+        type=float,
+        help="login throughput budget used to recommend a cost",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'rounds':>6} {'ms/hash':>9} {'hashes/s/core':>14} {f'hashes/s x{args.workers}':>14}"
+    )
+    recommended = None
+    for rounds in sorted(args.rounds):
+        per_core = hashes_per_second(rounds, 1, args.duration)
+        parallel = hashes_per_second(rounds, args.workers, args.duration)
+        print(
+            f"{rounds:>6} {1000 / per_core:>9.1f} {per_core:>14.1f} {parallel:>14.1f}"
+        )
+        if args.logins_per_second and parallel >= args.logins_per_second:
+            recommended = rounds
+
+    if args.logins_per_second:
+        if recommended is None:
+            print(f"\nNo tested cost sustains {args.logins_per_second:g} logins/s.")
+        else:
+            print(
+                f"\nHighest cost sustaining {args.logins_per_second:g} logins/s "
+                f"with {args.workers} workers: BCRYPT_ROUNDS={recommended}"
+            )
+
+
+if __name__ == "__main__":
+    main()
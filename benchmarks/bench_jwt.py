@@ -0,0 +1,41 @@
+"""
+Microbenchmark of cached versus uncached access-token verification.
+
+    python -m benchmarks.bench_jwt --iterations 20000
+"""
+
+import argparse
+import timeit
+
+from benchmarks import configure_environment
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    configure_environment()
+    from app.utils.jwt import create_access_token, decode_token, token_cache
+
+    token = create_access_token(data={"sub": "42"})
+
+    maxsize = token_cache.maxsize
+    token_cache.maxsize = 0
+    token_cache.clear()
+    uncached = timeit.timeit(lambda: decode_token(token), number=args.iterations)
+
+    token_cache.maxsize = maxsize
+    decode_token(token)
+    cached = timeit.timeit(lambda: decode_token(token), number=args.iterations)
+
+    for label, seconds in (("uncached", uncached), ("cached", cached)):
+        print(
+            f"{label:>9}: {args.iterations / seconds:>12,.0f} tokens/s "
+            f"({seconds / args.iterations * 1e6:,.2f} us/token)"
+        )
+    print(f"  speedup: {uncached / cached:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
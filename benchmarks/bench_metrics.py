@@ -0,0 +1,95 @@
+"""
+Per-request overhead of the metrics middleware and database instrumentation.
+
+    python -m benchmarks.bench_metrics --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+from time import perf_counter
+
+from benchmarks import configure_environment
+
+
+async def run(requests: int, repeat: int) -> None:
+    import httpx
+
+    from app.core.instrumentation import MetricsMiddleware, instrument_engine
+    from app.db.session import engine
+    from app.main import app
+    from app.utils.jwt import create_access_token
+    from benchmarks.seed import seed_database
+
+    seeded = await seed_database(engine, users=100, tasks=5_000, dependants=0)
+    headers = {
+        "Authorization": "Bearer "
+        + create_access_token({"sub": str(seeded["admin_id"])})
+    }
+
+    async def noop(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def bare_app() -> float:
+        # Middleware cost alone, without routing or a database
+        middleware = MetricsMiddleware(noop)
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            pass
+
+        started = perf_counter()
+        for _ in range(requests):
+            await middleware(scope, receive, send)
+        return perf_counter() - started
+
+    async def list_tasks(asgi_app) -> float:
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            await client.get("/tasks/?limit=20", headers=headers)
+            started = perf_counter()
+            for _ in range(requests):
+                await client.get("/tasks/?limit=20", headers=headers)
+            return perf_counter() - started
+
+    baseline = min([await list_tasks(app) for _ in range(repeat)])
+    instrument_engine(engine)
+    instrumented_app = MetricsMiddleware(app)
+    instrumented = min([await list_tasks(instrumented_app) for _ in range(repeat)])
+    middleware_only = min([await bare_app() for _ in range(repeat)])
+
+    per_request = lambda seconds: seconds / requests * 1e6
+    print(f"{'case':>28} {'us/request':>11}")
+    print(f"{'middleware only':>28} {per_request(middleware_only):>11.1f}")
+    print(f"{'GET /tasks/ uninstrumented':>28} {per_request(baseline):>11.1f}")
+    print(f"{'GET /tasks/ instrumented':>28} {per_request(instrumented):>11.1f}")
+    print(
+        f"{'overhead':>28} "
+        f"{per_request(instrumented - baseline):>11.1f} "
+        f"({(instrumented / baseline - 1) * 100:+.1f}%)"
+    )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", help="empty database to seed")
+    args = parser.parse_args()
+
+    configure_environment(args.database_url)
+    # The app is wrapped by hand so both variants run in the same process
+    os.environ["METRICS_ENABLED"] = "false"
+    asyncio.run(run(args.requests, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Per-row cost of list serialization: ORM + pydantic versus Core rows + orjson.
+
+    python -m benchmarks.bench_serialization --rows 1000 10000
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+from benchmarks import configure_environment
+
+
+async def run(row_counts: list[int], repeat: int) -> None:
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlalchemy.future import select
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.task import Task
+    from app.schemas.task import TaskPage
+    from app.services.task_service import TASK_GET_COLUMNS
+    from app.utils.serialization import orjson_response
+    from benchmarks.seed import seed_database
+
+    await seed_database(engine, users=100, tasks=max(row_counts), dependants=0)
+    page_adapter = TypeAdapter(TaskPage)
+
+    async def orm_pydantic(db, limit: int) -> bytes:
+        # What the list endpoints did before: ORM entities validated into
+        # the response model, then encoded by the default JSON response
+        result = await db.execute(select(Task).order_by(Task.id).limit(limit))
+        page = {"items": result.scalars().all(), "next_cursor": None}
+        validated = page_adapter.validate_python(page, from_attributes=True)
+        content = jsonable_encoder(page_adapter.dump_python(validated, mode="json"))
+        return json.dumps(content, separators=(",", ":")).encode()
+
+    async def rows_orjson(db, limit: int) -> bytes:
+        result = await db.execute(
+            select(*TASK_GET_COLUMNS).order_by(Task.id).limit(limit)
+        )
+        page = {"items": [row._asdict() for row in result], "next_cursor": None}
+        return orjson_response(page).body
+
+    print(f"{'rows':>7} {'path':>14} {'ms/page':>9} {'us/row':>8}")
+    for rows in row_counts:
+        timings = {}
+        for name, path in (
+            ("orm+pydantic", orm_pydantic),
+            ("rows+orjson", rows_orjson),
+        ):
+            best = float("inf")
+            for _ in range(repeat):
+                async with AsyncSessionLocal() as db:
+                    started = perf_counter()
+                    await path(db, rows)
+                    best = min(best, perf_counter() - started)
+            timings[name] = best
+            print(f"{rows:>7} {name:>14} {best * 1000:>9.2f} {best / rows * 1e6:>8.2f}")
+        print(
+            f"{'':>7} {'speedup':>14} "
+            f"{timings['orm+pydantic'] / timings['rows+orjson']:>9.1f}x"
+        )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", help="empty database to seed")
+    args = parser.parse_args()
+
+    configure_environment(args.database_url)
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
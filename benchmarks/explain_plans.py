@@ -0,0 +1,243 @@
+"""
+Query-plan regression check for the hot service queries.
+
+Seeds a large dataset, runs EXPLAIN on every query the services issue on the
+request path and exits non-zero if any of them falls back to a sequential
+scan. Run against an empty database:
+
+    python -m benchmarks.explain_plans
+    python -m benchmarks.explain_plans --database-url postgresql://.../bench
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from benchmarks import configure_environment
+
+
+class explain(Executable, ClauseElement):
+    """EXPLAIN wrapper that keeps the bound parameters of the statement"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(explain, "postgresql")
+def _pg_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+@compiles(explain, "sqlite")
+def _sqlite_explain(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+def _sequential_scans(dialect: str, rows: list) -> tuple[list[str], list[str]]:
+    """Return the plan lines and the ones that read a whole table"""
+    if dialect == "postgresql":
+        plan = rows[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        lines, seq_scans = [], []
+        stack = [(plan[0]["Plan"], 0)]
+        while stack:
+            node, depth = stack.pop()
+            line = "  " * depth + node["Node Type"]
+            if "Relation Name" in node:
+                line += f" on {node['Relation Name']}"
+            if "Index Name" in node:
+                line += f" using {node['Index Name']}"
+            lines.append(line)
+            if node["Node Type"] == "Seq Scan":
+                seq_scans.append(line.strip())
+            stack.extend(
+                (child, depth + 1) for child in reversed(node.get("Plans", []))
+            )
+        return lines, seq_scans
+
+    lines = [row[-1] for row in rows]
+    # Scans of subquery results read the rows the subquery already produced
+    subqueries = {
+        line.split()[-1]
+        for line in lines
+        if line.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+    }
+    # FTS5 reports its full-text index lookups as "SCAN ... VIRTUAL TABLE INDEX"
+    seq_scans = [
+        line
+        for line in lines
+        if line.startswith("SCAN ")
+        and " USING " not in line
+        and " VIRTUAL TABLE INDEX " not in line
+        and line.split()[1] not in subqueries
+    ]
+    return lines, seq_scans
+
+
+def _plan_cases(seeded: dict, dialect: str) -> list[tuple[str, object]]:
+    from types import SimpleNamespace
+
+    from sqlalchemy.future import select
+
+    from app.models.task import (
+        DependantTask,
+        EscalationLog,
+        Task,
+        TaskRemark,
+        TaskStatus,
+    )
+    from app.models.user import User, UserRole
+    from app.schemas.task import TaskListQuery, TaskOrderBy
+    from app.services.escalation_service import overdue_tasks_query
+    from app.services.task_search_service import (
+        build_postgresql_search,
+        build_sqlite_search,
+        fts5_query,
+    )
+    from app.services.task_service import (
+        _encode_cursor,
+        build_task_list_query,
+        build_task_page_version_query,
+    )
+
+    now = datetime.now(timezone.utc)
+    employee_id = seeded["employee_ids"][len(seeded["employee_ids"]) // 2]
+    supervisor_id = seeded["supervisor_ids"][0]
+    id_cursor = _encode_cursor(Task(id=50_000), TaskOrderBy.ID)
+    dated_cursor = _encode_cursor(
+        Task(id=50_000, due_date=now + timedelta(days=30)), TaskOrderBy.DUE_DATE
+    )
+    undated_cursor = _encode_cursor(
+        Task(id=50_000, due_date=None), TaskOrderBy.DUE_DATE
+    )
+
+    def listing(**params):
+        undated = params.pop("undated", False)
+        return build_task_list_query(TaskListQuery(**params), 50, undated=undated)
+
+    def search(text: str, role: UserRole, user_id: int):
+        user = SimpleNamespace(role=role, id=user_id)
+        if dialect == "postgresql":
+            return build_postgresql_search(text, user, 50, 0)
+        return build_sqlite_search(fts5_query(text), user, 50, 0)
+
+    return [
+        ("tasks by id, next page", listing(cursor=id_cursor)),
+        ("tasks by due date", listing(order_by=TaskOrderBy.DUE_DATE)),
+        (
+            "tasks by due date, next page",
+            listing(order_by=TaskOrderBy.DUE_DATE, cursor=dated_cursor),
+        ),
+        (
+            "tasks by due date, undated phase",
+            listing(order_by=TaskOrderBy.DUE_DATE, cursor=undated_cursor, undated=True),
+        ),
+        (
+            "task page versions by due date",
+            build_task_page_version_query(
+                TaskListQuery(order_by=TaskOrderBy.DUE_DATE), 50
+            ),
+        ),
+        ("assigned tasks by id", listing(assigned_to_id=employee_id)),
+        (
+            "assigned tasks by id, next page",
+            listing(assigned_to_id=employee_id, cursor=id_cursor),
+        ),
+        (
+            "assigned tasks by due date",
+            listing(assigned_to_id=employee_id, order_by=TaskOrderBy.DUE_DATE),
+        ),
+        (
+            "open assigned tasks by due date",
+            listing(
+                assigned_to_id=employee_id,
+                status=[TaskStatus.PENDING, TaskStatus.IN_PROGRESS],
+                order_by=TaskOrderBy.DUE_DATE,
+            ),
+        ),
+        ("escalated tasks", listing(status=[TaskStatus.ESCALATED])),
+        ("tasks by assigner", listing(assigned_by_id=supervisor_id)),
+        (
+            "tasks due this week",
+            listing(
+                due_from=now,
+                due_to=now + timedelta(days=7),
+                order_by=TaskOrderBy.DUE_DATE,
+            ),
+        ),
+        ("overdue escalation batch", overdue_tasks_query(now, 1_000)),
+        ("task search", search("task 12345", UserRole.ADMIN, seeded["admin_id"])),
+        ("assigned task search", search("seeded", UserRole.EMPLOYEE, employee_id)),
+        (
+            "dependants of a task",
+            select(DependantTask).where(DependantTask.dependant_to_id == 1_000),
+        ),
+        ("remarks of a task", select(TaskRemark).where(TaskRemark.task_id == 1_000)),
+        (
+            "escalations of a task",
+            select(EscalationLog).where(EscalationLog.task_id == 1_000),
+        ),
+        ("user by id", select(User).where(User.id == employee_id)),
+        ("user by email", select(User).where(User.email == "user2@example.com")),
+    ]
+
+
+async def run(database_url: str, users: int, tasks: int, dependants: int) -> int:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from benchmarks.seed import seed_database
+
+    engine = create_async_engine(
+        database_url.replace("postgresql://", "postgresql+asyncpg://")
+    )
+    try:
+        seeded = await seed_database(
+            engine, users=users, tasks=tasks, dependants=dependants
+        )
+
+        failures = []
+        async with engine.connect() as conn:
+            for name, statement in _plan_cases(seeded, conn.dialect.name):
+                result = await conn.execute(explain(statement))
+                lines, seq_scans = _sequential_scans(conn.dialect.name, result.all())
+                verdict = "SEQ SCAN" if seq_scans else "ok"
+                print(f"[{verdict}] {name}")
+                for line in lines:
+                    print(f"    {line}")
+                if seq_scans:
+                    failures.append(name)
+    finally:
+        await engine.dispose()
+
+    if failures:
+        print(f"\n{len(failures)} queries fall back to a sequential scan:")
+        for name in failures:
+            print(f"  - {name}")
+        return 1
+
+    print("\nAll queries are served by an index.")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="empty database to seed and inspect")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--dependants", type=int, default=50_000)
+    args = parser.parse_args()
+
+    database_url = configure_environment(args.database_url)
+    sys.exit(asyncio.run(run(database_url, args.users, args.tasks, args.dependants)))
+
+
+if __name__ == "__main__":
+    main()
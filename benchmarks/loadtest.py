@@ -0,0 +1,329 @@
+"""
+Mixed-traffic load test of the API against a freshly seeded database.
+
+    python -m benchmarks.loadtest --tasks 100000 --duration 30 --concurrency 32
+    python -m benchmarks.loadtest --uvicorn --output results/loadtest.json
+
+Requests go through httpx's in-process ASGI transport by default, or through
+a real uvicorn server on localhost with `--uvicorn`. The report is printed as
+JSON (and optionally written to `--output`) so runs can be compared between
+commits.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+
+from benchmarks import configure_environment
+
+# Relative weight of each operation in the traffic mix
+DEFAULT_MIX = {
+    "signin": 2,
+    "list_tasks": 25,
+    "list_assigned": 20,
+    "get_task": 25,
+    "update_task": 8,
+    "create_dependant": 5,
+    "list_dependants": 15,
+}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Traffic:
+    """Builds the requests of each operation from the seeded ids"""
+
+    def __init__(self, seeded: dict, tasks: int, rng: random.Random):
+        from app.utils.jwt import create_access_token
+
+        self.rng = rng
+        self.tasks = tasks
+        self.admin_id = seeded["admin_id"]
+        self.employee_ids = seeded["employee_ids"]
+        # Tokens are minted up front so bcrypt only runs for the signin share
+        self.admin_headers = self._headers(create_access_token, self.admin_id)
+        self.employee_headers = {
+            user_id: self._headers(create_access_token, user_id)
+            for user_id in self.employee_ids[:200]
+        }
+
+    @staticmethod
+    def _headers(create_access_token, user_id: int) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    def _employee(self) -> dict:
+        return self.employee_headers[self.rng.choice(list(self.employee_headers))]
+
+    def _task_id(self) -> int:
+        return self.rng.randint(1, self.tasks)
+
+    def request(self, operation: str) -> tuple[str, str, dict]:
+        """Method, URL and httpx keyword arguments for one operation"""
+        from benchmarks.seed import SEED_PASSWORD
+
+        if operation == "signin":
+            user_id = self.rng.choice(self.employee_ids)
+            credentials = {
+                "email": f"user{user_id}@example.com",
+                "password": SEED_PASSWORD,
+            }
+            return "POST", "/auth/signin", {"json": credentials}
+        if operation == "list_tasks":
+            return (
+                "GET",
+                "/tasks/",
+                {"params": {"limit": 50}, "headers": self.admin_headers},
+            )
+        if operation == "list_assigned":
+            return (
+                "GET",
+                "/tasks/assigned",
+                {"params": {"limit": 50}, "headers": self._employee()},
+            )
+        if operation == "get_task":
+            return "GET", f"/tasks/{self._task_id()}", {"headers": self.admin_headers}
+        if operation == "update_task":
+            start_date = datetime.now(timezone.utc) - timedelta(
+                days=self.rng.randint(0, 30)
+            )
+            body = {
+                "title": f"Load test update {self.rng.randint(1, 1_000_000)}",
+                "description": "Updated by the load test",
+                "status": self.rng.choice(["Pending", "In Progress"]),
+                "assigned_to_id": self.rng.choice(self.employee_ids),
+                "assigned_by_id": self.admin_id,
+                "start_date": start_date.isoformat(),
+                "due_date": (start_date + timedelta(days=14)).isoformat(),
+                "escalation_flagged": False,
+            }
+            return (
+                "PUT",
+                f"/tasks/{self._task_id()}",
+                {"json": body, "headers": self.admin_headers},
+            )
+        if operation == "create_dependant":
+            body = {"title": "Load test dependant", "description": None}
+            return (
+                "POST",
+                f"/tasks/dependant/{self._task_id()}",
+                {"json": body, "headers": self._employee()},
+            )
+        if operation == "list_dependants":
+            return (
+                "GET",
+                f"/tasks/dependants/{self._task_id()}",
+                {"headers": self.admin_headers},
+            )
+        raise ValueError(f"Unknown operation: {operation}")
+
+
+async def drive(
+    client, traffic: Traffic, mix: dict[str, int], duration: float, concurrency: int
+) -> tuple[dict[str, list[float]], dict[str, int], float]:
+    """Send the traffic mix from `concurrency` workers for `duration` seconds"""
+    operations = list(mix)
+    weights = list(mix.values())
+    latencies = {operation: [] for operation in operations}
+    errors = {operation: 0 for operation in operations}
+
+    async def worker(deadline: float):
+        while perf_counter() < deadline:
+            operation = traffic.rng.choices(operations, weights)[0]
+            method, url, kwargs = traffic.request(operation)
+            started = perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                failed = response.status_code >= 400
+            except Exception:  # noqa: BLE001 - count transport errors too
+                failed = True
+            latencies[operation].append(perf_counter() - started)
+            errors[operation] += failed
+
+    started = perf_counter()
+    await asyncio.gather(*(worker(started + duration) for _ in range(concurrency)))
+    return latencies, errors, perf_counter() - started
+
+
+def summarize(
+    latencies: dict[str, list[float]], errors: dict[str, int], elapsed: float
+) -> dict:
+    """Throughput and latency percentiles per operation and overall"""
+    endpoints = {}
+    for operation, values in latencies.items():
+        values = sorted(values)
+        endpoints[operation] = {
+            "requests": len(values),
+            "errors": errors[operation],
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+            "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+        }
+
+    every = sorted(value for values in latencies.values() for value in values)
+    return {
+        "requests": len(every),
+        "errors": sum(errors.values()),
+        "throughput_rps": round(len(every) / elapsed, 2),
+        "p50_ms": round(percentile(every, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(every, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(every, 0.99) * 1000, 3),
+        "endpoints": endpoints,
+    }
+
+
+async def run(args: argparse.Namespace, mix: dict[str, int]) -> dict:
+    import httpx
+    import uvicorn
+
+    from app.db.session import engine
+    from app.main import app
+    from benchmarks.seed import seed_database
+
+    seed_started = perf_counter()
+    seeded = await seed_database(
+        engine,
+        users=args.users,
+        tasks=args.tasks,
+        dependants=args.dependants,
+        seed=args.seed,
+    )
+    seed_seconds = perf_counter() - seed_started
+    traffic = Traffic(seeded, args.tasks, random.Random(args.seed))
+
+    server = server_task = None
+    if args.uvicorn:
+        port = _free_port()
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        server_task = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.05)
+        client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=httpx.Limits(max_connections=args.concurrency),
+            timeout=60,
+        )
+    else:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=60,
+        )
+
+    try:
+        async with client:
+            if args.warmup:
+                await drive(client, traffic, mix, args.warmup, args.concurrency)
+            latencies, errors, elapsed = await drive(
+                client, traffic, mix, args.duration, args.concurrency
+            )
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await server_task
+        await engine.dispose()
+
+    return {
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "database": engine.url.get_backend_name(),
+            "transport": "uvicorn" if args.uvicorn else "asgi",
+            "users": args.users,
+            "tasks": args.tasks,
+            "dependants": args.dependants,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "mix": mix,
+        },
+        "seed_seconds": round(seed_seconds, 2),
+        "elapsed_seconds": round(elapsed, 2),
+        **summarize(latencies, errors, elapsed),
+    }
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse `operation=weight,...`, keeping unlisted operations at zero"""
+    mix = {operation: 0 for operation in DEFAULT_MIX}
+    for part in value.split(","):
+        operation, _, weight = part.partition("=")
+        if operation.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown operation: {operation}")
+        mix[operation.strip()] = int(weight)
+    return {operation: weight for operation, weight in mix.items() if weight > 0}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--dependants", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="seconds of measured traffic"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=3.0, help="seconds of unmeasured traffic"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="operation weights, e.g. list_tasks=5,get_task=5 "
+        f"(operations: {', '.join(DEFAULT_MIX)})",
+    )
+    parser.add_argument(
+        "--uvicorn", action="store_true", help="serve over TCP with uvicorn"
+    )
+    parser.add_argument("--database-url", help="empty database to seed")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    configure_environment(args.database_url)
+    report = asyncio.run(run(args, args.mix))
+
+    rendered = json.dumps(report, indent=2)
+    print(rendered)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(rendered + "\n")
+
+
+if __name__ == "__main__":
+    main()
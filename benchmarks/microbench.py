@@ -0,0 +1,278 @@
+"""
+Microbenchmarks of the helpers that run on every request, with a baseline.
+
+    python -m benchmarks.microbench run
+    python -m benchmarks.microbench run --save benchmarks/baseline.json
+    python -m benchmarks.microbench compare --threshold 0.2
+
+`compare` runs the suite and exits with status 1 when any case is slower
+than the stored baseline by more than the threshold. Timings depend on the
+machine, so refresh the baseline with `run --save` when the reference
+machine changes, in the same commit as an intended speed change.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatch
+from types import SimpleNamespace
+from typing import Callable
+
+from benchmarks import configure_environment
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# name -> setup returning (callable, operations per call)
+CASES: dict[str, Callable[[], tuple[Callable[[], object], int]]] = {}
+
+
+def case(name: str):
+    """Register a benchmark setup under `name`"""
+
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+@case("jwt.create_access_token")
+def _create_access_token():
+    from app.utils.jwt import create_access_token
+
+    return lambda: create_access_token(data={"sub": "42"}), 1
+
+
+@case("jwt.decode_token.cached")
+def _decode_token_cached():
+    from app.utils.jwt import create_access_token, decode_token
+
+    token = create_access_token(data={"sub": "42"})
+    decode_token(token)
+    return lambda: decode_token(token), 1
+
+
+@case("jwt.decode_token.uncached")
+def _decode_token_uncached():
+    from app.utils.jwt import create_access_token, decode_token, token_cache
+
+    token = create_access_token(data={"sub": "42"})
+
+    def decode():
+        token_cache.clear()
+        return decode_token(token)
+
+    return decode, 1
+
+
+def _user_payload(**overrides) -> dict:
+    payload = {
+        "name": "Benchmark user",
+        "email": "benchmark@example.com",
+        "phone_number": "0342 9123456",
+        "password": "Passw0rdA",
+        "confirm_password": "Passw0rdA",
+    }
+    payload.update(overrides)
+    return payload
+
+
+@case("schemas.user_create.valid")
+def _user_create_valid():
+    from app.schemas.auth import UserCreate
+
+    payload = _user_payload()
+    return lambda: UserCreate.model_validate(payload), 1
+
+
+@case("schemas.user_create.invalid_phone")
+def _user_create_invalid_phone():
+    from pydantic import ValidationError
+
+    from app.schemas.auth import UserCreate
+
+    payload = _user_payload(phone_number="12345")
+
+    def validate():
+        try:
+            UserCreate.model_validate(payload)
+        except ValidationError:
+            pass
+
+    return validate, 1
+
+
+def _task_rows(count: int) -> list[dict]:
+    from app.models.task import TaskStatus
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "description": f"Benchmark task {i}",
+            "status": TaskStatus.IN_PROGRESS,
+            "assigned_to_id": i % 100 + 2,
+            "assigned_by_id": 1,
+            "start_date": now,
+            "due_date": now + timedelta(days=7),
+            "escalation_flagged": False,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _task_get_pydantic(count: int):
+    from pydantic import TypeAdapter
+
+    from app.schemas.task import TaskGet
+
+    adapter = TypeAdapter(list[TaskGet])
+    rows = _task_rows(count)
+    return lambda: adapter.dump_json(adapter.validate_python(rows)), 1
+
+
+def _task_get_orjson(count: int):
+    from app.utils.serialization import orjson_response
+
+    rows = _task_rows(count)
+    return lambda: orjson_response({"items": rows, "next_cursor": None}).body, 1
+
+
+for _count, _label in ((1_000, "1k"), (10_000, "10k")):
+    case(f"serialization.task_get.pydantic.{_label}")(
+        lambda count=_count: _task_get_pydantic(count)
+    )
+    case(f"serialization.task_get.orjson.{_label}")(
+        lambda count=_count: _task_get_orjson(count)
+    )
+
+
+@case("dependencies.role_required")
+def _role_required():
+    from app.core.dependencies import role_required
+    from app.models.user import UserRole
+
+    checker = role_required(["Admin", "Supervisor", "Compliance", "Employee"])
+    # The checker only reads the role of the user resolved by get_current_user
+    user = SimpleNamespace(role=UserRole.EMPLOYEE)
+    batch = 1_000
+    loop = asyncio.new_event_loop()
+
+    async def check_batch():
+        for _ in range(batch):
+            await checker(current_user=user)
+
+    # One event loop round-trip per batch, so the loop overhead is amortized
+    return lambda: loop.run_until_complete(check_batch()), batch
+
+
+def measure(setup, repeat: int) -> float:
+    """Best time per operation in nanoseconds"""
+    func, operations = setup()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number / operations * 1e9
+
+
+def run_suite(pattern: str, repeat: int) -> dict[str, float]:
+    results = {}
+    for name, setup in CASES.items():
+        if fnmatch(name, pattern):
+            results[name] = measure(setup, repeat)
+            print(f"{name:<44} {_format_ns(results[name]):>12}", file=sys.stderr)
+    return results
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def save_baseline(results: dict[str, float], path: str) -> None:
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "unit": "ns_per_op",
+        "results": {name: round(ns, 1) for name, ns in sorted(results.items())},
+    }
+    with open(path, "w") as baseline:
+        json.dump(document, baseline, indent=2)
+        baseline.write("\n")
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> bool:
+    """Print the change per case and return whether every case is within threshold"""
+    passed = True
+    print(f"{'case':<44} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<44} {'-':>12} {_format_ns(current):>12} {'new':>8}")
+            continue
+
+        change = current / reference - 1
+        flag = ""
+        if change > threshold:
+            flag = "  SLOWER"
+            passed = False
+        print(
+            f"{name:<44} {_format_ns(reference):>12} {_format_ns(current):>12} "
+            f"{change:>+8.1%}{flag}"
+        )
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the suite")
+    run_parser.add_argument(
+        "--save", metavar="PATH", help="store the results as a baseline"
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="run and compare with a baseline"
+    )
+    compare_parser.add_argument("--baseline", default=BASELINE_PATH)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%"
+    )
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument("--filter", default="*", help="glob of case names")
+        subparser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    configure_environment()
+    results = run_suite(args.filter, args.repeat)
+
+    if args.command == "run":
+        if args.save:
+            save_baseline(results, args.save)
+        print(
+            json.dumps({name: round(ns, 1) for name, ns in results.items()}, indent=2)
+        )
+        return
+
+    with open(args.baseline) as baseline:
+        reference = json.load(baseline)["results"]
+    if not compare(results, reference, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Deterministic seeding of a large dataset for benchmarks and plan checks.
+
+The rows are written with Core multi-row inserts, bypassing the ORM and the
+per-user password hashing in `User.__init__`, so that hundreds of thousands
+of tasks can be seeded in seconds.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.base_class import Base
+from app.models.task import DependantTask, Task, TaskStatus
+from app.models.user import User, UserRole
+from app.utils.security import hash_password
+
+SEED_PASSWORD = "Passw0rd!"
+
+STATUS_WEIGHTS = {
+    TaskStatus.PENDING: 45,
+    TaskStatus.IN_PROGRESS: 25,
+    TaskStatus.COMPLETED: 25,
+    TaskStatus.ESCALATED: 5,
+}
+
+
+def _chunks(rows: list[dict], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+async def seed_database(
+    engine: AsyncEngine,
+    users: int = 1_000,
+    tasks: int = 100_000,
+    dependants: int = 20_000,
+    seed: int = 42,
+    batch_size: int = 5_000,
+    create_schema: bool = True,
+) -> dict:
+    """
+    Seed users, tasks and dependants.
+
+    The first user is an Admin, one in twenty is a Supervisor and the rest are
+    Employees. Every user shares the password `SEED_PASSWORD`.
+
+    Args:
+        engine: The engine to seed.
+        users: Number of users to create.
+        tasks: Number of tasks to create.
+        dependants: Number of dependant tasks to create.
+        seed: Random seed, so that runs are reproducible.
+        batch_size: Rows per INSERT statement.
+        create_schema: Whether to create the tables first.
+
+    Returns:
+        dict: The ids of the seeded admin, supervisors and employees.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    password = hash_password(SEED_PASSWORD)
+
+    user_rows = []
+    for i in range(1, users + 1):
+        if i == 1:
+            role = UserRole.ADMIN
+        elif i % 20 == 0:
+            role = UserRole.SUPERVISOR
+        else:
+            role = UserRole.EMPLOYEE
+        user_rows.append(
+            {
+                "id": i,
+                "name": f"Seed user {i}",
+                "email": f"user{i}@example.com",
+                "phone_number": f"0300{i:07d}",
+                "role": role,
+                "password": password,
+                "is_active": True,
+                "is_superuser": role == UserRole.ADMIN,
+            }
+        )
+
+    admin_id = 1
+    supervisor_ids = [u["id"] for u in user_rows if u["role"] == UserRole.SUPERVISOR]
+    employee_ids = [u["id"] for u in user_rows if u["role"] == UserRole.EMPLOYEE]
+    assigner_ids = [admin_id, *supervisor_ids]
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+
+    task_rows = []
+    for i in range(1, tasks + 1):
+        start_date = now - timedelta(days=rng.randint(0, 180))
+        due_date = (
+            None
+            if rng.random() < 0.05
+            else start_date + timedelta(days=rng.randint(1, 240))
+        )
+        task_status = rng.choices(statuses, weights)[0]
+        task_rows.append(
+            {
+                "id": i,
+                "title": f"Task {i}",
+                "description": f"Seeded task {i} for benchmarking",
+                "assigned_to_id": rng.choice(employee_ids),
+                "assigned_by_id": rng.choice(assigner_ids),
+                "start_date": start_date,
+                "due_date": due_date,
+                "status": task_status,
+                "escalation_flagged": task_status == TaskStatus.ESCALATED,
+            }
+        )
+
+    dependant_rows = [
+        {
+            "id": i,
+            "title": f"Dependant {i}",
+            "description": None,
+            "created_by_id": rng.choice(employee_ids),
+            "dependant_to_id": rng.randint(1, tasks),
+            "created_in": now,
+        }
+        for i in range(1, dependants + 1)
+    ]
+
+    async with engine.begin() as conn:
+        if create_schema:
+            await conn.run_sync(Base.metadata.create_all)
+        for table, rows in (
+            (User.__table__, user_rows),
+            (Task.__table__, task_rows),
+            (DependantTask.__table__, dependant_rows),
+        ):
+            for chunk in _chunks(rows, batch_size):
+                await conn.execute(insert(table), chunk)
+
+        if conn.dialect.name == "postgresql":
+            # Explicit ids bypass the sequences, so move them past the seed
+            for table in ("users", "tasks", "dependant_tasks"):
+                await conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"(SELECT MAX(id) FROM {table}))"
+                    )
+                )
+
+        await conn.execute(text("ANALYZE"))
+
+    return {
+        "admin_id": admin_id,
+        "supervisor_ids": supervisor_ids,
+        "employee_ids": employee_ids,
+    }
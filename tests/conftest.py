@@ -0,0 +1,64 @@
+"""
+Shared fixtures: the application on a seeded SQLite database in a temp file.
+
+The settings and the engines are created when `app` is imported, so the
+environment is set up here, before any test module imports it.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_DATABASE_PATH = os.path.join(
+    tempfile.mkdtemp(prefix="task-management-tests-"), "test.db"
+)
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DATABASE_PATH}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ.setdefault("AUTHJWT_SECRET_KEY", "test-secret-key")
+os.environ["DEBUG"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["NOTIFICATIONS_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.jwt import create_access_token  # noqa: E402
+from benchmarks.seed import seed_database  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+async def seeded() -> dict:
+    """Users and tasks seeded once for the whole run"""
+    result = await seed_database(engine, users=60, tasks=2_000, dependants=200)
+    yield result
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def client(seeded) -> httpx.AsyncClient:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+def auth_headers(user_id: int) -> dict[str, str]:
+    """Bearer token headers for a seeded user"""
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+@pytest.fixture(scope="session")
+def admin(seeded) -> dict[str, str]:
+    return auth_headers(seeded["admin_id"])
+
+
+@pytest.fixture(scope="session")
+def supervisor(seeded) -> dict[str, str]:
+    return auth_headers(seeded["supervisor_ids"][0])
+
+
+@pytest.fixture(scope="session")
+def employee(seeded) -> dict[str, str]:
+    return auth_headers(seeded["employee_ids"][0])
@@ -0,0 +1,134 @@
+"""Escalated tasks and the overdue sweep."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+
+from app.db.base_class import Base
+from app.db.session import AsyncSessionLocal
+from app.models.task import EscalationLog, Task, TaskStatus
+from app.services.escalation_service import ESCALATION_REASON, sweep_overdue_tasks
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_deleting_an_escalated_task_keeps_its_log(client, admin, seeded):
+    due = datetime.now(timezone.utc) - timedelta(days=1)
+    response = await client.post(
+        "/tasks/",
+        json={
+            "title": "Overdue",
+            "assigned_to_id": [seeded["employee_ids"][0]],
+            "due_date": due.isoformat(),
+        },
+        headers=admin,
+    )
+    task_id = response.json()["id"]
+    async with AsyncSessionLocal() as db:
+        log = EscalationLog(task_id=task_id, reason="Past due date")
+        db.add(log)
+        await db.flush()
+        log_id = log.id
+        await db.commit()
+
+    response = await client.delete(f"/tasks/{task_id}", headers=admin)
+    assert response.status_code == 204
+
+    async with AsyncSessionLocal() as db:
+        task_ids = await db.scalars(
+            select(EscalationLog.task_id).where(EscalationLog.id == log_id)
+        )
+        assert task_ids.all() == [None]
+    response = await client.get(f"/tasks/{task_id}", headers=admin)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_deleting_a_missing_task_is_not_found(client, admin):
+    response = await client.delete("/tasks/999999", headers=admin)
+
+    assert response.status_code == 404
+
+
+@pytest.fixture
+async def sweep_db(tmp_path):
+    """A database of its own holding only the tasks a test adds"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sweep.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine)
+    await engine.dispose()
+
+
+async def add_tasks(sessionmaker, count: int, due_in: timedelta, **values) -> list[int]:
+    due_date = datetime.now(timezone.utc) + due_in
+    async with sessionmaker() as db:
+        ids = await db.scalars(
+            insert(Task).returning(Task.id),
+            [
+                {"title": f"Task {i}", "due_date": due_date, **values}
+                for i in range(count)
+            ],
+        )
+        ids = ids.all()
+        await db.commit()
+    return ids
+
+
+async def escalation_log(sessionmaker) -> list[tuple[int, str]]:
+    async with sessionmaker() as db:
+        result = await db.execute(
+            select(EscalationLog.task_id, EscalationLog.reason).order_by(
+                EscalationLog.task_id
+            )
+        )
+        return [tuple(row) for row in result]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sweep_escalates_overdue_tasks_in_batches(sweep_db):
+    overdue = await add_tasks(sweep_db, 5, timedelta(days=-1))
+
+    report = await sweep_overdue_tasks(sessionmaker=sweep_db, batch_size=2)
+
+    assert report["escalated"] == 5
+    assert report["batches"] == 3
+    assert await escalation_log(sweep_db) == [
+        (task_id, ESCALATION_REASON) for task_id in sorted(overdue)
+    ]
+    async with sweep_db() as db:
+        statuses = await db.execute(
+            select(Task.status, Task.escalation_flagged, func.count()).group_by(
+                Task.status, Task.escalation_flagged
+            )
+        )
+        assert statuses.all() == [(TaskStatus.ESCALATED, True, 5)]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_sweep_skips_tasks_it_must_not_escalate(sweep_db):
+    overdue = await add_tasks(sweep_db, 1, timedelta(days=-1))
+    await add_tasks(sweep_db, 1, timedelta(days=1))
+    await add_tasks(sweep_db, 1, timedelta(days=-1), status=TaskStatus.COMPLETED)
+    await add_tasks(sweep_db, 1, timedelta(days=-1), status=TaskStatus.ESCALATED)
+    await add_tasks(sweep_db, 1, timedelta(days=-1), escalation_flagged=True)
+
+    report = await sweep_overdue_tasks(sessionmaker=sweep_db, batch_size=10)
+
+    assert report["escalated"] == 1
+    assert [task_id for task_id, _ in await escalation_log(sweep_db)] == overdue
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_second_sweep_does_nothing(sweep_db):
+    await add_tasks(sweep_db, 3, timedelta(days=-1))
+    await sweep_overdue_tasks(sessionmaker=sweep_db, batch_size=2)
+    logged = await escalation_log(sweep_db)
+
+    report = await sweep_overdue_tasks(sessionmaker=sweep_db, batch_size=2)
+
+    assert report["escalated"] == 0
+    assert report["batches"] == 1
+    assert await escalation_log(sweep_db) == logged
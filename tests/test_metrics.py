@@ -0,0 +1,26 @@
+"""The Prometheus metrics are only served to admins."""
+
+import pytest
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_metrics_require_a_token(client):
+    response = await client.get("/metrics")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_metrics_are_hidden_from_employees(client, employee):
+    response = await client.get("/metrics", headers=employee)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_admins_can_scrape_metrics(client, admin):
+    response = await client.get("/metrics", headers=admin)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE" in response.text
@@ -0,0 +1,95 @@
+"""Notification dispatcher shutdown and buffering."""
+
+import asyncio
+
+import pytest
+
+from app.db.session import AsyncSessionLocal
+from app.utils.notifications import Digest, NotificationDispatcher, NotificationKind
+
+
+class SlowSink:
+    """Records digests, taking a while to deliver each batch"""
+
+    name = "slow"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.sending = asyncio.Event()
+        self.digests: list[Digest] = []
+
+    async def send(self, digests: list[Digest]) -> None:
+        self.sending.set()
+        await asyncio.sleep(self.delay)
+        self.digests.extend(digests)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stop_during_a_send_delivers_everything(seeded):
+    first, second = seeded["employee_ids"][:2]
+    sink = SlowSink(delay=0.2)
+    dispatcher = NotificationDispatcher(
+        sinks=[sink],
+        queue_size=100,
+        coalesce_seconds=0.01,
+        batch_size=10,
+        digest_max_items=10,
+        max_buffered=100,
+        sessionmaker=AsyncSessionLocal,
+    )
+    dispatcher.start()
+
+    dispatcher.notify(first, NotificationKind.ASSIGNMENT, "Task #1 was assigned to you")
+    await asyncio.wait_for(sink.sending.wait(), timeout=5)
+    # Queued while the first digest is still being sent
+    dispatcher.notify(
+        second, NotificationKind.ASSIGNMENT, "Task #2 was assigned to you"
+    )
+    await dispatcher.stop()
+
+    delivered = {
+        digest.recipient_id: [item.message for item in digest.notifications]
+        for digest in sink.digests
+    }
+    assert delivered == {
+        first: ["Task #1 was assigned to you"],
+        second: ["Task #2 was assigned to you"],
+    }
+    assert not dispatcher.running
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_buffer_limit_leaves_the_rest_queued_then_dropped(seeded):
+    recipients = seeded["employee_ids"][:6]
+    sink = SlowSink(delay=0)
+    dispatcher = NotificationDispatcher(
+        sinks=[sink],
+        queue_size=2,
+        # Nothing is flushed before the dispatcher stops
+        coalesce_seconds=60,
+        batch_size=10,
+        digest_max_items=10,
+        max_buffered=3,
+        sessionmaker=AsyncSessionLocal,
+    )
+    dispatcher.start()
+
+    accepted = []
+    for recipient_id in recipients:
+        accepted.append(
+            dispatcher.notify(
+                recipient_id, NotificationKind.ASSIGNMENT, f"Note to {recipient_id}"
+            )
+        )
+        # Let the collector take what it can
+        await asyncio.sleep(0.01)
+
+    assert accepted == [True] * 5 + [False]
+    assert dispatcher._buffered == 3
+    assert dispatcher._queue.qsize() == 2
+
+    await dispatcher.stop()
+
+    assert sorted(digest.recipient_id for digest in sink.digests) == sorted(
+        recipients[:5]
+    )
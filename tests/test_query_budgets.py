@@ -0,0 +1,182 @@
+"""Every endpoint in `QUERY_BUDGETS` stays within its statement budget."""
+
+from typing import Awaitable, Callable
+
+import httpx
+import pytest
+
+from app.core.instrumentation import QUERY_BUDGETS, assert_max_queries
+from benchmarks.seed import SEED_PASSWORD
+
+# A stale If-None-Match makes the conditional reads run their ETag query too
+STALE_ETAG = 'W/"stale"'
+
+Request = Callable[[], Awaitable[httpx.Response]]
+
+
+class Context:
+    def __init__(self, client, seeded, admin, supervisor, employee):
+        self.client = client
+        self.seeded = seeded
+        self.admin = admin
+        self.supervisor = supervisor
+        self.employee = employee
+
+    async def new_task(self, **fields) -> dict:
+        payload = {
+            "title": "Budget task",
+            "assigned_to_id": [self.seeded["employee_ids"][0]],
+            **fields,
+        }
+        response = await self.client.post("/tasks/", json=payload, headers=self.admin)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+
+async def signin(ctx: Context) -> Request:
+    employee_id = ctx.seeded["employee_ids"][0]
+    return lambda: ctx.client.post(
+        "/auth/signin",
+        json={"email": f"user{employee_id}@example.com", "password": SEED_PASSWORD},
+    )
+
+
+async def list_employees(ctx: Context) -> Request:
+    return lambda: ctx.client.get("/auth/employees", headers=ctx.admin)
+
+
+async def list_tasks(ctx: Context) -> Request:
+    return lambda: ctx.client.get(
+        "/tasks/", headers={**ctx.admin, "If-None-Match": STALE_ETAG}
+    )
+
+
+async def list_assigned_tasks(ctx: Context) -> Request:
+    return lambda: ctx.client.get(
+        "/tasks/assigned", headers={**ctx.employee, "If-None-Match": STALE_ETAG}
+    )
+
+
+async def search_tasks(ctx: Context) -> Request:
+    return lambda: ctx.client.get(
+        "/tasks/search", params={"q": "seeded task"}, headers=ctx.admin
+    )
+
+
+async def task_summary(ctx: Context) -> Request:
+    return lambda: ctx.client.get("/tasks/summary", headers=ctx.admin)
+
+
+async def get_task(ctx: Context) -> Request:
+    return lambda: ctx.client.get(
+        "/tasks/1", headers={**ctx.admin, "If-None-Match": STALE_ETAG}
+    )
+
+
+async def create_task(ctx: Context) -> Request:
+    return lambda: ctx.client.post(
+        "/tasks/",
+        json={"title": "Created", "assigned_to_id": [ctx.seeded["employee_ids"][1]]},
+        headers=ctx.admin,
+    )
+
+
+async def update_task(ctx: Context) -> Request:
+    task = await ctx.new_task()
+    body = {**task, "title": "Replaced", "assigned_to_id": task["assigned_to_id"]}
+    return lambda: ctx.client.put(f"/tasks/{task['id']}", json=body, headers=ctx.admin)
+
+
+async def patch_task(ctx: Context) -> Request:
+    task = await ctx.new_task()
+    current = await ctx.client.get(f"/tasks/{task['id']}", headers=ctx.admin)
+    return lambda: ctx.client.patch(
+        f"/tasks/{task['id']}",
+        json={"title": "Patched"},
+        headers={**ctx.supervisor, "If-Match": current.headers["ETag"]},
+    )
+
+
+async def delete_task(ctx: Context) -> Request:
+    task = await ctx.new_task()
+    return lambda: ctx.client.delete(f"/tasks/{task['id']}", headers=ctx.admin)
+
+
+async def task_graph(ctx: Context) -> Request:
+    return lambda: ctx.client.get("/tasks/1/graph", headers=ctx.admin)
+
+
+async def bulk_status(ctx: Context) -> Request:
+    task_ids = [(await ctx.new_task())["id"] for _ in range(3)]
+    # The precondition fails, so the outcomes need the extra existence query
+    return lambda: ctx.client.post(
+        "/tasks/bulk/status",
+        json={
+            "task_ids": task_ids,
+            "status": "Completed",
+            "expected_status": "Completed",
+        },
+        headers=ctx.admin,
+    )
+
+
+async def bulk_reassign(ctx: Context) -> Request:
+    task_ids = [(await ctx.new_task())["id"] for _ in range(3)]
+    return lambda: ctx.client.post(
+        "/tasks/bulk/reassign",
+        json={"task_ids": task_ids, "assigned_to_id": ctx.seeded["employee_ids"][2]},
+        headers=ctx.admin,
+    )
+
+
+async def bulk_delete(ctx: Context) -> Request:
+    assignee_id = ctx.seeded["employee_ids"][-1]
+    return lambda: ctx.client.post(
+        "/tasks/bulk/delete",
+        json={"filter": {"assigned_to_id": assignee_id}},
+        headers=ctx.admin,
+    )
+
+
+CASES: dict[tuple[str, str], tuple[Callable[[Context], Awaitable[Request]], int]] = {
+    ("POST", "/auth/signin"): (signin, 200),
+    ("GET", "/auth/employees"): (list_employees, 200),
+    ("GET", "/tasks/"): (list_tasks, 200),
+    ("GET", "/tasks/assigned"): (list_assigned_tasks, 200),
+    ("GET", "/tasks/search"): (search_tasks, 200),
+    ("GET", "/tasks/summary"): (task_summary, 200),
+    ("GET", "/tasks/{task_id}"): (get_task, 200),
+    ("POST", "/tasks/"): (create_task, 201),
+    ("PUT", "/tasks/{task_id}"): (update_task, 200),
+    ("PATCH", "/tasks/{task_id}"): (patch_task, 200),
+    ("DELETE", "/tasks/{task_id}"): (delete_task, 204),
+    ("GET", "/tasks/{task_id}/graph"): (task_graph, 200),
+    ("POST", "/tasks/bulk/status"): (bulk_status, 200),
+    ("POST", "/tasks/bulk/reassign"): (bulk_reassign, 200),
+    ("POST", "/tasks/bulk/delete"): (bulk_delete, 200),
+}
+
+
+def test_every_budget_has_a_case():
+    assert set(CASES) == set(QUERY_BUDGETS)
+
+
+@pytest.fixture
+async def ctx(client, seeded, admin, supervisor, employee) -> Context:
+    # Warm the token and user caches the budgets assume
+    for headers in (admin, supervisor, employee):
+        response = await client.get("/auth/profile", headers=headers)
+        assert response.status_code == 200
+    return Context(client, seeded, admin, supervisor, employee)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("endpoint", sorted(QUERY_BUDGETS), ids=" ".join)
+async def test_endpoint_within_query_budget(ctx, endpoint):
+    prepare, expected_status = CASES[endpoint]
+    request = await prepare(ctx)
+
+    with assert_max_queries(QUERY_BUDGETS[endpoint]):
+        response = await request()
+
+    assert response.status_code == expected_status, response.text
@@ -0,0 +1,34 @@
+"""The hot service queries are served by an index, as in benchmarks.explain_plans."""
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.explain_plans import _plan_cases, _sequential_scans, explain
+from benchmarks.seed import seed_database
+
+
+@pytest.fixture(scope="module")
+async def plans_engine(tmp_path_factory):
+    """A database of its own, so the plans do not depend on the other tests"""
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    seeded = await seed_database(engine, users=100, tasks=5_000, dependants=500)
+    yield engine, seeded
+    await engine.dispose()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_no_sequential_scans(plans_engine):
+    engine, seeded = plans_engine
+
+    failures = {}
+    async with engine.connect() as conn:
+        for name, statement in _plan_cases(seeded, conn.dialect.name):
+            result = await conn.execute(explain(statement))
+            lines, seq_scans = _sequential_scans(conn.dialect.name, result.all())
+            if seq_scans:
+                failures[name] = lines
+
+    assert not failures, "\n".join(
+        f"{name}:\n    " + "\n    ".join(lines) for name, lines in failures.items()
+    )
@@ -0,0 +1,114 @@
+"""Read routing: replica round-robin, the primary override and read-your-writes."""
+
+from itertools import cycle
+from time import time
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.core.config import get_settings
+from app.db import session as db_session
+from app.db.session import (
+    READ_CONSISTENCY_HEADER,
+    READ_PRIMARY_COOKIE,
+    AsyncSessionLocal,
+    ReadYourWritesMiddleware,
+    get_db,
+    read_sessionmaker,
+)
+from app.utils.serialization import orjson_response
+
+settings = get_settings()
+
+
+def make_request(headers: dict[str, str] | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def replicas(monkeypatch) -> list[str]:
+    """Two stand-in replica session factories"""
+    sessionmakers = ["replica-1", "replica-2"]
+    monkeypatch.setattr(db_session, "replica_engines", [object(), object()])
+    monkeypatch.setattr(db_session, "_replica_sessionmakers", cycle(sessionmakers))
+    return sessionmakers
+
+
+def test_reads_use_the_replicas_round_robin(replicas):
+    picked = [read_sessionmaker(make_request()) for _ in range(4)]
+
+    assert picked == [*replicas, *replicas]
+
+
+def test_reads_use_the_primary_without_replicas():
+    assert read_sessionmaker(make_request()) is AsyncSessionLocal
+
+
+def test_consistency_header_forces_the_primary(replicas):
+    request = make_request({READ_CONSISTENCY_HEADER: "Primary"})
+
+    assert read_sessionmaker(request) is AsyncSessionLocal
+    # The override does not take a turn from the rotation
+    assert read_sessionmaker(make_request()) == replicas[0]
+
+
+def test_fresh_cookie_forces_the_primary(replicas):
+    fresh = make_request({"Cookie": f"{READ_PRIMARY_COOKIE}={int(time()) + 5}"})
+    expired = make_request({"Cookie": f"{READ_PRIMARY_COOKIE}={int(time()) - 1}"})
+    malformed = make_request({"Cookie": f"{READ_PRIMARY_COOKIE}=soon"})
+
+    assert read_sessionmaker(fresh) is AsyncSessionLocal
+    assert read_sessionmaker(expired) == replicas[0]
+    assert read_sessionmaker(malformed) == replicas[1]
+
+
+@pytest.fixture
+async def writes_client(seeded) -> httpx.AsyncClient:
+    """An app whose endpoints return their own responses"""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/write")
+    async def write(db: AsyncSession = Depends(get_db)):
+        await db.commit()
+        return orjson_response({"written": True})
+
+    @app.get("/read")
+    async def read(db: AsyncSession = Depends(get_db)):
+        return orjson_response({"written": False})
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_commit_sets_the_cookie_on_returned_responses(writes_client):
+    started = int(time())
+    response = await writes_client.post("/write")
+
+    until = int(response.cookies[READ_PRIMARY_COOKIE])
+    window = settings.READ_YOUR_WRITES_SECONDS
+    assert started + window <= until <= int(time()) + window
+    assert f"Max-Age={window}" in response.headers["set-cookie"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_reads_do_not_set_the_cookie(writes_client):
+    response = await writes_client.get("/read")
+
+    assert "set-cookie" not in response.headers
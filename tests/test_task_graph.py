@@ -0,0 +1,131 @@
+"""Task dependency graphs: access, cycles, ordering and caching."""
+
+from itertools import cycle
+
+import pytest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import session as db_session
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_employees_cannot_read_graphs(client, employee):
+    response = await client.get("/tasks/1/graph", headers=employee)
+
+    assert response.status_code == 403
+
+
+async def new_task(client, headers, seeded, title: str, days: int | None = None):
+    payload = {"title": title, "assigned_to_id": [seeded["employee_ids"][0]]}
+    if days is not None:
+        payload["start_date"] = "2030-01-01T00:00:00Z"
+        payload["due_date"] = f"2030-01-{1 + days:02d}T00:00:00Z"
+    response = await client.post("/tasks/", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def depend(client, headers, task_id: int, blocking_task_id: int):
+    return await client.post(
+        f"/tasks/{task_id}/dependencies",
+        json={"blocking_task_id": blocking_task_id},
+        headers=headers,
+    )
+
+
+async def graph(client, headers, task_id: int, direction: str = "downstream"):
+    response = await client.get(
+        f"/tasks/{task_id}/graph", params={"direction": direction}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_edges_closing_a_cycle_are_rejected(client, admin, seeded):
+    first = await new_task(client, admin, seeded, "First")
+    second = await new_task(client, admin, seeded, "Second")
+    third = await new_task(client, admin, seeded, "Third")
+    assert (await depend(client, admin, second, first)).status_code == 201
+    assert (await depend(client, admin, third, second)).status_code == 201
+
+    closing = await depend(client, admin, first, third)
+    own = await depend(client, admin, first, first)
+
+    assert closing.status_code == 409
+    assert own.status_code == 409
+    assert len((await graph(client, admin, first))["edges"]) == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_duplicate_edges_are_rejected(client, admin, seeded):
+    first = await new_task(client, admin, seeded, "First")
+    second = await new_task(client, admin, seeded, "Second")
+    assert (await depend(client, admin, second, first)).status_code == 201
+
+    response = await depend(client, admin, second, first)
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Dependency already exists"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_order_and_critical_path(client, admin, seeded):
+    short = await new_task(client, admin, seeded, "Short", days=2)
+    long = await new_task(client, admin, seeded, "Long", days=5)
+    last = await new_task(client, admin, seeded, "Last", days=1)
+    for blocking in (short, long):
+        assert (await depend(client, admin, last, blocking)).status_code == 201
+
+    upstream = await graph(client, admin, last, "upstream")
+
+    assert upstream["topological_order"] == [short, long, last]
+    assert [node["id"] for node in upstream["nodes"]] == [short, long, last]
+    assert upstream["critical_path"] == [long, last]
+    assert upstream["critical_path_days"] == 6.0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_changes_invalidate_cached_graphs(client, admin, seeded):
+    root = await new_task(client, admin, seeded, "Root")
+    child = await new_task(client, admin, seeded, "Child")
+    assert (await depend(client, admin, child, root)).status_code == 201
+    assert len((await graph(client, admin, root))["nodes"]) == 2
+
+    await client.patch(f"/tasks/{child}", json={"title": "Renamed"}, headers=admin)
+    titles = {
+        node["id"]: node["title"]
+        for node in (await graph(client, admin, root))["nodes"]
+    }
+    assert titles[child] == "Renamed"
+
+    grandchild = await new_task(client, admin, seeded, "Grandchild")
+    assert (await depend(client, admin, grandchild, child)).status_code == 201
+    assert len((await graph(client, admin, root))["nodes"]) == 3
+
+    removed = await client.delete(
+        f"/tasks/{grandchild}/dependencies/{child}", headers=admin
+    )
+    assert removed.status_code == 204
+    assert len((await graph(client, admin, root))["nodes"]) == 2
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_graphs_are_not_read_from_replicas(client, admin, seeded, monkeypatch):
+    root = await new_task(client, admin, seeded, "Root")
+    # Without the read-your-writes cookie of the insert, and with a warm user
+    # cache, so only the graph itself could go to the replica
+    client.cookies.clear()
+    assert (await client.get("/auth/profile", headers=admin)).status_code == 200
+
+    # A replica that cannot be reached fails any query sent to it
+    unreachable = create_async_engine("sqlite+aiosqlite:////nonexistent/replica.db")
+    monkeypatch.setattr(db_session, "replica_engines", [unreachable])
+    monkeypatch.setattr(
+        db_session,
+        "_replica_sessionmakers",
+        cycle([async_sessionmaker(bind=unreachable)]),
+    )
+
+    assert (await graph(client, admin, root))["nodes"][0]["title"] == "Root"
@@ -0,0 +1,102 @@
+"""Streamed task import: row counting, error order and the size limits."""
+
+import pytest
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.task import Task
+
+settings = get_settings()
+
+MISSING_USER_ID = 999_999
+
+
+async def import_csv(client, headers, body: str) -> dict:
+    response = await client.post(
+        "/tasks/import",
+        content=body.encode(),
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_imported_counts_rows_not_tasks(client, admin, seeded):
+    first, second = seeded["employee_ids"][:2]
+    report = await import_csv(
+        client,
+        admin,
+        f'title,assigned_to_id\nShared,"{first};{second}"\nSingle,{first}\n',
+    )
+
+    assert report["rows_processed"] == 2
+    assert report["imported"] == 2
+    assert report["failed"] == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_errors_are_in_row_order(client, admin, seeded):
+    employee_id = seeded["employee_ids"][0]
+    # The missing user is only found when the batch is written, after the
+    # validation error on the later row
+    report = await import_csv(
+        client,
+        admin,
+        f"title,assigned_to_id\nMissing,{MISSING_USER_ID}\n,{employee_id}\n",
+    )
+
+    assert [error["row"] for error in report["errors"]] == [1, 2]
+    assert report["imported"] == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_oversized_line_fails_only_its_row(client, admin, seeded, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_IMPORT_MAX_LINE_BYTES", 64)
+    employee_id = seeded["employee_ids"][0]
+    report = await import_csv(
+        client,
+        admin,
+        f"title,assigned_to_id\n{'x' * 200},{employee_id}\nShort,{employee_id}\n",
+    )
+
+    assert report["imported"] == 1
+    assert report["errors"] == [{"row": 1, "detail": "Line exceeds 64 bytes"}]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_unclosed_quote_fails_one_record(client, admin, seeded, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_IMPORT_MAX_RECORD_LINES", 3)
+    employee_id = seeded["employee_ids"][0]
+    report = await import_csv(
+        client,
+        admin,
+        f'title,assigned_to_id\n"Open,{employee_id}\na\nb\nAfter,{employee_id}\n',
+    )
+
+    assert report["imported"] == 1
+    assert report["errors"] == [
+        {"row": 1, "detail": "Quoted field not closed within 3 lines"}
+    ]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_rows_cannot_name_their_assigner(client, admin, seeded):
+    employee_id = seeded["employee_ids"][0]
+    report = await import_csv(
+        client,
+        admin,
+        "title,assigned_to_id,assigned_by_id\n"
+        f"Assigned by the importer,{employee_id},{seeded['supervisor_ids'][0]}\n"
+        f"Unknown assigner,{employee_id},{MISSING_USER_ID}\n",
+    )
+    assert report["imported"] == 2
+
+    async with AsyncSessionLocal() as db:
+        assigners = await db.scalars(
+            select(Task.assigned_by_id).where(
+                Task.title.in_(["Assigned by the importer", "Unknown assigner"])
+            )
+        )
+        assert set(assigners) == {seeded["admin_id"]}
@@ -0,0 +1,149 @@
+"""The task rollups kept by the triggers match a recount of `tasks`."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import case, delete, func, insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.future import select
+
+from app.models.task import Task, TaskRollup, TaskStatus
+from app.services.task_rollup_service import (
+    get_task_summary_service,
+    reconcile_task_rollups,
+)
+from benchmarks.seed import seed_database
+
+
+@pytest.fixture
+async def rollup_db(tmp_path):
+    """A database of its own, so other tests' writes do not move the counts"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rollups.db'}")
+    seeded = await seed_database(engine, users=10, tasks=300, dependants=0)
+    yield async_sessionmaker(bind=engine), seeded
+    await engine.dispose()
+
+
+async def recount(db) -> dict:
+    """The summary, counted straight from `tasks`"""
+    now = datetime.now(timezone.utc)
+    is_overdue = Task.status.is_distinct_from(TaskStatus.COMPLETED) & (
+        Task.due_date <= now
+    )
+    result = await db.execute(
+        select(
+            Task.assigned_to_id,
+            Task.status,
+            func.count(),
+            func.sum(case((is_overdue, 1), else_=0)),
+        ).group_by(Task.assigned_to_id, Task.status)
+    )
+
+    by_status = {task_status.value: 0 for task_status in TaskStatus}
+    assignees: dict = {}
+    for assigned_to_id, task_status, task_count, overdue_count in result:
+        by_status[task_status.value] += task_count
+        assignee = assignees.setdefault(
+            assigned_to_id or 0,
+            {
+                "assigned_to_id": assigned_to_id,
+                "total": 0,
+                "overdue": 0,
+                "by_status": {},
+            },
+        )
+        assignee["total"] += task_count
+        assignee["overdue"] += overdue_count
+        assignee["by_status"][task_status.value] = task_count
+
+    by_assignee = [assignees[key] for key in sorted(assignees)]
+    return {
+        "total": sum(by_status.values()),
+        "overdue": sum(assignee["overdue"] for assignee in by_assignee),
+        "by_status": by_status,
+        "by_assignee": by_assignee,
+    }
+
+
+async def summary(db) -> dict:
+    result = await get_task_summary_service(db)
+    del result["as_of"]
+    return result
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_rollups_follow_task_writes(rollup_db):
+    sessionmaker, seeded = rollup_db
+    employee_ids = seeded["employee_ids"]
+    now = datetime.now(timezone.utc)
+
+    async with sessionmaker() as db:
+        created = await db.scalars(
+            insert(Task).returning(Task.id),
+            [
+                {
+                    "title": f"Rollup task {i}",
+                    "assigned_to_id": employee_ids[i % 3] if i % 4 else None,
+                    "due_date": now + timedelta(days=i - 5),
+                    "status": TaskStatus.PENDING,
+                }
+                for i in range(10)
+            ],
+        )
+        created = created.all()
+        # Move tasks between statuses, assignees and in and out of overdue
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_(created[:3]))
+            .values(status=TaskStatus.COMPLETED)
+        )
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_(created[3:6]))
+            .values(assigned_to_id=employee_ids[-1], due_date=now - timedelta(days=1))
+        )
+        await db.execute(
+            update(Task).where(Task.id == created[6]).values(assigned_to_id=None)
+        )
+        await db.execute(delete(Task).where(Task.id.in_([*created[7:], 1, 2, 3])))
+        await db.commit()
+
+        assert await summary(db) == await recount(db)
+
+    report = await reconcile_task_rollups(sessionmaker)
+    assert report["drifted"] == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_reconcile_repairs_drift(rollup_db):
+    sessionmaker, _ = rollup_db
+    async with sessionmaker() as db:
+        drifted = (
+            await db.execute(
+                select(TaskRollup.assigned_to_id, TaskRollup.status)
+                .where(TaskRollup.task_count > 0)
+                .limit(1)
+            )
+        ).one()
+        # A write that bypassed the triggers
+        await db.execute(
+            update(TaskRollup)
+            .where(
+                TaskRollup.assigned_to_id == drifted.assigned_to_id,
+                TaskRollup.status == drifted.status,
+            )
+            .values(task_count=TaskRollup.task_count + 3)
+        )
+        await db.commit()
+        assert await summary(db) != await recount(db)
+
+    report = await reconcile_task_rollups(sessionmaker)
+
+    [row] = report["drifted"]
+    assert row["assigned_to_id"] == (drifted.assigned_to_id or None)
+    assert row["status"] == TaskStatus[drifted.status].value
+    assert row["actual"]["total"] == row["expected"]["total"] + 3
+
+    async with sessionmaker() as db:
+        assert await summary(db) == await recount(db)
+    assert (await reconcile_task_rollups(sessionmaker))["drifted"] == []
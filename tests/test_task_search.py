@@ -0,0 +1,57 @@
+"""Full-text task search: scoping and highlighting."""
+
+import pytest
+
+from tests.conftest import auth_headers
+
+
+async def new_task(client, headers, title: str, assignee_id: int, **fields) -> int:
+    response = await client.post(
+        "/tasks/",
+        json={"title": title, "assigned_to_id": [assignee_id], **fields},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def search(client, headers, text: str) -> list[dict]:
+    response = await client.get("/tasks/search", params={"q": text}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["items"]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_employees_only_find_their_own_tasks(client, admin, seeded):
+    own_id, other_id = seeded["employee_ids"][4:6]
+    own = await new_task(client, admin, "Calibrate the xylophone", own_id)
+    other = await new_task(client, admin, "Tune the xylophone", other_id)
+
+    found = await search(client, auth_headers(own_id), "xylophone")
+    everything = await search(client, admin, "xylophone")
+
+    assert [hit["id"] for hit in found] == [own]
+    assert {own, other} <= {hit["id"] for hit in everything}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_highlights_escape_the_task_text(client, admin, seeded):
+    task_id = await new_task(
+        client,
+        admin,
+        "<img src=x onerror=alert(1)> quokka",
+        seeded["employee_ids"][0],
+        description="Feed the <b>quokka</b> & clean up",
+    )
+
+    [hit] = [
+        hit for hit in await search(client, admin, "quokka") if hit["id"] == task_id
+    ]
+
+    assert hit["title"] == "<img src=x onerror=alert(1)> quokka"
+    assert hit["title_highlight"] == (
+        "&lt;img src=x onerror=alert(1)&gt; <mark>quokka</mark>"
+    )
+    assert hit["description_snippet"] == (
+        "Feed the &lt;b&gt;<mark>quokka</mark>&lt;/b&gt; &amp; clean up"
+    )
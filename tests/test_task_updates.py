@@ -0,0 +1,150 @@
+"""Full and partial task updates with version and status preconditions."""
+
+import pytest
+
+
+async def new_task(client, headers, seeded, **fields) -> dict:
+    response = await client.post(
+        "/tasks/",
+        json={
+            "title": "Original",
+            "description": "Kept",
+            "assigned_to_id": [seeded["employee_ids"][0]],
+            **fields,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_put_without_title_is_rejected(client, admin, seeded):
+    task = await new_task(client, admin, seeded)
+
+    response = await client.put(
+        f"/tasks/{task['id']}", json={"description": "x"}, headers=admin
+    )
+
+    assert response.status_code == 422
+
+
+async def current_version(client, headers, task_id: int) -> int:
+    response = await client.get(f"/tasks/{task_id}", headers=headers)
+    assert response.status_code == 200
+    return int(response.headers["ETag"].strip('"'))
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_patch_keeps_the_fields_left_out(client, admin, seeded):
+    task = await new_task(client, admin, seeded, due_date="2030-01-01T00:00:00Z")
+    version = await current_version(client, admin, task["id"])
+
+    response = await client.patch(
+        f"/tasks/{task['id']}", json={"title": "Renamed"}, headers=admin
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["title"] == "Renamed"
+    assert body["description"] == "Kept"
+    assert body["status"] == "Pending"
+    assert body["assigned_to_id"] == seeded["employee_ids"][0]
+    assert body["due_date"].startswith("2030-01-01")
+    assert body["version"] > version
+    assert response.headers["ETag"] == f'"{body["version"]}"'
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stale_version_conflicts_with_the_current_one(client, admin, seeded):
+    task = await new_task(client, admin, seeded)
+    stale = await current_version(client, admin, task["id"])
+    await client.patch(f"/tasks/{task['id']}", json={"title": "First"}, headers=admin)
+    version = await current_version(client, admin, task["id"])
+
+    response = await client.patch(
+        f"/tasks/{task['id']}",
+        json={"title": "Second", "version": stale},
+        headers=admin,
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["version"] == version
+    assert response.json()["detail"]["status"] == "Pending"
+    assert (await client.get(f"/tasks/{task['id']}", headers=admin)).json()[
+        "title"
+    ] == "First"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stale_if_match_conflicts_on_put(client, admin, seeded):
+    task = await new_task(client, admin, seeded)
+    stale = await current_version(client, admin, task["id"])
+    await client.patch(f"/tasks/{task['id']}", json={"title": "First"}, headers=admin)
+    version = await current_version(client, admin, task["id"])
+
+    response = await client.put(
+        f"/tasks/{task['id']}",
+        json={"title": "Replaced"},
+        headers={**admin, "If-Match": f'"{stale}"'},
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["version"] == version
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_current_if_match_applies(client, admin, seeded):
+    task = await new_task(client, admin, seeded)
+    version = await current_version(client, admin, task["id"])
+
+    response = await client.patch(
+        f"/tasks/{task['id']}",
+        json={"status": "In Progress"},
+        headers={**admin, "If-Match": f'"{version}"'},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "In Progress"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_unexpected_status_conflicts(client, admin, seeded):
+    task = await new_task(client, admin, seeded)
+
+    response = await client.patch(
+        f"/tasks/{task['id']}",
+        json={"status": "Completed", "expected_status": "In Progress"},
+        headers=admin,
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["status"] == "Pending"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_missing_task_is_not_found(client, admin):
+    patched = await client.patch(
+        "/tasks/999999", json={"title": "Nobody"}, headers=admin
+    )
+    replaced = await client.put(
+        "/tasks/999999", json={"title": "Nobody"}, headers=admin
+    )
+
+    assert patched.status_code == 404
+    assert replaced.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_invalid_patches_are_rejected(client, admin, seeded):
+    task = await new_task(client, admin, seeded)
+    url = f"/tasks/{task['id']}"
+
+    assert (
+        await client.patch(url, json={"title": None}, headers=admin)
+    ).status_code == 422
+    assert (await client.patch(url, json={}, headers=admin)).status_code == 400
+    malformed = await client.patch(
+        url, json={"title": "x"}, headers={**admin, "If-Match": "W/abc"}
+    )
+    assert malformed.status_code == 400
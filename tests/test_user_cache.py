@@ -0,0 +1,60 @@
+"""The authenticated user cache holds immutable snapshots."""
+
+import dataclasses
+from itertools import cycle
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.dependencies import CurrentUser, user_cache
+from app.db import session as db_session
+from tests.conftest import auth_headers
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cached_user_is_a_frozen_snapshot(client, employee, seeded):
+    response = await client.get("/auth/profile", headers=employee)
+    assert response.status_code == 200
+
+    cached = user_cache.get(seeded["employee_ids"][0])
+    assert isinstance(cached, CurrentUser)
+    assert cached.email == response.json()["email"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cached.role = "Admin"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_user_update_replaces_the_snapshot(client, admin, seeded):
+    user_id = seeded["employee_ids"][3]
+    headers = auth_headers(user_id)
+    assert (await client.get("/auth/profile", headers=headers)).status_code == 200
+
+    response = await client.put(
+        f"/auth/users/{user_id}", json={"name": "Renamed"}, headers=admin
+    )
+    assert response.status_code == 200
+
+    profile = await client.get("/auth/profile", headers=headers)
+    assert profile.json()["name"] == "Renamed"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_cache_misses_are_not_read_from_replicas(client, seeded, monkeypatch):
+    user_id = seeded["employee_ids"][4]
+    user_cache.invalidate(user_id)
+    client.cookies.clear()
+
+    # A replica that cannot be reached fails any query sent to it
+    unreachable = create_async_engine("sqlite+aiosqlite:////nonexistent/replica.db")
+    monkeypatch.setattr(db_session, "replica_engines", [unreachable])
+    monkeypatch.setattr(
+        db_session,
+        "_replica_sessionmakers",
+        cycle([async_sessionmaker(bind=unreachable)]),
+    )
+
+    response = await client.get("/auth/profile", headers=auth_headers(user_id))
+
+    assert response.status_code == 200
+    assert user_cache.get(user_id).id == user_id
+    await unreachable.dispose()